@@ -1,6 +1,15 @@
 import streamlit as st
+import pandas as pd
 import re
 
+from helpers.cleaning import get_cleaner, read_rules_csv, valid_rules
+from helpers.countif import countifs, get_column_index, get_index, load_range
+from helpers.data_export import EXPORT_TYPES, deferred_export
+from helpers.fragments import section
+from helpers.junk import MIN_LENGTH, REASONS, STOP_WORDS, detect_junk, drop_junk_lines, junk_summary
+from helpers.uploads import UPLOAD_TYPES, UploadError, load_uploaded_table
+from helpers.variants import cluster_rules, find_variants
+
 # --- 페이지 설정 ---
 # 레이아웃을 'wide'로 설정하고 CSS로 너비를 직접 제어합니다.
 st.set_page_config(
@@ -82,10 +91,53 @@ st.markdown("""
 
 # --- 세션 상태 초기화 ---
 # Streamlit은 스크립트를 재실행하므로, 상태를 유지하기 위해 session_state를 사용합니다.
+# 활동마다 조각(st.fragment)으로 나눠 위젯을 바꾸면 그 활동만 다시 실행되므로, 활동끼리 주고받는
+# 값(세척 규칙, 돌멩이 기준)도 모두 아래 세션 상태 키로 주고받습니다.
 if 'example_type' not in st.session_state:
     st.session_state.example_type = None
 if 'cleaning_rules' not in st.session_state:
     st.session_state.cleaning_rules = [{"find": "떠뽀끼", "replace": "떡볶이"}]
+if 'cleaning_rules_version' not in st.session_state:
+    st.session_state.cleaning_rules_version = 0
+# 멀티페이지 앱(app.py)에서 다른 차시에 다녀와도 값이 남도록, 위젯 기본값은 value 대신 여기서 줍니다.
+if 'junk_stop_words' not in st.session_state:
+    st.session_state.junk_stop_words = ", ".join(STOP_WORDS)
+if 'junk_min_length' not in st.session_state:
+    st.session_state.junk_min_length = MIN_LENGTH
+
+
+# --- 도우미 함수 ---
+def junk_settings():
+    """활동 1에서 정한 돌멩이 기준(무의미 응답 목록, 최소 글자 수)을 돌려줍니다."""
+    stop_words = st.session_state.get("junk_stop_words", ", ".join(STOP_WORDS))
+    return tuple(word.strip() for word in stop_words.split(",") if word.strip()), st.session_state.get("junk_min_length", MIN_LENGTH)
+
+
+def export_buttons(df, name, summary_columns, key):
+    """df를 CSV/XLSX로 내려받는 버튼을 나란히 그립니다. 파일은 버튼을 누를 때 조금씩 써서 만듭니다."""
+    for col, (file_type, (label, mime)) in zip(st.columns(len(EXPORT_TYPES)), EXPORT_TYPES.items()):
+        col.download_button(
+            f"{label}로 내려받기",
+            deferred_export(df, file_type, summary_columns),
+            file_name=f"{name}.{file_type}",
+            mime=mime,
+            on_click="ignore",
+            use_container_width=True,
+            key=f"{key}_{file_type}",
+        )
+
+
+def send_cluster_rules(clusters):
+    """찾은 묶음을 활동 2의 세척 규칙에 덧붙이고 활동 2 조각도 다시 실행합니다. 버튼 콜백에서 부릅니다."""
+    # 표에서 고친 규칙을 잃지 않도록 마지막으로 편집한 규칙 뒤에 덧붙입니다.
+    current = st.session_state.get("cleaning_rules_current", st.session_state.cleaning_rules)
+    known = {rule["find"] for rule in current if rule.get("find")}
+    new_rules = [rule for rule in cluster_rules(clusters) if rule["find"] not in known]
+    st.session_state.cleaning_rules = list(current) + new_rules
+    st.session_state.cleaning_rules_version += 1
+    st.toast(f"규칙 {len(new_rules)}개를 활동 2의 자동 세척기에 추가했어요!")
+    st.rerun(["activity1", "activity2"])
+
 
 # --- 헤더 ---
 st.markdown('<h1 class="bouncing-header" style="text-align: center; font-size: 3.5rem;">데이터 쿡방 스튜디오 🍳</h1>', unsafe_allow_html=True)
@@ -102,7 +154,9 @@ with st.container(border=True):
 
 
 # --- 활동 1: 재료 창고 탐색 ---
-with st.container(border=True):
+@st.fragment(key="activity1")
+@section('lesson4', 'activity1')
+def activity1():
     st.header("🧐 활동 1: 재료 창고(구글 시트) 탐색하기")
     st.write("우리 쿡방 스튜디오의 재료 창고를 열어봅시다. 어떤 '손질이 필요한 재료'들이 도착했는지 탐색하고, 아래 [탐색 노트]에 발견한 것들을 적어보세요.")
     
@@ -126,11 +180,57 @@ with st.container(border=True):
     if st.session_state.example_type:
         st.info(f"**발견!** {examples[st.session_state.example_type]}")
 
+    st.subheader("🔍 우리 데이터에서 직접 찾아보기")
+    st.write("설문 응답을 한 줄에 하나씩 붙여넣으면, 오타나 다른 표현처럼 보이는 비슷한 이름들을 묶어서 보여줘요.")
+    variant_data = st.text_area("설문 응답", height=150, placeholder="예:\n김치찌개\n김치찌게\n돈까스\n돈까쓰", key="variant_data", label_visibility="collapsed")
+    with st.expander("💎 돌멩이(무의미 응답) 기준 정하기"):
+        # 활동 3도 이 기준으로 돌멩이를 빼므로, 바꾸면 활동 3 조각도 함께 다시 실행합니다.
+        st.text_input("무의미 응답 목록 (쉼표로 구분)", key="junk_stop_words",
+                      on_change=st.rerun, args=(["activity1", "activity3"],))
+        st.number_input("최소 글자 수 (한글·숫자는 한 글자를 2로 셉니다)", min_value=0, key="junk_min_length",
+                        on_change=st.rerun, args=(["activity1", "activity3"],))
+    find_col, junk_col = st.columns(2)
+    if find_col.button("비슷한 이름 찾기", use_container_width=True):
+        st.session_state.variant_clusters = find_variants(variant_data.splitlines())
+        if not st.session_state.variant_clusters:
+            st.info("비슷한 이름을 찾지 못했어요. 응답이 이미 깨끗한가 봐요!")
+    if junk_col.button("돌멩이(무의미 응답) 찾기", use_container_width=True):
+        responses = [line for line in variant_data.splitlines() if line.strip()]
+        junk_mask, junk_reasons = detect_junk(responses, *junk_settings())
+        if junk_mask.any():
+            st.warning(f"응답 {len(responses)}개 중 {int(junk_mask.sum())}개가 돌멩이예요. 세거나 차트를 그리기 전에 빼주세요!")
+            col_junk1, col_junk2 = st.columns(2)
+            col_junk1.dataframe(junk_summary(junk_reasons), hide_index=True, use_container_width=True)
+            col_junk2.dataframe(
+                pd.DataFrame({"응답": responses, "이유": junk_reasons.map(REASONS)})[junk_mask.to_numpy()],
+                hide_index=True,
+                use_container_width=True,
+            )
+        else:
+            st.info("돌멩이가 없어요. 모두 쓸 수 있는 응답이에요!")
+
+    clusters = st.session_state.get("variant_clusters")
+    if clusters:
+        st.dataframe(
+            pd.DataFrame(
+                [(c.canonical, ", ".join(f"{v}({n})" for v, n in c.variants[1:]), c.total) for c in clusters],
+                columns=["대표 이름", "비슷한 이름 (개수)", "전체 개수"],
+            ),
+            hide_index=True,
+            use_container_width=True,
+        )
+        st.button("찾은 묶음을 자동 세척기 규칙으로 보내기 →", use_container_width=True, on_click=send_cluster_rules, args=(clusters,))
+
     st.subheader("[탐색 노트]")
     st.text_area("여기에 발견한 '손질이 필요한 재료'들을 자유롭게 적어보세요!", key="exploration_notes", height=150, label_visibility="collapsed")
 
-# --- 활동 2: 재료 손질하기 ---
 with st.container(border=True):
+    activity1()
+
+# --- 활동 2: 재료 손질하기 ---
+@st.fragment(key="activity2")
+@section('lesson4', 'activity2')
+def activity2():
     st.header("🛠️ 활동 2: 최첨단 도구로 재료 손질하기")
     
     st.markdown('<div class="note">'
@@ -139,36 +239,75 @@ with st.container(border=True):
                 '</div>', unsafe_allow_html=True)
 
     st.subheader("✨ 자동 세척기 (찾기 및 바꾸기) 체험")
-    st.write("다른 표현들을 하나의 대표 단어로 통일해 봅시다. 아래에 직접 입력해보세요!")
-
-    # 동적으로 규칙을 추가/삭제하는 UI
-    for i, rule in enumerate(st.session_state.cleaning_rules):
-        col1, col2, col3 = st.columns([4, 1, 4])
-        find_val = col1.text_input("손질할 재료", value=rule["find"], key=f"find_{i}", label_visibility="collapsed")
-        col2.markdown('<p style="text-align: center; font-size: 2rem; font-weight: bold; color: #FFA500;">→</p>', unsafe_allow_html=True)
-        replace_val = col3.text_input("대표 재료명", value=rule["replace"], key=f"replace_{i}", label_visibility="collapsed")
-        st.session_state.cleaning_rules[i] = {"find": find_val, "replace": replace_val}
-
-    col_btn1, col_btn2 = st.columns(2)
-    if col_btn1.button("규칙 추가하기 +", use_container_width=True):
-        st.session_state.cleaning_rules.append({"find": "", "replace": ""})
-        st.rerun()
-
-    if col_btn2.button("모두 세척하기!", type="primary", use_container_width=True):
-        valid_rules = [r for r in st.session_state.cleaning_rules if r['find'] and r['replace']]
-        if not valid_rules:
+    st.write("다른 표현들을 하나의 대표 단어로 통일해 봅시다. 아래 표에 직접 입력해보세요! (맨 아래 빈 줄에 입력하면 규칙이 추가돼요)")
+
+    # 규칙이 많으면 CSV로 한꺼번에 불러옵니다. 불러온 규칙으로 표를 새로 만듭니다.
+    rules_file = st.file_uploader("규칙 한꺼번에 불러오기 (CSV: 찾을 말, 바꿀 말)", type="csv", key="cleaning_rules_file")
+    if rules_file is not None and st.session_state.get("cleaning_rules_file_id") != rules_file.file_id:
+        st.session_state.cleaning_rules_file_id = rules_file.file_id
+        st.session_state.cleaning_rules = read_rules_csv(rules_file.getvalue())
+        st.session_state.cleaning_rules_version += 1
+        st.toast(f"규칙 {len(st.session_state.cleaning_rules)}개를 불러왔어요!")
+
+    edited_rules = st.data_editor(
+        pd.DataFrame(st.session_state.cleaning_rules, columns=["find", "replace"]),
+        num_rows="dynamic",
+        hide_index=True,
+        use_container_width=True,
+        column_config={
+            "find": st.column_config.TextColumn("손질할 재료"),
+            "replace": st.column_config.TextColumn("대표 재료명"),
+        },
+        key=f"cleaning_rules_editor_{st.session_state.cleaning_rules_version}",
+    )
+    st.session_state.cleaning_rules_current = edited_rules.to_dict("records")
+    rules = valid_rules(st.session_state.cleaning_rules_current)
+
+    st.write("손질할 재료(데이터)를 한 줄에 하나씩 붙여넣거나, CSV/XLSX 파일을 올려 열을 골라주세요.")
+    col_data1, col_data2 = st.columns(2)
+    pasted_data = col_data1.text_area("세척할 데이터", height=200, placeholder="예:\n떠뽀끼\n떡볶이\n돈까쓰", key="cleaning_data")
+    data_file = col_data2.file_uploader("세척할 데이터 파일 (CSV/XLSX)", type=UPLOAD_TYPES, key="cleaning_data_file")
+    values = [line.strip() for line in pasted_data.splitlines() if line.strip()]
+    data_table = None
+    if data_file is not None:
+        try:
+            _, data_table = load_uploaded_table(data_file)
+        except UploadError as e:
+            col_data2.error(str(e))
+        else:
+            data_column = col_data2.selectbox("세척할 열", list(data_table.columns), key="cleaning_data_column")
+            values = ["" if pd.isna(v) else str(v) for v in data_table[data_column]]
+    whole_cell = st.checkbox("셀 전체가 똑같을 때만 바꾸기 (전체 셀 내용 일치)", key="cleaning_whole_cell")
+
+    if st.button("모두 세척하기!", type="primary", use_container_width=True):
+        if not rules:
             st.warning("하나 이상의 유효한 세척 규칙을 입력해주세요!")
+        elif not values:
+            st.warning("세척할 데이터를 붙여넣거나 파일로 올려주세요!")
         else:
-            results_html = "<ul>"
-            for rule in valid_rules:
-                results_html += f"<li>'{rule['find']}' → '{rule['replace']}' (으)로 변경!</li>"
-            results_html += "</ul>"
-            st.success(f"총 {len(valid_rules)}개의 규칙으로 데이터를 성공적으로 손질했습니다!")
-            st.markdown(results_html, unsafe_allow_html=True)
+            # 규칙이 바뀌지 않았다면 컴파일해 둔 세척기를 그대로 씁니다.
+            cleaner = get_cleaner(rules)
+            cleaned, hits = cleaner.clean(values, whole_cell=whole_cell)
+            result = pd.DataFrame({"원래 재료": values, "손질한 재료": cleaned})
+            changed = result[result["원래 재료"] != result["손질한 재료"]]
+            st.success(f"총 {len(cleaner.rules)}개의 규칙으로 {len(values)}개 중 {len(changed)}개의 재료를 손질했습니다!")
+            col_result1, col_result2 = st.columns(2)
+            col_result1.dataframe(cleaner.hit_table(hits), hide_index=True, use_container_width=True)
+            col_result2.dataframe(changed, hide_index=True, use_container_width=True)
+            # 파일로 올린 데이터는 다른 열은 그대로 두고 세척한 열만 바꿔 내보냅니다.
+            if data_table is not None:
+                export_buttons(data_table.assign(**{data_column: cleaned}), "손질한_데이터", [data_column], key="cleaned")
+            else:
+                export_buttons(result, "손질한_데이터", ["손질한 재료"], key="cleaned")
+
+with st.container(border=True):
+    activity2()
 
 
 # --- 활동 3: 재료 개수 세기 ---
-with st.container(border=True):
+@st.fragment(key="activity3")
+@section('lesson4', 'activity3')
+def activity3():
     st.header("🔢 활동 3: 자동 계량기(COUNTIF)로 재료 개수 세기")
     st.write("손질이 끝난 재료가 각각 몇 개씩 있는지 정확히 세어봅시다. 아래에 `COUNTIF(범위, \"재료명\")` 함수를 직접 완성해 보세요!")
 
@@ -177,6 +316,29 @@ with st.container(border=True):
                 '<p>계산할 데이터 목록을 한 줄에 하나씩 입력하거나 붙여넣어 주세요.</p>'
                 '</div>', unsafe_allow_html=True)
     data_source = st.text_area("계산할 데이터", height=200, placeholder="예:\n돈까스\n스파게티\n돈까스", label_visibility="collapsed")
+    data_file = st.file_uploader("또는 시트에서 내려받은 파일 올리기 (CSV/XLSX)", type=UPLOAD_TYPES, key="countif_file")
+    skip_junk = st.checkbox("💎 돌멩이(무의미 응답)는 빼고 세기", key="countif_skip_junk")
+
+    # 데이터 범위(표)와 COUNTIF에 쓸 빈도 색인을 준비합니다. 파일을 올리면 파일이 먼저입니다.
+    table, range_index = None, None
+    if data_file is not None:
+        try:
+            digest, table = load_uploaded_table(data_file)
+        except UploadError as e:
+            st.error(str(e))
+        else:
+            range_column = st.selectbox("데이터 범위로 쓸 열", list(table.columns), key="countif_column")
+            if skip_junk:
+                junk_mask, _ = detect_junk(table[range_column], *junk_settings())
+                table = table[~junk_mask.to_numpy()]
+                st.caption(f"돌멩이 {int(junk_mask.sum()):,}개를 빼고 셉니다. (기준은 활동 1에서 바꿀 수 있어요)")
+            range_index = get_column_index((digest, range_column, skip_junk and junk_settings()), table[range_column])
+            st.caption(f"{len(table):,}행 × {len(table.columns)}열을 읽었어요.")
+    elif data_source.strip():
+        if skip_junk:
+            data_source, dropped = drop_junk_lines(data_source, *junk_settings())
+            st.caption(f"돌멩이 {dropped}개를 빼고 셉니다. (기준은 활동 1에서 바꿀 수 있어요)")
+        table, range_index, range_column = load_range(data_source), get_index(data_source), "A"
 
     st.subheader("COUNTIF 함수 완성하기 ✍️")
     
@@ -186,28 +348,54 @@ with st.container(border=True):
     col3.markdown('<p style="font-size: 1.5rem; font-family: monospace; font-weight: bold;">,</p>', unsafe_allow_html=True)
     criteria = col4.text_input("조건", placeholder='"재료명"', label_visibility="collapsed")
     col5.markdown('<p style="font-size: 1.5rem; font-family: monospace; font-weight: bold;">)</p>', unsafe_allow_html=True)
+    st.caption('`"돈*"`처럼 `*`, `?`로 비슷한 이름을 한꺼번에 세거나, `">10"`처럼 숫자를 비교할 수도 있어요.')
 
     if st.button("개수 확인하기!", type="primary", use_container_width=True):
-        if not data_source or not criteria:
+        if range_index is None or not criteria:
             st.error("'데이터 범위'에 재료 목록을, 함수 속 '재료명'을 모두 입력해주세요!")
         else:
             # 사용자가 따옴표를 넣어도 처리할 수 있도록 정제
             clean_criteria = re.sub(r'^"|"$|^\'|\'$', '', criteria)
-            data_list = [line.strip() for line in data_source.strip().split('\n') if line.strip()]
-            count = data_list.count(clean_criteria)
+            # 같은 데이터 범위의 빈도 색인은 한 번만 만들고, 조건만 바꿔 가며 바로 셉니다.
+            count = range_index.count(criteria)
             
             result_html = f"""
             <div style="background-color: #e6f2ff; border: 1px solid #b8d8ff; border-left: 5px solid #007bff; color: #004085; padding: 1rem; border-radius: 0.5rem; margin-top: 1rem;">
                 <code>=COUNTIF(데이터 범위, {criteria})</code>
                 <br>
-                결과: '<strong>{clean_criteria}</strong>' 재료는 총 <strong>{count}</strong>개 있습니다!
+                결과: '<strong>{clean_criteria}</strong>' 조건에 맞는 재료는 총 <strong>{count}</strong>개 있습니다!
             </div>
             """
             st.markdown(result_html, unsafe_allow_html=True)
 
+    if range_index is not None:
+        with st.expander("📋 재료별 개수 한 번에 보기"):
+            st.dataframe(range_index.frequency_table(), hide_index=True, use_container_width=True)
+            export_buttons(table, "데이터_범위", [range_column], key="countif_range")
+
+        # 시트에서 여러 열을 복사해 붙여넣거나(탭으로 구분) 파일을 올리면 조건 여러 개를 함께 쓸 수 있습니다.
+        if len(table.columns) > 1:
+            with st.expander("🧮 조건 여러 개로 세기 (COUNTIFS)"):
+                condition_columns = list(table.columns)
+                if len(condition_columns) > 4:
+                    condition_columns = st.multiselect("조건을 걸 열", condition_columns, default=condition_columns[:2], key="countifs_columns")
+                conditions = []
+                for column, col in zip(condition_columns, st.columns(max(1, len(condition_columns)))):
+                    value = col.text_input(f"{column}열 조건", key=f"countifs_{column}", placeholder='예: ">10"')
+                    if value:
+                        conditions.append((column, value))
+                if conditions:
+                    formula = ", ".join(f"{column}열, {value}" for column, value in conditions)
+                    st.markdown(f"`=COUNTIFS({formula})` → **{countifs(table, conditions)}**개")
 
-# --- 챌린지 ---
 with st.container(border=True):
+    activity3()
+
+
+# --- 챌린지 ---
+@st.fragment(key="challenge")
+@section('lesson4', 'challenge')
+def challenge():
     st.header("🎯 오늘의 챌린지: '재료 손질 규칙' 수립하기")
     st.write("최고의 셰프는 자신만의 재료 손질 원칙이 있어요. 우리 팀만의 규칙을 정하고 아래에 기록하여 제출해봅시다!")
     
@@ -222,6 +410,9 @@ with st.container(border=True):
         else:
             st.error("앗! 모든 규칙을 작성해야 셰프 인증을 받을 수 있어요!")
 
+with st.container(border=True):
+    challenge()
+
 
 # --- 다음 차시 예고 ---
 st.markdown('<div style="text-align:center; padding: 2rem;">'
@@ -1,12 +1,18 @@
 import streamlit as st
-import pandas as pd
-import altair as alt
-import re
 import datetime
-from PIL import Image, ImageDraw, ImageFont
-import requests
-from io import BytesIO
-import os
+from functools import partial
+from helpers.artifacts import get_artifact_store
+from helpers.chart_data import folded_caption, prepare_chart_data
+from helpers.chart_specs import CompiledChart, compile_chart, data_digest, get_chart_spec
+from helpers.export_formats import EXPORT_FORMATS
+from helpers.fonts import FontUnavailableError
+from helpers.fragments import section
+from helpers.images import ImageRejectedError, prepare_upload
+from helpers.parsing import parse_widget
+from helpers.render_queue import POLL_INTERVAL, QueueFullError, get_render_queue
+from helpers.render_cache import get_render_cache, render_and_cache, submission_key
+from helpers.summary_templates import LESSON5_FIELDS, submission_from_state
+from helpers.upload_widgets import data_upload
 
 # --- 페이지 설정 ---
 st.set_page_config(
@@ -16,113 +22,103 @@ st.set_page_config(
 )
 
 # --- 이미지 생성 함수 ---
-def wrap_text(text, font, max_width):
-    """주어진 너비에 맞게 텍스트를 여러 줄로 나눕니다."""
-    lines = []
-    if not text:
-        return lines
-    for line in text.split('\n'):
-        words = line.split(' ')
-        while len(words) > 0:
-            current_line = ''
-            while len(words) > 0 and font.getbbox(current_line + words[0])[2] <= max_width:
-                current_line += (words.pop(0) + ' ')
-            lines.append(current_line.strip())
-    return lines
+def request_summary_image():
+    """세션 상태의 모든 입력으로 요약 이미지 생성을 대기열에 맡기고 작업 번호를 돌려줍니다.
 
-def create_summary_image():
-    """세션 상태의 모든 입력을 기반으로 하나의 요약 이미지를 생성합니다."""
-    # 폰트 다운로드 및 로드
-    font_path = "GowunDodum-Regular.ttf"
-    if not os.path.exists(font_path):
-        try:
-            url = "https://github.com/google/fonts/raw/main/ofl/gowundodum/GowunDodum-Regular.ttf"
-            r = requests.get(url)
-            with open(font_path, "wb") as f:
-                f.write(r.content)
-        except Exception as e:
-            st.error(f"폰트를 다운로드하는 데 실패했습니다: {e}")
-            return None
-    
-    try:
-        title_font = ImageFont.truetype(font_path, 40)
-        header_font = ImageFont.truetype(font_path, 28)
-        body_font = ImageFont.truetype(font_path, 20)
-    except IOError:
-        st.error("폰트 파일을 로드할 수 없습니다.")
+    같은 내용으로 이미 만든 이미지가 캐시에 있으면 바로 세션 상태에 넣고 None을 돌려줍니다.
+    """
+    submission = submission_from_state(st.session_state, LESSON5_FIELDS)
+    submission['challenge_image'] = get_artifact_store().get(st.session_state.get('challenge_image_prepared'))
+    export_format = st.session_state.get('export_format', 'png')
+    byte_budget = st.session_state.get('export_budget_kb', 0) * 1024 or None
+    key = submission_key('lesson5', submission, export_format, byte_budget)
+    cached = get_render_cache().get(key)
+    if cached is not None:
+        st.session_state.generated_image = cached
         return None
+    submission['submitted_at'] = datetime.datetime.now().strftime('%Y-%m-%d %H:%M')
+    return get_render_queue().submit(render_and_cache, key, 'lesson5', submission, export_format, byte_budget)
 
-    # 렌더링할 콘텐츠 목록 생성
-    content = [
-        ("데이터 쿡방 5차시 제출 결과", title_font),
-        (f"제출 시각: {datetime.datetime.now().strftime('%Y-%m-%d %H:%M')}", body_font),
-        ("", body_font), # Spacer
-        ("🧐 활동 1: '맛있는 쿡방' 분석", header_font),
-        (f"데이터 제목: {st.session_state.get('activity1_title', 'N/A')}", body_font),
-        (f"B장면이 더 좋은 이유: {st.session_state.get('activity1_reason', 'N/A')}", body_font),
-        ("", body_font),
-        ("🛠️ 활동 2: 최고의 레시피 선택", header_font),
-        (f"미션 A (메뉴 순위): {st.session_state.get('mission_a_chart', 'N/A')}", body_font),
-        (f"이유: {st.session_state.get('mission_a_reason', 'N/A')}", body_font),
-        (f"미션 B (성비): {st.session_state.get('mission_b_chart', 'N/A')}", body_font),
-        (f"이유: {st.session_state.get('mission_b_reason', 'N/A')}", body_font),
-        ("", body_font),
-        ("🎯 챌린지: 나의 시그니처 디쉬", header_font),
-        (f"요리 이름: {st.session_state.get('challenge_title', 'N/A')}", body_font),
-        (f"셰프의 한 마디: {st.session_state.get('challenge_comment', 'N/A')}", body_font),
-    ]
+def prepare_challenge_image(uploaded_file):
+    """업로드 이미지를 올린 직후 한 번만 줄여 저장소에 두고, 미리보기와 결과 이미지에서 함께 씁니다.
 
-    # 이미지 크기 계산
-    width = 800
-    padding = 40
-    line_spacing = 15
-    content_width = width - 2 * padding
-    
-    total_height = padding
-    wrapped_content = []
-    for text, font in content:
-        lines = wrap_text(text, font, content_width)
-        for line in lines:
-            wrapped_content.append((line, font))
-            bbox = font.getbbox(line)
-            total_height += (bbox[3] - bbox[1]) + line_spacing
+    세션 상태에는 저장소의 이름표만 둡니다. 저장소에서 지워졌으면 업로드한 파일로 다시 줄여 둡니다.
+    """
+    if uploaded_file is None:
+        st.session_state.challenge_image_prepared = None
+        st.session_state.challenge_image_id = None
+        return
+    handle = st.session_state.get('challenge_image_prepared')
+    if st.session_state.get('challenge_image_id') == uploaded_file.file_id and (handle is None or handle in get_artifact_store()):
+        return
+    try:
+        prepared = prepare_upload(uploaded_file.getvalue())
+    except ImageRejectedError as e:
+        st.error(str(e))
+        prepared = None
+    st.session_state.challenge_image_prepared = get_artifact_store().put(prepared) if prepared else None
+    st.session_state.challenge_image_id = uploaded_file.file_id
 
-    # 업로드된 이미지 공간 추가
-    uploaded_image_file = st.session_state.get('challenge_image', None)
-    user_img_height = 0
-    if uploaded_image_file:
-        try:
-            user_img = Image.open(uploaded_image_file)
-            ratio = user_img.height / user_img.width
-            user_img_width = content_width
-            user_img_height = int(user_img_width * ratio)
-            total_height += user_img_height + padding * 2
-        except Exception:
-            user_img_height = 0 # 손상된 이미지 파일은 건너뜀
+def collect_summary_image():
+    """대기열에 맡긴 이미지 생성 작업의 상태를 확인하고, 끝났으면 결과나 오류 안내를 세션 상태로 옮깁니다."""
+    job_id = st.session_state.get('render_job')
+    if job_id is None:
+        return
+    queue = get_render_queue()
+    status = queue.status(job_id)
+    if status is None or status['state'] in ('done', 'failed'):
+        queue.discard(job_id)
+        del st.session_state['render_job']
+    if status is None:
+        st.session_state.render_error = "이미지 생성에 실패했습니다."
+    elif status['state'] == 'done':
+        st.session_state.generated_image = status['result']
+    elif status['state'] == 'failed':
+        if isinstance(status['error'], FontUnavailableError):
+            st.session_state.render_error = str(status['error'])
+        elif isinstance(status['error'], IOError):
+            st.session_state.render_error = "폰트 파일을 로드할 수 없습니다."
+        else:
+            st.session_state.render_error = "이미지 생성에 실패했습니다."
+    elif status['state'] == 'queued':
+        st.info(f"이미지 생성 순서를 기다리는 중입니다... (내 앞에 {status['position']}명) ⏳")
+    else:
+        st.info("결과 이미지를 생성 중입니다... 🎨")
 
-    total_height += padding
+@st.fragment(run_every=POLL_INTERVAL)
+def poll_summary_image():
+    """이미지 생성 작업이 진행 중일 때만 그리는 조각입니다. POLL_INTERVAL마다 이 조각만 다시 실행해 작업 상태를 확인합니다.
 
-    # 이미지 생성 및 텍스트 그리기
-    img = Image.new('RGB', (width, total_height), '#FFF8F0')
-    draw = ImageDraw.Draw(img)
-    
-    y = padding
-    for text, font in wrapped_content:
-        draw.text((padding, y), text, font=font, fill='#333333')
-        bbox = font.getbbox(text)
-        y += (bbox[3] - bbox[1]) + line_spacing
+    작업이 끝나면 페이지 전체를 한 번 다시 실행해 결과를 보여 줍니다. 이때 이 조각은 그려지지 않으므로 확인도 멈춥니다.
+    """
+    collect_summary_image()
+    if st.session_state.get('render_job') is None:
+        st.rerun()
 
-    # 업로드된 이미지 그리기
-    if uploaded_image_file and user_img_height > 0:
-        y += padding
-        user_img = Image.open(uploaded_image_file)
-        user_img_resized = user_img.resize((user_img_width, user_img_height))
-        img.paste(user_img_resized, (padding, y))
-        
-    # 이미지를 바이트로 변환
-    buf = BytesIO()
-    img.save(buf, format='PNG')
-    return buf.getvalue()
+# 차트 레시피 이름 → helpers.chart_data의 차트 종류
+CHART_KINDS = {"막대 그래프": 'bar', "선 그래프": 'line', "파이 그래프": 'pie'}
+
+def activity_chart(df, chart_type, title):
+    """활동 1의 데이터로 고른 레시피의 차트를 만들어 CompiledChart로 돌려줍니다."""
+    # altair는 불러오는 데 오래 걸리므로, 저장한 명세가 없어 차트를 처음 만들 때 불러옵니다.
+    import altair as alt
+
+    if df.empty:
+        return CompiledChart(None)
+    chart_df, folded = prepare_chart_data(df, CHART_KINDS[chart_type])
+    if chart_type == "막대 그래프":
+        c = alt.Chart(chart_df).mark_bar(color="#ff8c00").encode(
+            x=alt.X('항목', sort=None), y=alt.Y('값'), tooltip=['항목', '값'])
+    elif chart_type == "선 그래프":
+        c = alt.Chart(chart_df).mark_line(color="#007bff").encode(
+            x=alt.X('항목', sort=None), y=alt.Y('값'), tooltip=['항목', '값'])
+    else:
+        c = alt.Chart(chart_df).mark_arc().encode(
+            theta=alt.Theta(field="값", type="quantitative"),
+            color=alt.Color(field="항목", type="nominal", title="항목"),
+            tooltip=['항목', '값']
+        ).properties(title=title)
+    return compile_chart(c, folded_caption(folded, chart_df))
 
 # --- 스타일링 ---
 st.markdown("""
@@ -178,7 +174,9 @@ with st.container(border=True):
                 '</div>', unsafe_allow_html=True)
 
 # --- 활동 1 ---
-with st.container(border=True):
+@st.fragment
+@section('lesson5', 'activity1')
+def activity1():
     st.header("🧐 활동 1: '맛없는 쿡방' vs '맛있는 쿡방'")
     st.write("여러분이 시청자라면 어떤 쿡방 채널을 구독하시겠습니까? 아래 두 쿡방 장면을 보고, 왜 B장면이 훨씬 더 이해하기 쉽고 재미있는지 우리 팀의 생각을 적어봅시다.")
     
@@ -188,58 +186,54 @@ with st.container(border=True):
         st.markdown('<div class="scene-box">'
                     '<h4>A장면: 맛없는 쿡방 (재료 목록)</h4>'
                     '</div>', unsafe_allow_html=True)
-        st.text_input("데이터의 제목을 입력하세요.", value="가장 좋아하는 과목", key="activity1_title")
-        raw_data = st.text_area(
+        # 파일을 올리면 콜백이 입력란을 채우고, 멀티페이지 앱(app.py)에서는 다른 차시에 다녀와도 값이
+        # 남아야 하므로, 기본값은 value 대신 세션 상태로 줍니다.
+        st.session_state.setdefault("activity1_title", "가장 좋아하는 과목")
+        st.text_input("데이터의 제목을 입력하세요.", key="activity1_title")
+        st.session_state.setdefault("activity1_data", "국어: 15\n수학: 10\n사회: 20\n과학: 25\n체육: 30")
+        st.text_area(
             "데이터를 '항목: 값' 형식으로 입력하세요.",
             height=225,
-            value="국어: 15\n수학: 10\n사회: 20\n과학: 25\n체육: 30",
             key="activity1_data"
         )
+        data_upload("activity1_data")
 
     with col2:
         st.markdown('<div class="scene-box">'
                     '<h4>B장면: 맛있는 쿡방 (완성된 요리)</h4>'
                     '</div>', unsafe_allow_html=True)
         
-        data_lines = st.session_state.activity1_data.strip().split('\n')
-        parsed_data = []
-        for line in data_lines:
-            parts = re.split(r'[:\s,]+', line.strip())
-            if len(parts) >= 2:
-                item = parts[0].strip()
-                try:
-                    value = float(parts[-1].strip())
-                    parsed_data.append((item, value))
-                except (ValueError, IndexError):
-                    pass
-        
-        if parsed_data:
-            df = pd.DataFrame(parsed_data, columns=['항목', '값'])
-            chart_type = st.radio(
+        # 라디오 버튼을 그리기 전에도 고른 값은 세션 상태에 있으므로, 입력이 그대로면 저장한 명세를 씁니다.
+        chart_type = st.session_state.get("activity1_chart_type", "막대 그래프")
+        chart_title = st.session_state.activity1_title
+        chart = get_chart_spec(
+            ('lesson5_activity1', chart_type, chart_title, data_digest(st.session_state.activity1_data)),
+            lambda: activity_chart(parse_widget(st.session_state, "activity1_data"), chart_type, chart_title),
+        )
+
+        if chart.spec is not None:
+            st.radio(
                 "원하는 차트 레시피를 선택하세요",
                 ("막대 그래프", "선 그래프", "파이 그래프"),
                 horizontal=True,
                 key="activity1_chart_type"
             )
-            if chart_type == "막대 그래프":
-                st.bar_chart(df.set_index('항목'), color="#ff8c00")
-            elif chart_type == "선 그래프":
-                st.line_chart(df.set_index('항목'), color="#007bff")
-            elif chart_type == "파이 그래프":
-                c = alt.Chart(df).mark_arc().encode(
-                    theta=alt.Theta(field="값", type="quantitative"),
-                    color=alt.Color(field="항목", type="nominal", title="항목"),
-                    tooltip=['항목', '값']
-                ).properties(title=st.session_state.activity1_title)
-                st.altair_chart(c, use_container_width=True)
+            st.vega_lite_chart(spec=chart.spec, use_container_width=True)
+            if chart.caption:
+                st.caption(chart.caption)
         else:
             st.warning("차트를 그리려면 '항목: 값' 형식으로 유효한 데이터를 입력해주세요.")
 
     st.subheader("B장면(차트)이 더 좋은 이유는?")
     st.text_area("B장면이 더 좋은 이유", placeholder="예: 숫자를 읽지 않아도 어떤 과목이 가장 인기 있는지 막대의 길이만 보고 바로 알 수 있어요!", key="activity1_reason")
 
-# --- 활동 2 ---
 with st.container(border=True):
+    activity1()
+
+# --- 활동 2 ---
+@st.fragment
+@section('lesson5', 'activity2')
+def activity2():
     st.header("🛠️ 활동 2: 최고의 레시피(차트) 선택하기")
     st.write("모든 요리에 같은 레시피를 쓸 수는 없습니다. 보여주고 싶은 내용에 맞는 최고의 레시피(차트)를 골라야 하죠. 아래 두 가지 쿡방 미션에 어떤 레시피가 어울릴지 우리 팀의 의견을 정하고, 그 이유를 적어봅시다.")
     st.subheader("미션 A: 가장 인기 있는 급식 메뉴 Top 5")
@@ -258,6 +252,9 @@ with st.container(border=True):
     with b_col2:
         st.text_input("그 레시피를 선택한 이유는?", placeholder="예: 전체에서 남학생과 여학생이 차지하는 비율을 봐야 하니까", key="mission_b_reason")
 
+with st.container(border=True):
+    activity2()
+
 # --- 활동 3 ---
 with st.container(border=True):
     st.header("📝 활동 3: 나의 첫 '시그니처 디쉬' 만들기")
@@ -272,35 +269,58 @@ with st.container(border=True):
     """)
 
 # --- 문제 챌린지 ---
-with st.container(border=True):
+@st.fragment
+@section('lesson5', 'challenge')
+def challenge():
     st.header("🎯 오늘의 챌린지: '셰프 특선 요리' 선보이기")
     st.write("훌륭한 요리가 완성되었습니다! 이제 시청자들에게 이 요리가 어떤 요리인지 설명해야겠죠. 구글 시트에 `5차시_시그니처디쉬`라는 새 탭을 만들고, 여러분의 첫 시그니처 디쉬를 멋지게 플레이팅하여 쿡방 예고편으로 제출해 주십시오.")
     st.subheader("[데이터 쿡방: 오늘의 시그니처 디쉬]")
     st.text_input("**요리(차트) 이름:**", placeholder="예: 반박불가! 우리 학교 급식의 제왕", key="challenge_title")
-    st.file_uploader("**플레이팅(차트 이미지):**", type=['png', 'jpg', 'jpeg'], key="challenge_image")
-    if st.session_state.get('challenge_image', None) is not None:
-        st.image(st.session_state.challenge_image, caption="업로드된 시그니처 디쉬 ✨", use_column_width=True)
+    uploaded_image = st.file_uploader("**플레이팅(차트 이미지):**", type=['png', 'jpg', 'jpeg'], key="challenge_image")
+    prepare_challenge_image(uploaded_image)
+    challenge_image = get_artifact_store().get(st.session_state.get('challenge_image_prepared'))
+    if challenge_image is not None:
+        st.image(challenge_image, caption="업로드된 시그니처 디쉬 ✨", use_column_width=True)
     st.text_area("**셰프의 한 마디 (차트 설명):**", placeholder="예: 이 요리는 우리 학교 학생 절반이 다른 어떤 메뉴보다 '돈까스'를 압도적으로 사랑한다는 사실을 담고 있습니다.", key="challenge_comment")
     
     # 이미지 생성 및 다운로드 버튼 로직
+    with st.expander("내보내기 설정"):
+        st.selectbox("이미지 형식", list(EXPORT_FORMATS), format_func=EXPORT_FORMATS.get, key="export_format")
+        st.number_input("최대 파일 크기 (KB, 0이면 제한 없음)", min_value=0, step=100, key="export_budget_kb")
+
+    # 이미지는 백그라운드 작업자가 만들고, 작업이 끝날 때까지 poll_summary_image 조각이 결과를 확인합니다.
     if st.button("제출 내용으로 이미지 생성하기", type="primary", use_container_width=True):
-        with st.spinner("결과 이미지를 생성 중입니다... 🎨"):
-            image_bytes = create_summary_image()
-            if image_bytes:
-                st.session_state.generated_image = image_bytes
-            else:
-                st.error("이미지 생성에 실패했습니다.")
+        try:
+            st.session_state.generated_image = None
+            st.session_state.render_error = None
+            st.session_state.render_job = request_summary_image()
+        except QueueFullError as e:
+            st.warning(str(e))
+    if st.session_state.get('render_job') is not None:
+        poll_summary_image()
+    if st.session_state.get('render_error'):
+        st.error(st.session_state.render_error)
 
-    if 'generated_image' in st.session_state and st.session_state.generated_image:
+    # 세션 상태에는 이름표만 있고, 이미지 바이트는 다운로드 버튼을 누를 때 저장소에서 꺼냅니다.
+    image = st.session_state.get('generated_image')
+    if image is not None and image not in get_artifact_store():
+        st.session_state.generated_image = None
+        st.info("만든 지 오래된 이미지라 지워졌습니다. 이미지를 다시 생성해 주세요.")
+    elif image is not None:
         st.success("이미지 생성이 완료되었습니다! 아래 버튼으로 다운로드하세요.")
+        if image.notice:
+            st.info(image.notice)
         st.download_button(
             label="결과 이미지 다운로드하기 🖼️",
-            data=st.session_state.generated_image,
-            file_name="데이터쿡방_5차시_결과.png",
-            mime="image/png",
+            data=partial(get_artifact_store().get, image),
+            file_name=f"데이터쿡방_5차시_결과.{image.extension}",
+            mime=image.mime,
             use_container_width=True
         )
 
+with st.container(border=True):
+    challenge()
+
 # --- 정리 및 다음 차시 예고 ---
 with st.container(border=True):
     st.header("📝 정리: 오늘 배운 개념 요약")
@@ -313,4 +333,3 @@ st.markdown('<div style="text-align:center; padding: 2rem;">'
             '<h2>👉 다음 차시 예고</h2>'
             '<p style="font-size: 1.2rem; max-width: 800px; margin: auto; color: #333;">"브라보, 셰프 크리에이터 여러분! 여러분의 주방에서 맛있는 통찰력이 담긴 첫 요리가 탄생했습니다. 하지만 자세히 보니, 몇몇 요리에는 이름표(제목)가 빠져있고, 재료 설명(범례)이 조금 헷갈리기도 합니다. 훌륭한 요리지만, 아직 구독자 100만 채널의 퀄리티는 아닌 것 같군요. 다음 시간에는 우리의 요리를 평범한 맛집 수준에서, 누구도 따라올 수 없는 미슐랭 3스타급 명품 요리로 업그레이드하는 비법을 배우겠습니다. 모두 다음 쿡방을 기대하십시오!"</p>'
             '</div>', unsafe_allow_html=True)
-
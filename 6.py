@@ -1,13 +1,17 @@
 import streamlit as st
-import pandas as pd
-import altair as alt
-from PIL import Image, ImageDraw, ImageFont
-import requests
-from io import BytesIO
-import os
 import datetime
-import re
-import math
+from functools import partial
+from helpers.artifacts import get_artifact_store
+from helpers.chart_data import folded_caption, prepare_chart_data
+from helpers.chart_specs import CompiledChart, compile_chart, data_digest, get_chart_spec
+from helpers.export_formats import EXPORT_FORMATS
+from helpers.fonts import FontUnavailableError
+from helpers.fragments import section
+from helpers.parsing import parse_widget
+from helpers.render_queue import POLL_INTERVAL, QueueFullError, get_render_queue
+from helpers.render_cache import get_render_cache, render_and_cache, submission_key
+from helpers.summary_templates import LESSON6_FIELDS, submission_from_state
+from helpers.upload_widgets import data_upload
 
 # --- 페이지 설정 ---
 st.set_page_config(
@@ -18,162 +22,66 @@ st.set_page_config(
 
 # --- 헬퍼 함수 ---
 
-def parse_data(raw_data):
-    """텍스트 데이터를 파싱하여 리스트로 반환합니다."""
-    parsed_data = []
-    if not raw_data:
-        return parsed_data
-    data_lines = raw_data.strip().split('\n')
-    for line in data_lines:
-        parts = re.split(r'[:\s,]+', line.strip())
-        if len(parts) >= 2:
-            item = parts[0].strip()
-            try:
-                value = float(parts[-1].strip())
-                parsed_data.append({'항목': item, '값': value})
-            except (ValueError, IndexError):
-                pass
-    return parsed_data
-
-def wrap_text(text, font, max_width):
-    """주어진 너비에 맞게 텍스트를 여러 줄로 나눕니다."""
-    lines = []
-    if not text:
-        return lines
-    for line in text.split('\n'):
-        words = line.split(' ')
-        while len(words) > 0:
-            current_line = ''
-            while len(words) > 0 and font.getbbox(current_line + words[0])[2] <= max_width:
-                current_line += (words.pop(0) + ' ')
-            lines.append(current_line.strip())
-    return lines
-
-def draw_chart_on_image(draw, data, chart_type, title, x_pos, y_pos, width, height, font_m, font_s):
-    """Pillow을 사용하여 이미지 위에 간단한 차트를 그립니다."""
-    draw.rectangle([x_pos, y_pos, x_pos + width, y_pos + height], fill="#FFFFFF", outline="#DDDDDD", width=1)
-    
-    # 차트 제목
-    title_bbox = font_m.getbbox(title)
-    draw.text((x_pos + (width - title_bbox[2]) / 2, y_pos + 15), title, font=font_m, fill="#333333")
+def request_summary_image_6():
+    """세션 상태의 모든 입력으로 요약 이미지 생성을 대기열에 맡기고 작업 번호를 돌려줍니다.
 
-    chart_area_y = y_pos + 50
-    chart_area_height = height - 60
-    
-    if not data:
-        draw.text((x_pos + 20, chart_area_y + 20), "데이터 없음", font=font_s, fill="#AAAAAA")
+    같은 내용으로 이미 만든 이미지가 캐시에 있으면 바로 세션 상태에 넣고 None을 돌려줍니다.
+    """
+    submission = submission_from_state(st.session_state, LESSON6_FIELDS)
+    export_format = st.session_state.get('export_format_6', 'png')
+    byte_budget = st.session_state.get('export_budget_kb_6', 0) * 1024 or None
+    key = submission_key('lesson6', submission, export_format, byte_budget)
+    cached = get_render_cache().get(key)
+    if cached is not None:
+        st.session_state.generated_image_6 = cached
+        return None
+    submission['submitted_at'] = datetime.datetime.now().strftime('%Y-%m-%d %H:%M')
+    return get_render_queue().submit(render_and_cache, key, 'lesson6', submission, export_format, byte_budget)
+
+def collect_summary_image_6():
+    """대기열에 맡긴 이미지 생성 작업의 상태를 확인하고, 끝났으면 결과나 오류 안내를 세션 상태로 옮깁니다."""
+    job_id = st.session_state.get('render_job_6')
+    if job_id is None:
         return
+    queue = get_render_queue()
+    status = queue.status(job_id)
+    if status is None or status['state'] in ('done', 'failed'):
+        queue.discard(job_id)
+        del st.session_state['render_job_6']
+    if status is None:
+        st.session_state.render_error_6 = "이미지 생성에 실패했습니다."
+    elif status['state'] == 'done':
+        st.session_state.generated_image_6 = status['result']
+    elif status['state'] == 'failed':
+        if isinstance(status['error'], FontUnavailableError):
+            st.session_state.render_error_6 = str(status['error'])
+        elif isinstance(status['error'], IOError):
+            st.session_state.render_error_6 = "폰트 파일을 로드할 수 없습니다."
+        else:
+            st.session_state.render_error_6 = "이미지 생성에 실패했습니다."
+    elif status['state'] == 'queued':
+        st.info(f"이미지 생성 순서를 기다리는 중입니다... (내 앞에 {status['position']}명) ⏳")
+    else:
+        st.info("결과 이미지를 생성 중입니다... 🎨")
 
-    total_value = sum(item['값'] for item in data)
-    
-    if chart_type == "원 차트 (비율)":
-        if total_value == 0: return
-        center_x, center_y = x_pos + width / 2, chart_area_y + chart_area_height / 2
-        radius = min(width, chart_area_height) * 0.35
-        bbox = [center_x - radius, center_y - radius, center_x + radius, center_y + radius]
-        
-        start_angle = -90
-        colors = ["#4e79a7", "#f28e2b", "#e15759", "#76b7b2", "#59a14f", "#edc948", "#bab0ac", "#d37295"]
-        for i, item in enumerate(data):
-            angle = (item['값'] / total_value) * 360
-            draw.pieslice(bbox, start=start_angle, end=start_angle + angle, fill=colors[i % len(colors)])
-            start_angle += angle
-            
-    elif chart_type == "막대 차트 (비교)":
-        num_bars = len(data)
-        if num_bars == 0: return
-        bar_width = (width - 40) / (num_bars * 1.5)
-        max_val = max(item['값'] for item in data)
-        if max_val == 0: return
-        
-        for i, item in enumerate(data):
-            bar_height = (item['값'] / max_val) * (chart_area_height - 20)
-            bar_x = x_pos + 30 + i * (bar_width * 1.5)
-            bar_y = chart_area_y + chart_area_height - bar_height
-            draw.rectangle([bar_x, bar_y, bar_x + bar_width, chart_area_y + chart_area_height], fill="#4e79a7")
-            label = item['항목']
-            label_bbox = font_s.getbbox(label)
-            draw.text((bar_x + bar_width/2 - label_bbox[2]/2, chart_area_y + chart_area_height + 5), label, font=font_s, fill="#333")
-
-def create_summary_image_6():
-    """세션 상태의 모든 입력을 기반으로 하나의 요약 이미지를 생성합니다."""
-    font_path = "GowunDodum-Regular.ttf"
-    if not os.path.exists(font_path):
-        try:
-            url = "https://github.com/google/fonts/raw/main/ofl/gowundodum/GowunDodum-Regular.ttf"
-            r = requests.get(url)
-            with open(font_path, "wb") as f: f.write(r.content)
-        except Exception as e:
-            st.error(f"폰트를 다운로드하는 데 실패했습니다: {e}"); return None
-    
-    try:
-        title_font = ImageFont.truetype(font_path, 40)
-        header_font = ImageFont.truetype(font_path, 28)
-        body_font = ImageFont.truetype(font_path, 20)
-        small_font = ImageFont.truetype(font_path, 16)
-    except IOError:
-        st.error("폰트 파일을 로드할 수 없습니다."); return None
-
-    content = [
-        ("데이터 쿡방 6차시 제출 결과", title_font),
-        (f"제출 시각: {datetime.datetime.now().strftime('%Y-%m-%d %H:%M')}", body_font), ("", body_font),
-        ("🧐 활동 1: '최악의 레스토랑' 비평 노트", header_font),
-        (f"정체불명 스테이크: {st.session_state.get('critique_1', 'N/A')}", body_font),
-        (f"고무줄 자: {st.session_state.get('critique_2', 'N/A')}", body_font),
-        (f"무지개 폭탄: {st.session_state.get('critique_3', 'N/A')}", body_font), ("", body_font),
-        ("🛠️ 활동 2: 업그레이드 체크리스트", header_font),
-        (f"[제목]: {'완료' if st.session_state.get('check_title', False) else '미완료'}", body_font),
-        (f"[축 레이블]: {'완료' if st.session_state.get('check_axis', False) else '미완료'}", body_font),
-        (f"[색상 강조]: {'완료' if st.session_state.get('check_color', False) else '미완료'}", body_font),
-        (f"[데이터 레이블]: {'완료' if st.session_state.get('check_datalabel', False) else '미완료'}", body_font), ("", body_font),
-        ("🎯 챌린지: 미슐랭 3스타 코스 요리", header_font),
-    ]
-
-    width, padding, line_spacing = 900, 40, 15
-    content_width = width - 2 * padding
-    
-    total_height, wrapped_content = padding, []
-    for text, font in content:
-        for line in wrap_text(text, font, content_width):
-            wrapped_content.append((line, font))
-            bbox = font.getbbox(line)
-            total_height += (bbox[3] - bbox[1]) + line_spacing
-
-    total_height += 350 # 차트 공간
-    
-    img = Image.new('RGB', (width, total_height), '#F0F2F6')
-    draw = ImageDraw.Draw(img)
-    
-    y = padding
-    for text, font in wrapped_content:
-        draw.text((padding, y), text, font=font, fill='#1E3A8A')
-        bbox = font.getbbox(text)
-        y += (bbox[3] - bbox[1]) + line_spacing
-    
-    y += padding
-    chart_width = (content_width - 30) // 3
-    chart_height = 250
-    courses = ['appetizer', 'main_dish', 'dessert']
-    for i, course in enumerate(courses):
-        data = parse_data(st.session_state.get(f'{course}_data', ''))
-        chart_type = st.session_state.get(f'{course}_type', '막대 차트 (비교)')
-        title = st.session_state.get(f'{course}_title', course.capitalize())
-        draw_chart_on_image(draw, data, chart_type, title, padding + i * (chart_width + 15), y, chart_width, chart_height, body_font, small_font)
-    
-    y += chart_height + padding
-    note_lines = wrap_text(f"셰프의 노트: {st.session_state.get('course_note', 'N/A')}", body_font, content_width)
-    for line in note_lines:
-        draw.text((padding, y), line, font=body_font, fill='#1E3A8A')
-        bbox = body_font.getbbox(line)
-        y += (bbox[3] - bbox[1]) + line_spacing
+@st.fragment(run_every=POLL_INTERVAL)
+def poll_summary_image_6():
+    """이미지 생성 작업이 진행 중일 때만 그리는 조각입니다. POLL_INTERVAL마다 이 조각만 다시 실행해 작업 상태를 확인합니다.
 
-    buf = BytesIO()
-    img.save(buf, format='PNG'); return buf.getvalue()
+    작업이 끝나면 페이지 전체를 한 번 다시 실행해 결과를 보여 줍니다. 이때 이 조각은 그려지지 않으므로 확인도 멈춥니다.
+    """
+    collect_summary_image_6()
+    if st.session_state.get('render_job_6') is None:
+        st.rerun()
 
 # --- 스타일링 ---
 st.markdown("""<style>@import url('https://fonts.googleapis.com/css2?family=Gowun+Dodum&display=swap');.stApp{background-color:#F0F2F6;font-family:'Gowun+Dodum',sans-serif}h1,h2,h3{color:#1E3A8A !important;font-weight:bold !important}.main .block-container{max-width:950px !important;margin:0 auto !important}[data-testid="stVerticalBlockBorderWrapper"]{background-color:#fff;border:2px solid #D1D5DB;border-radius:1.5rem;margin-bottom:2rem;box-shadow:0 10px 15px -3px rgba(0,0,0,.05),0 4px 6px -2px rgba(0,0,0,.05)}.note{background-color:#E0E7FF;border-left:5px solid #4F46E5;padding:1.5rem;border-radius:.5rem;margin-bottom:1rem}.critique-box{background-color:#FFFBEB;border:1px solid #FBBF24;padding:1rem;border-radius:.5rem;height:100%}</style>""", unsafe_allow_html=True)
 
 def create_bad_charts():
+    # altair와 pandas는 불러오는 데 오래 걸리므로, 저장한 명세가 없어 차트를 처음 만들 때 불러옵니다.
+    import altair as alt
+    import pandas as pd
+
     df1 = pd.DataFrame({'값': [45, 30, 25]})
     chart1 = alt.Chart(df1).mark_arc().encode(
         theta=alt.Theta(field="값", type="quantitative")
@@ -196,28 +104,70 @@ def create_bad_charts():
 
     return chart1, chart2, chart3
 
+def bad_chart_specs():
+    """예시 차트 세 개의 명세를 돌려줍니다. 늘 같은 차트이므로 프로세스마다 한 번만 만듭니다."""
+    charts = []
+
+    def build(i):
+        # 캐시에 없는 명세가 여럿이어도 차트 세 개는 한 번만 만듭니다.
+        if not charts:
+            charts.extend(create_bad_charts())
+        return compile_chart(charts[i])
+
+    return [get_chart_spec(('lesson6_bad_chart', i), partial(build, i)) for i in range(3)]
+
+def course_chart(df, chart_type, chart_title):
+    """코스 데이터로 원 차트나 막대 차트를 만들어 CompiledChart로 돌려줍니다."""
+    import altair as alt
+
+    if df.empty:
+        return CompiledChart(None)
+    chart_df, folded = prepare_chart_data(df, 'pie' if chart_type == "원 차트 (비율)" else 'bar')
+
+    if chart_type == "원 차트 (비율)":
+        c = alt.Chart(chart_df).mark_arc(innerRadius=20).encode(
+            theta=alt.Theta(field="값", type="quantitative"),
+            color=alt.Color(field="항목", type="nominal", title="항목"),
+            tooltip=['항목', '값']
+        ).properties(title=alt.TitleParams(text=chart_title, anchor='middle'))
+    else: # 막대 차트
+        c = alt.Chart(chart_df).mark_bar().encode(
+            x=alt.X('항목', sort=None),
+            y=alt.Y('값'),
+            color=alt.Color('항목', legend=None),
+            tooltip=['항목', '값']
+        ).properties(title=alt.TitleParams(text=chart_title, anchor='middle'))
+    return compile_chart(c, folded_caption(folded, chart_df))
+
 st.markdown('<h1 style="text-align: center; font-size: 3.5rem;">6차시: 미슐랭 스타의 조건 🌟</h1>', unsafe_allow_html=True)
 st.markdown('<p style="text-align: center; font-size: 1.5rem; color: #555; margin-bottom: 2rem;">최고의 차트로 설득하라!</p>', unsafe_allow_html=True)
 
 with st.container(border=True):
     st.markdown('<div style="text-align:center;"><div style="font-size: 4rem; margin-bottom: 1rem;">🤵</div><h2>미슐랭 심사위원 D의 불시 점검</h2><p style="font-size: 1.2rem; text-align: left;">"셰프 탐정단. 지난주, 여러분의 데이터 쿡방 특집은 성공적이었다. 시청자 반응도 뜨거웠지. 하지만... 나는 보통 셰프가 아니다. 오늘은 크리에이터가 아닌, 세상에서 가장 까다로운 \'미슐랭 심사위원 D\'로서 여러분의 주방을 불시에 점검하겠다."<br><br>"내가 어제 비밀리에 방문했던 한 최악의 레스토랑 이야기를 해주지. 그곳의 요리들은 겉보기엔 그럴듯했지만, 모두 심사에서 탈락했다. 왜였을까?"<br><br>첫 번째 요리 (제목 없는 차트): "정체불명의 스테이크가 나왔다. 이름이 뭐냐고 물으니, 셰프는 그냥 고기요리라고 하더군. 이게 소고기인지, 돼지고기인지, 손님은 알 길이 없다! 최악이다!"<br>두 번째 요리 (축 설명 없는 차트): "수프가 나왔는데, 양이 얼마나 되는지 메뉴판에 전혀 적혀있지 않았다. 이게 1인분인지 2인분인지 알 수 없다! 끔찍하다!"<br>세 번째 요리 (설명 없는 샐러드): "알록달록한 샐러드가 나왔는데, 소스가 뭔지 설명(범례)이 없었다. 초록색 소스가 바질 페스토인지, 와사비인지 어떻게 아나! 당장 주방 문 닫아!"<br><br>"미슐랭 3스타의 조건은 간단하다. <strong>정직함, 친절함, 그리고 아름다움.</strong> 즉, 데이터를 왜곡하지 않고(정직), 누가 봐도 이해하기 쉽게 설명하며(친절), 핵심 메시지를 세련되게 강조하는(아름다움) 것이다. 자, 이제 여러분의 주방으로 돌아가라. 5차시에 만들었던 여러분의 시그니처 디쉬를, 이 미슐랭 3스타의 기준에 맞춰 명품 요리로 업그레이드할 시간이다. 나의 별점을 받을 자격이 있는지, 증명해 봐라!"</p></div>', unsafe_allow_html=True)
 
-with st.container(border=True):
+@st.fragment
+@section('lesson6', 'activity1')
+def activity1():
     st.header("🧐 활동 1: '최악의 레스토랑' 메뉴 비평하기")
     st.write("여러분이 미슐랭 심사위원이라면, 아래 최악의 레스토랑 메뉴판(나쁜 차트 예시)의 문제점은 무엇이고, 어떻게 개선해야 할지 비평 노트를 작성해 보세요.")
-    chart1, chart2, chart3 = create_bad_charts()
+    chart1, chart2, chart3 = (chart.spec for chart in bad_chart_specs())
     col1, col2, col3 = st.columns(3)
     with col1:
-        st.markdown('<div class="critique-box"><h4>정체불명 스테이크</h4></div>', unsafe_allow_html=True); st.altair_chart(chart1, use_container_width=True)
+        st.markdown('<div class="critique-box"><h4>정체불명 스테이크</h4></div>', unsafe_allow_html=True); st.vega_lite_chart(spec=chart1, use_container_width=True)
         st.text_area("비평 노트 1", placeholder="예: 요리 이름(제목)이 없어서 무엇에 대한 비율인지 알 수 없어요. 각 조각(범례)이 무엇인지도 설명이 필요해요.", height=150, label_visibility="collapsed", key="critique_1")
     with col2:
-        st.markdown('<div class="critique-box"><h4>고무줄 자</h4></div>', unsafe_allow_html=True); st.altair_chart(chart2, use_container_width=True)
+        st.markdown('<div class="critique-box"><h4>고무줄 자</h4></div>', unsafe_allow_html=True); st.vega_lite_chart(spec=chart2, use_container_width=True)
         st.text_area("비평 노트 2", placeholder="예: 세로축의 시작이 0이 아니라서 차이가 과장되어 보여요. 정직하지 않아요!", height=150, label_visibility="collapsed", key="critique_2")
     with col3:
-        st.markdown('<div class="critique-box"><h4>무지개 폭탄</h4></div>', unsafe_allow_html=True); st.altair_chart(chart3, use_container_width=True)
+        st.markdown('<div class="critique-box"><h4>무지개 폭탄</h4></div>', unsafe_allow_html=True); st.vega_lite_chart(spec=chart3, use_container_width=True)
         st.text_area("비평 노트 3", placeholder="예: 색깔이 너무 많아서 정신없고, 어떤 과일이 중요한지 알 수 없어요.", height=150, label_visibility="collapsed", key="critique_3")
 
 with st.container(border=True):
+    activity1()
+
+@st.fragment
+@section('lesson6', 'activity2')
+def activity2():
     st.header("🛠️ 활동 2: 우리 팀의 '시그니처 디쉬' 업그레이드하기")
     st.write("이제 우리 주방으로 돌아와, 5차시에 만들었던 시그니처 디쉬를 미슐랭 3스타급으로 업그레이드해 봅시다. 아래 업그레이드 체크리스트를 따라 차근차근 수정해 보세요.")
     st.subheader("[미슐랭 스타를 위한 업그레이드 체크리스트]")
@@ -227,11 +177,74 @@ with st.container(border=True):
     st.checkbox("**[데이터 레이블]** 각 막대나 파이 조각 위에 실제 숫자 값을 표시하여 정확성을 높였나요?", key="check_datalabel")
 
 with st.container(border=True):
+    activity2()
+
+@st.fragment
+@section('lesson6', 'activity3')
+def activity3():
     st.header("📝 활동 3: '코스 요리'로 이야기 만들기")
     st.write("미슐랭 3스타 레스토랑은 단품 요리 하나만으로 평가받지 않습니다. 전체적인 흐름을 보여주는 코스 요리로 승부하죠. 우리 팀의 주장을 뒷받침할 에피타이저, 메인 디쉬, 디저트, 즉 3개의 업그레이드된 차트를 하나의 코스로 구성해 봅시다.")
     st.text_area("코스 이야기 구상하기 ✍️", placeholder="여기에 우리 팀의 코스 요리가 어떤 이야기를 전달할지 자유롭게 적어보세요. (예: 에피타이저로 전체 선호도를 보여주고, 메인 디쉬에서 가장 인기 있는 메뉴를 강조한 뒤, 디저트로 의외의 결과를 보여주자!)", height=150)
     st.markdown('<div class="note"><h5>🧑‍🍳 처음부터 완벽한 미슐랭 3스타 요리를 만드는 셰프는 없습니다.</h4><p>심사위원 D의 피드백을 하나씩 반영하면서, 우리의 요리가 어떻게 명품으로 변신하는지 그 과정을 즐겨봅시다!</p></div>', unsafe_allow_html=True)
 
+with st.container(border=True):
+    activity3()
+
+@st.fragment
+@section('lesson6', 'course')
+def course(key, title):
+    """코스 하나(차트 제목, 데이터, 차트 종류와 차트)를 그립니다. 코스마다 따로 다시 실행됩니다."""
+    with st.expander(f"**{title}**", expanded=True):
+        st.text_input("차트 제목", key=f"{key}_title", placeholder="예: 과일 선호도 비율")
+        st.text_area("데이터 ('항목:값')", key=f"{key}_data", height=150, placeholder="사과: 10\n바나나: 15\n딸기: 8")
+        data_upload(f"{key}_data", label="또는 파일 올리기 (CSV/XLSX)")
+        st.radio("차트 종류", ["원 차트 (비율)", "막대 차트 (비교)"], key=f"{key}_type", horizontal=True)
+
+        # 데이터, 차트 종류, 제목이 그대로면 파싱과 차트 만들기를 건너뛰고 저장한 명세를 씁니다.
+        chart_type = st.session_state.get(f"{key}_type")
+        chart_title = st.session_state.get(f"{key}_title", "")
+        chart = get_chart_spec(
+            ('lesson6_course', chart_type, chart_title, data_digest(st.session_state.get(f"{key}_data"))),
+            lambda: course_chart(parse_widget(st.session_state, f"{key}_data"), chart_type, chart_title),
+        )
+        if chart.spec is not None:
+            st.vega_lite_chart(spec=chart.spec, use_container_width=True)
+        if chart.caption:
+            st.caption(chart.caption)
+
+@st.fragment
+@section('lesson6', 'submit_courses')
+def submit_courses():
+    st.text_area("**오늘의 코스 설명 (셰프의 노트):**", placeholder="이 코스 요리(차트 3개)가 전체적으로 어떤 이야기를 들려주는지...", height=150, key="course_note")
+    
+    with st.expander("내보내기 설정"):
+        st.selectbox("이미지 형식", list(EXPORT_FORMATS), format_func=EXPORT_FORMATS.get, key="export_format_6")
+        st.number_input("최대 파일 크기 (KB, 0이면 제한 없음)", min_value=0, step=100, key="export_budget_kb_6")
+
+    # 이미지는 백그라운드 작업자가 만들고, 작업이 끝날 때까지 poll_summary_image_6 조각이 결과를 확인합니다.
+    if st.button("제출 내용으로 이미지 생성하기", type="primary", use_container_width=True):
+        try:
+            st.session_state.generated_image_6 = None
+            st.session_state.render_error_6 = None
+            st.session_state.render_job_6 = request_summary_image_6()
+        except QueueFullError as e:
+            st.warning(str(e))
+    if st.session_state.get('render_job_6') is not None:
+        poll_summary_image_6()
+    if st.session_state.get('render_error_6'):
+        st.error(st.session_state.render_error_6)
+
+    # 세션 상태에는 이름표만 있고, 이미지 바이트는 다운로드 버튼을 누를 때 저장소에서 꺼냅니다.
+    image = st.session_state.get('generated_image_6')
+    if image is not None and image not in get_artifact_store():
+        st.session_state.generated_image_6 = None
+        st.info("만든 지 오래된 이미지라 지워졌습니다. 이미지를 다시 생성해 주세요.")
+    elif image is not None:
+        st.success("이미지 생성이 완료되었습니다! 아래 버튼으로 다운로드하세요.")
+        if image.notice:
+            st.info(image.notice)
+        st.download_button(label="결과 이미지 다운로드하기 🖼️", data=partial(get_artifact_store().get, image), file_name=f"데이터쿡방_6차시_결과.{image.extension}", mime=image.mime, use_container_width=True)
+
 with st.container(border=True):
     st.header("🎯 오늘의 챌린지: '미슐랭 3스타 코스 요리' 선보이기")
     st.write("여러분의 핵심 주장을 뒷받침하는 에피타이저, 메인 디쉬, 디저트, 즉 3개의 업그레이드된 차트를 코스로 구성하여 미슐랭 코스 메뉴판을 제출해 주십시오.")
@@ -242,54 +255,14 @@ with st.container(border=True):
         'main_dish': '메인 디쉬 (차트 2)',
         'dessert': '디저트 (차트 3)'
     }
-    
-    cols = st.columns(3)
-    for i, (key, title) in enumerate(courses.items()):
-        with cols[i]:
-            with st.expander(f"**{title}**", expanded=True):
-                st.text_input("차트 제목", key=f"{key}_title", placeholder="예: 과일 선호도 비율")
-                st.text_area("데이터 ('항목:값')", key=f"{key}_data", height=150, placeholder="사과: 10\n바나나: 15\n딸기: 8")
-                st.radio("차트 종류", ["원 차트 (비율)", "막대 차트 (비교)"], key=f"{key}_type", horizontal=True)
-                
-                data = parse_data(st.session_state.get(f"{key}_data", ""))
-                if data:
-                    df = pd.DataFrame(data)
-                    chart_type = st.session_state.get(f"{key}_type")
-                    chart_title = st.session_state.get(f"{key}_title", "")
-
-                    if chart_type == "원 차트 (비율)":
-                        c = alt.Chart(df).mark_arc(innerRadius=20).encode(
-                            theta=alt.Theta(field="값", type="quantitative"),
-                            color=alt.Color(field="항목", type="nominal", title="항목"),
-                            tooltip=['항목', '값']
-                        ).properties(title=alt.TitleParams(text=chart_title, anchor='middle'))
-                        st.altair_chart(c, use_container_width=True)
-                    else: # 막대 차트
-                        c = alt.Chart(df).mark_bar().encode(
-                            x=alt.X('항목', sort=None),
-                            y=alt.Y('값'),
-                            color=alt.Color('항목', legend=None),
-                            tooltip=['항목', '값']
-                        ).properties(title=alt.TitleParams(text=chart_title, anchor='middle'))
-                        st.altair_chart(c, use_container_width=True)
 
-    st.text_area("**오늘의 코스 설명 (셰프의 노트):**", placeholder="이 코스 요리(차트 3개)가 전체적으로 어떤 이야기를 들려주는지...", height=150, key="course_note")
-    
-    if st.button("제출 내용으로 이미지 생성하기", type="primary", use_container_width=True):
-        with st.spinner("결과 이미지를 생성 중입니다... 🎨"):
-            image_bytes = create_summary_image_6()
-            if image_bytes:
-                st.session_state.generated_image_6 = image_bytes
-            else:
-                st.error("이미지 생성에 실패했습니다.")
-
-    if 'generated_image_6' in st.session_state and st.session_state.generated_image_6:
-        st.success("이미지 생성이 완료되었습니다! 아래 버튼으로 다운로드하세요.")
-        st.download_button(label="결과 이미지 다운로드하기 🖼️", data=st.session_state.generated_image_6, file_name="데이터쿡방_6차시_결과.png", mime="image/png", use_container_width=True)
+    for col, (key, title) in zip(st.columns(3), courses.items()):
+        with col:
+            course(key, title)
+    submit_courses()
 
 with st.container(border=True):
     st.header("📝 정리: 오늘 배운 개념 요약")
     st.markdown("""- **좋은 차트의 3대 조건:** 정직함(데이터 왜곡 금지), 친절함(쉬운 설명), 아름다움(핵심 강조)\n- **차트의 3대 필수 요소:** 제목(요리 이름), 축 레이블(단위), 범례(재료 설명)는 반드시 포함해야 함\n- **데이터 강조:** 색상이나 글꼴 크기를 활용하면, 우리가 가장 중요하게 생각하는 메시지를 효과적으로 전달할 수 있음""")
 
 st.markdown('<div style="text-align:center; padding: 2rem;"><h2>👉 다음 차시 예고</h2><p style="font-size: 1.2rem; max-width: 800px; margin: auto; color: #333;">"원더풀! ... 다음 시간에는 우리가 만든 이 완벽한 요리(차트)들을 한 테이블에 올려놓고, 그 조합 속에서만 발견되는 충격적인 비밀 레시피, 즉 데이터 인사이트(Insight)를 찾는 여정을 떠나겠습니다."</p></div>', unsafe_allow_html=True)
-
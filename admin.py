@@ -0,0 +1,56 @@
+"""운영 지표 페이지입니다. app.py가 관리자 토큰을 확인한 세션에만 보여 줍니다.
+
+수업 중 재실행, 활동 구역, 이미지 생성, 내보내기가 얼마나 걸리는지(p50/p95)와
+캐시·대기열 상태를 봅니다.
+"""
+import streamlit as st
+
+from helpers.artifacts import get_artifact_store
+from helpers.chart_specs import chart_spec_stats
+from helpers.fonts import font_cache_stats
+from helpers.metrics import METRICS_ENABLED, METRICS_PORT, registry
+from helpers.render_cache import get_render_cache
+from helpers.render_queue import get_render_queue
+
+st.title("📈 운영 지표")
+
+if not METRICS_ENABLED:
+    st.info("계측이 꺼져 있습니다. APP_METRICS=1로 서버를 시작하면 걸린 시간을 잽니다.")
+elif METRICS_PORT:
+    st.caption(f"Prometheus: http://127.0.0.1:{METRICS_PORT}/metrics")
+
+st.subheader("걸린 시간")
+rows = registry.summary()
+if rows:
+    st.dataframe(
+        rows,
+        column_config={
+            'name': "지표", 'labels': "라벨", 'count': "횟수",
+            'mean_ms': st.column_config.NumberColumn("평균(ms)", format="%.1f"),
+            'p50_ms': st.column_config.NumberColumn("p50(ms)", format="%.1f"),
+            'p95_ms': st.column_config.NumberColumn("p95(ms)", format="%.1f"),
+            'max_ms': st.column_config.NumberColumn("최대(ms)", format="%.1f"),
+        },
+        hide_index=True,
+        use_container_width=True,
+    )
+else:
+    st.write("아직 측정값이 없습니다.")
+
+col1, col2 = st.columns(2)
+with col1:
+    st.download_button("Prometheus 텍스트 내려받기", data=registry.prometheus_text(), file_name="metrics.prom",
+                       mime="text/plain", use_container_width=True)
+with col2:
+    if st.button("측정값 비우기", use_container_width=True):
+        registry.clear()
+        st.rerun()
+
+st.subheader("캐시와 대기열")
+st.json({
+    '이미지 생성 대기열': get_render_queue().stats(),
+    '결과 이미지 캐시': get_render_cache().stats(),
+    '이미지 저장소': get_artifact_store().stats(),
+    '차트 명세 캐시': chart_spec_stats(),
+    '폰트 캐시': font_cache_stats(),
+})
@@ -0,0 +1,74 @@
+"""4~6차시 수업 페이지를 한 서버 프로세스에서 여는 멀티페이지 앱입니다.
+
+실행: streamlit run app.py
+
+세 차시가 같은 프로세스에서 helpers 모듈과 캐시(결과 이미지, 차트 명세, 올린 표, 렌더링 작업자)를
+함께 쓰므로 메모리를 한 번만 씁니다. 무거운 모듈(altair, PIL, requests, openpyxl)은 처음 쓸 때
+불러오므로, 한 페이지만 여는 학생은 그 페이지에 필요한 만큼만 기다립니다.
+페이지마다 시작 비용은 python -m benchmarks.bench_imports로 확인합니다.
+
+APP_METRICS=1로 시작하면 재실행과 활동 구역마다 걸린 시간을 잽니다(helpers.metrics).
+APP_PROFILE_MEMORY=1로 시작하면 재실행마다 할당한 메모리와 세션 상태 크기를 JSON 로그에 적습니다(helpers.alloc_profile).
+APP_ADMIN_TOKEN을 정해 두고 ?admin=<토큰>으로 열면 그 세션에서만 운영 지표 페이지가 보입니다.
+"""
+import hmac
+import os
+
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+from helpers.alloc_profile import profile
+from helpers.metrics import start_metrics_server, timer
+from helpers.summary_templates import LESSON5_FIELDS, LESSON6_FIELDS
+
+ADMIN_TOKEN_ENV_VAR = "APP_ADMIN_TOKEN"
+# 기본 페이지는 url_path가 ""가 되므로, 지표 라벨에는 이 이름을 씁니다.
+DEFAULT_URL_PATH = "lesson4"
+
+# 다른 차시 페이지에 다녀와도 남아 있어야 하는 입력 위젯의 키입니다.
+LESSON4_FIELDS = [
+    'variant_data', 'junk_stop_words', 'junk_min_length', 'exploration_notes',
+    'cleaning_data', 'cleaning_whole_cell', 'countif_skip_junk',
+]
+KEPT_KEYS = [*LESSON4_FIELDS, 'activity1_data', 'activity1_chart_type', *LESSON5_FIELDS, *LESSON6_FIELDS]
+
+PAGES = [
+    st.Page("4.py", title="4차시: 데이터 쿡방 스튜디오", icon="🍳", url_path=DEFAULT_URL_PATH, default=True),
+    st.Page("5.py", title="5차시: 데이터 쿡방 특집", icon="📊", url_path="lesson5"),
+    st.Page("6.py", title="6차시: 미슐랭 스타의 조건", icon="🏆", url_path="lesson6"),
+]
+ADMIN_PAGE = st.Page("admin.py", title="운영 지표", icon="📈", url_path="admin")
+
+
+def keep_widget_values(keys):
+    """다른 페이지로 옮겨도 위젯 값이 지워지지 않도록 세션 상태에 다시 적어 둡니다.
+
+    Streamlit은 이번 실행에서 그리지 않은 위젯의 값을 지우지만, 세션 상태에 직접 적은 값은 남겨 둡니다.
+    그래서 이 키의 위젯은 value= 대신 st.session_state.setdefault로 기본값을 줍니다.
+    """
+    for key in keys:
+        if key in st.session_state:
+            st.session_state[key] = st.session_state[key]
+
+
+def is_admin():
+    """이 세션이 관리자 토큰으로 열렸는지 확인합니다. 한 번 확인하면 다른 페이지로 옮겨도 유지합니다."""
+    if st.session_state.get('_admin'):
+        return True
+    token = os.environ.get(ADMIN_TOKEN_ENV_VAR, "")
+    given = st.query_params.get('admin', "")
+    if token and hmac.compare_digest(given.encode(), token.encode()):
+        st.session_state._admin = True
+        return True
+    return False
+
+
+keep_widget_values(KEPT_KEYS)
+start_metrics_server()
+page = st.navigation(PAGES + [ADMIN_PAGE] if is_admin() else PAGES)
+# 조각만 다시 실행할 때는 이 파일이 실행되지 않으므로, 여기서는 페이지 전체 재실행만 잽니다.
+url_path = page.url_path or DEFAULT_URL_PATH
+ctx = get_script_run_ctx()
+session = ctx.session_id[:8] if ctx else ""
+with timer('rerun', page=url_path), profile('rerun', snapshot=True, state=st.session_state, page=url_path, session=session):
+    page.run()
@@ -0,0 +1,181 @@
+"""한 반 학생들의 제출 내용을 한꺼번에 결과 이미지로 만듭니다.
+
+Streamlit 없이 실행하며, 제출 내용을 담은 JSON 또는 CSV를 읽어 CPU 코어 수만큼의
+프로세스로 나눠 그린 뒤 이미지와 manifest.json을 ZIP 하나로 저장합니다.
+
+입력의 각 행(객체)은 페이지의 세션 상태 키를 그대로 씁니다.
+    6차시: critique_1~3, check_title/check_axis/check_color/check_datalabel,
+           appetizer_/main_dish_/dessert_ + title/data/type, course_note
+    5차시: activity1_title, activity1_reason, mission_a_chart, ... , challenge_comment,
+           challenge_image(입력 파일 기준 상대 경로)
+파일 이름에는 student(또는 name, id) 값을 씁니다.
+
+실행 예: python batch_render.py submissions.csv --lesson 6 -o 6차시_결과.zip
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+
+from helpers.export_formats import EXPORT_FORMATS
+from helpers.fonts import FontUnavailableError, get_font_path
+from helpers.summary_templates import LESSON5_FIELDS, LESSON6_FIELDS
+
+LESSONS = {'5': ('lesson5', LESSON5_FIELDS), '6': ('lesson6', LESSON6_FIELDS)}
+ID_FIELDS = ('student', 'name', 'id')
+# 업로드 이미지 파일 경로를 작업 프로세스에 넘길 때 쓰는 키입니다.
+IMAGE_PATH_KEY = '_challenge_image_path'
+_TRUE_VALUES = {'1', 'true', 'yes', 'y', 'o', 'v', '완료'}
+
+
+def read_submissions(path):
+    """JSON(객체 목록 또는 {"submissions": [...]}) 또는 CSV 파일에서 제출 내용 목록을 읽습니다."""
+    if path.lower().endswith('.json'):
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+        if isinstance(data, dict):
+            data = data.get('submissions', [])
+        return list(data)
+    with open(path, encoding='utf-8-sig', newline='') as f:
+        # CSV 셀 안의 줄바꿈은 \n 문자열로 적는 경우가 많습니다. JSON은 이미 제대로 풀린 문자열이므로 바꾸지 않습니다.
+        return [{key: value.replace('\\n', '\n') if isinstance(value, str) else value for key, value in row.items()}
+                for row in csv.DictReader(f)]
+
+
+def normalize_submission(row, fields, base_dir):
+    """입력 한 행을 템플릿이 읽는 제출 내용 dict로 바꿉니다."""
+    submission = {}
+    for key in fields:
+        if key not in row or row[key] is None:
+            continue
+        value = row[key]
+        if key.startswith('check_') and isinstance(value, str):
+            value = value.strip().lower() in _TRUE_VALUES
+        submission[key] = value
+    image_path = row.get('challenge_image')
+    if image_path:
+        # 파일은 작업 프로세스가 읽습니다. 한 학생의 파일이 없어도 그 학생만 실패로 적습니다.
+        submission[IMAGE_PATH_KEY] = os.path.join(base_dir, image_path)
+    if row.get('submitted_at'):
+        submission['submitted_at'] = row['submitted_at']
+    return submission
+
+
+def submission_id(row, index):
+    """파일 이름에 쓸 학생 식별자를 돌려줍니다."""
+    for key in ID_FIELDS:
+        if row.get(key):
+            return str(row[key]).strip().replace('/', '_').replace(os.sep, '_')
+    return f"{index + 1:03d}"
+
+
+def _warm_up():
+    """작업 프로세스마다 폰트를 미리 읽어 둡니다.
+
+    여기서 예외가 나면 작업자 풀 전체가 망가지므로(BrokenProcessPool), 폰트를 못 읽으면 그냥 넘어가고
+    학생마다 _render_one이 오류로 적게 둡니다. 폰트는 render_batch가 풀을 만들기 전에 한 번 확인합니다.
+    """
+    from helpers.fonts import FontUnavailableError, get_font
+    try:
+        for size in (40, 28, 20, 16):
+            get_font(size)
+    except (FontUnavailableError, OSError):
+        pass
+
+
+def _render_one(args):
+    """작업 프로세스에서 제출 하나를 그립니다. 실패해도 예외 대신 오류 메시지를 돌려줍니다."""
+    index, lesson, submission, export_format = args
+    from helpers.summary_templates import render_submission
+
+    start = time.perf_counter()
+    try:
+        image_path = submission.pop(IMAGE_PATH_KEY, None)
+        if image_path:
+            with open(image_path, 'rb') as f:
+                submission['challenge_image'] = f.read()
+        image = render_submission(lesson, submission, export_format)
+    except Exception as e:
+        return index, None, f"{type(e).__name__}: {e}", time.perf_counter() - start
+    return index, image, None, time.perf_counter() - start
+
+
+def render_batch(rows, lesson_key, output, workers=None, export_format='auto', base_dir='.'):
+    """제출 목록을 병렬로 그려 ZIP으로 저장하고, (성공 수, 실패 수, 걸린 시간)을 돌려줍니다.
+
+    폰트를 찾거나 내려받을 수 없으면 아무것도 그리지 않고 FontUnavailableError를 냅니다.
+    """
+    # 학생마다 같은 이유로 실패하지 않도록, 작업 프로세스를 띄우기 전에 폰트를 한 번 준비합니다.
+    get_font_path()
+    lesson, fields = LESSONS[lesson_key]
+    names, seen = [], {}
+    for i, row in enumerate(rows):
+        name = submission_id(row, i)
+        seen[name] = seen.get(name, 0) + 1
+        names.append(name if seen[name] == 1 else f"{name}_{seen[name]}")
+    tasks = [(i, lesson, normalize_submission(row, fields, base_dir), export_format) for i, row in enumerate(rows)]
+    manifest = []
+    ok = failed = 0
+
+    start = time.perf_counter()
+    with zipfile.ZipFile(output, 'w', compression=zipfile.ZIP_STORED) as zf, \
+            ProcessPoolExecutor(max_workers=workers, initializer=_warm_up) as pool:
+        chunksize = max(1, len(tasks) // ((workers or os.cpu_count() or 1) * 4))
+        for index, image, error, seconds in pool.map(_render_one, tasks, chunksize=chunksize):
+            entry = {'id': names[index], 'render_ms': round(seconds * 1000, 1)}
+            if image is None:
+                failed += 1
+                entry['error'] = error
+            else:
+                ok += 1
+                entry['file'] = f"{names[index]}.{image.extension}"
+                entry['bytes'] = len(image.data)
+                if image.notice:
+                    entry['notice'] = image.notice
+                zf.writestr(entry['file'], image.data)
+            manifest.append(entry)
+        elapsed = time.perf_counter() - start
+        zf.writestr('manifest.json', json.dumps({
+            'lesson': lesson,
+            'count': len(rows),
+            'rendered': ok,
+            'failed': failed,
+            'elapsed_seconds': round(elapsed, 3),
+            'images_per_second': round(ok / elapsed, 2) if elapsed else None,
+            'items': manifest,
+        }, ensure_ascii=False, indent=2))
+    return ok, failed, elapsed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="제출 내용(JSON/CSV)으로 한 반의 결과 이미지를 한꺼번에 만듭니다.")
+    parser.add_argument('input', help="제출 내용 JSON 또는 CSV 파일")
+    parser.add_argument('--lesson', choices=sorted(LESSONS), default='6', help="차시 (기본값: 6)")
+    parser.add_argument('-o', '--output', help="저장할 ZIP 파일 (기본값: <입력 파일 이름>_결과.zip)")
+    parser.add_argument('-j', '--workers', type=int, default=None, help="작업 프로세스 수 (기본값: CPU 코어 수)")
+    parser.add_argument('--format', choices=list(EXPORT_FORMATS), default='auto', help="이미지 형식 (기본값: auto)")
+    args = parser.parse_args(argv)
+
+    rows = read_submissions(args.input)
+    if not rows:
+        print("제출 내용이 없습니다.", file=sys.stderr)
+        return 1
+    output = args.output or f"{os.path.splitext(args.input)[0]}_결과.zip"
+    base_dir = os.path.dirname(os.path.abspath(args.input))
+
+    try:
+        ok, failed, elapsed = render_batch(rows, args.lesson, output, args.workers, args.format, base_dir)
+    except FontUnavailableError as e:
+        print(e, file=sys.stderr)
+        return 1
+    rate = ok / elapsed if elapsed else 0.0
+    print(f"{ok}장 생성, {failed}장 실패, {elapsed:.2f}초 ({rate:.2f}장/초) → {output}")
+    return 0 if failed == 0 else 2
+
+
+if __name__ == '__main__':
+    sys.exit(main())
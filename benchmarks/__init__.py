@@ -0,0 +1 @@
+"""헬퍼 모듈의 성능을 재는 마이크로벤치마크 모음입니다."""
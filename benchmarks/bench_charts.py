@@ -0,0 +1,50 @@
+"""차트 명세 벤치마크: 다시 실행될 때마다 파싱하고 Altair 차트를 만드는 방식과 helpers.chart_specs 캐시를 비교합니다.
+
+실행: python -m benchmarks.bench_charts [--items 10 100 1000] [--repeat 20]
+"""
+import argparse
+import time
+
+import altair as alt
+
+from helpers.chart_data import prepare_chart_data
+from helpers.chart_specs import ChartSpecCache, compile_chart, data_digest
+from helpers.parsing import parse_items
+
+
+def make_text(n_items):
+    return '\n'.join(f"항목{i}: {i % 37 + 1}" for i in range(n_items))
+
+
+def make_chart(text):
+    chart_df, _ = prepare_chart_data(parse_items(text), 'bar')
+    return alt.Chart(chart_df).mark_bar().encode(x=alt.X('항목', sort=None), y='값')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--items', type=int, nargs='+', default=[10, 100, 1000])
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    # 파싱 결과는 helpers.parsing이 캐시하므로, '매번 만들기'는 주로 표 복사와 Altair 변환 시간입니다.
+    print(f"{'항목 수':>8} {'매번 만들기(ms)':>16} {'캐시 적중(ms)':>14}")
+    for n in args.items:
+        text = make_text(n)
+
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            make_chart(text).to_dict()
+        rebuild = (time.perf_counter() - start) / args.repeat
+
+        cache = ChartSpecCache()
+        cache.get(('bar', data_digest(text)), lambda: compile_chart(make_chart(text)))
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            cache.get(('bar', data_digest(text)), None)
+        cached = (time.perf_counter() - start) / args.repeat
+        print(f"{n:>8} {rebuild * 1000:>16.2f} {cached * 1000:>14.3f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+"""세척 규칙 벤치마크: 규칙마다 str.replace를 되풀이하는 방식과 helpers.cleaning의 한 번 훑기를 비교합니다.
+
+실행: python -m benchmarks.bench_clean [--rules 10 100 1000 5000] [--rows 20000]
+"""
+import argparse
+import random
+import time
+
+from helpers import cleaning
+
+SYLLABLES = "가나다라마바사아자차카타파하돈까스떡볶이김치찌개"
+
+
+def make_rules(n_rules, seed=0):
+    """서로 다른 '찾을 말' n_rules개로 규칙 목록을 만듭니다."""
+    rng = random.Random(seed)
+    finds = set()
+    while len(finds) < n_rules:
+        finds.add(''.join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 5))))
+    return [(find, find + '!') for find in sorted(finds)]
+
+
+def make_values(rules, n_rows, seed=1):
+    rng = random.Random(seed)
+    return [f"{rng.choice(rules)[0]} 그리고 {rng.choice(SYLLABLES)}" for _ in range(n_rows)]
+
+
+def sequential_clean(values, rules):
+    """예전처럼 규칙 하나마다 데이터 전체를 한 번씩 훑습니다."""
+    for find, replace in rules:
+        values = [v.replace(find, replace) for v in values]
+    return values
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rules', type=int, nargs='+', default=[10, 100, 1000, 5000])
+    parser.add_argument('--rows', type=int, default=20000)
+    args = parser.parse_args()
+
+    print(f"{'규칙 수':>8} {'규칙마다(ms)':>13} {'컴파일(ms)':>11} {'한 번 훑기(ms)':>15}")
+    for n in args.rules:
+        rules = make_rules(n)
+        values = make_values(rules, args.rows)
+
+        start = time.perf_counter()
+        sequential_clean(values, rules)
+        sequential = time.perf_counter() - start
+
+        start = time.perf_counter()
+        cleaner = cleaning.get_cleaner(rules)
+        compile_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        cleaner.clean(values)
+        single = time.perf_counter() - start
+        print(f"{n:>8} {sequential * 1000:>13.1f} {compile_time * 1000:>11.1f} {single * 1000:>15.1f}")
+
+
+if __name__ == '__main__':
+    main()
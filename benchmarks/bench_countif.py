@@ -0,0 +1,59 @@
+"""COUNTIF 벤치마크: 예전 list.count 방식과 helpers.countif의 빈도 색인을 비교합니다.
+
+실행: python -m benchmarks.bench_countif [--rows 1000 10000 100000] [--queries 50]
+"""
+import argparse
+import random
+import time
+
+from helpers import countif
+
+ITEMS = ["돈까스", "돈까쓰", "김치찌개", "김치찌게", "떡볶이", "떠뽀끼", "스파게티", "피자", "ㅋㅋㅋ", "없음"]
+
+
+def make_range(n_rows, seed=0):
+    """설문 응답을 붙여넣은 것 같은 n_rows줄 데이터 범위를 만듭니다."""
+    rng = random.Random(seed)
+    return '\n'.join(rng.choice(ITEMS) for _ in range(n_rows))
+
+
+def legacy_count(data_source, criteria):
+    """4.py에 있던 예전 구현입니다."""
+    data_list = [line.strip() for line in data_source.strip().split('\n') if line.strip()]
+    return data_list.count(criteria)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, nargs='+', default=[1000, 10000, 100000])
+    parser.add_argument('--queries', type=int, default=50)
+    args = parser.parse_args()
+
+    print(f"{'행 수':>8} {'예전(ms/조건)':>14} {'색인 만들기(ms)':>16} {'색인(ms/조건)':>14} {'와일드카드(ms)':>15}")
+    for n in args.rows:
+        data = make_range(n)
+        queries = [ITEMS[i % len(ITEMS)] for i in range(args.queries)]
+
+        start = time.perf_counter()
+        expected = [legacy_count(data, q) for q in queries]
+        legacy = (time.perf_counter() - start) / len(queries)
+
+        countif._build_index.cache_clear()
+        countif.load_range.cache_clear()
+        start = time.perf_counter()
+        countif.get_index(data)
+        build = time.perf_counter() - start
+
+        start = time.perf_counter()
+        got = [countif.countif(data, q) for q in queries]
+        indexed = (time.perf_counter() - start) / len(queries)
+        assert got == expected
+
+        start = time.perf_counter()
+        countif.countif(data, '돈*')
+        wildcard = time.perf_counter() - start
+        print(f"{n:>8} {legacy * 1000:>14.2f} {build * 1000:>16.1f} {indexed * 1000:>14.4f} {wildcard * 1000:>15.3f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,94 @@
+"""페이지 시작 비용 보고서: 차시 페이지마다 새 프로세스에서 맨 위 import와 첫 실행에 드는 시간과 메모리를 잽니다.
+
+실행: python -m benchmarks.bench_imports [--pages 4.py 5.py 6.py app.py]
+
+'import'는 페이지 맨 위에 적힌 모듈을 불러오는 시간(streamlit 제외), '첫 실행'은 그 뒤 페이지를 처음
+그리는 시간입니다(AppTest로 실행). 처음 쓸 때 불러오는 모듈은 '첫 실행'에 들어갑니다.
+'불러온 모듈'은 첫 실행까지 마친 뒤 메모리에 올라온 무거운 모듈입니다.
+app.py는 한 프로세스에서 모든 차시 페이지를 차례로 연 시간과 메모리이므로, 차시별 RSS의 합과 비교합니다.
+"""
+import argparse
+import ast
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+LESSON_PAGES = ('4.py', '5.py', '6.py')
+HEAVY_MODULES = ('pandas', 'numpy', 'pyarrow', 'altair', 'PIL', 'requests', 'openpyxl')
+
+# 새 프로세스에서 실행하는 코드입니다. 결과를 JSON 한 줄로 출력합니다.
+CHILD = """
+import importlib, json, resource, sys, time
+page, modules, heavy, tour = sys.argv[1], sys.argv[2:-2], sys.argv[-2].split(','), sys.argv[-1].split(',')
+import streamlit
+from streamlit.testing.v1 import AppTest
+costs = []
+for module in modules:
+    start = time.perf_counter()
+    importlib.import_module(module)
+    costs.append((module, (time.perf_counter() - start) * 1000))
+start = time.perf_counter()
+at = AppTest.from_file(page, default_timeout=120).run()
+for other in filter(None, tour):
+    at.switch_page(other).run()
+first_run = (time.perf_counter() - start) * 1000
+print(json.dumps({
+    'imports': costs,
+    'first_run': first_run,
+    'exception': bool(at.exception),
+    'rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    'loaded': [m for m in heavy if m in sys.modules],
+}))
+"""
+
+
+def page_imports(path):
+    """페이지 파일의 맨 위(모듈 수준)에 적힌 import 모듈 이름을 적힌 순서대로 돌려줍니다."""
+    with open(path, encoding='utf-8') as f:
+        tree = ast.parse(f.read(), path)
+    modules = []
+    for node in tree.body:
+        if isinstance(node, ast.Import):
+            modules.extend(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+            modules.append(node.module)
+    return [m for m in dict.fromkeys(modules) if m.split('.')[0] != 'streamlit']
+
+
+def measure(page, tour=()):
+    """page를 새 프로세스에서 불러와 처음 실행하고(tour가 있으면 그 페이지들로 차례로 옮겨 가며) 결과를 돌려줍니다."""
+    path = os.path.join(ROOT, page)
+    result = subprocess.run(
+        [sys.executable, '-c', CHILD, path, *page_imports(path), ','.join(HEAVY_MODULES), ','.join(tour)],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--pages', nargs='+', default=['4.py', '5.py', '6.py', 'app.py'])
+    parser.add_argument('--top', type=int, default=3, help="페이지마다 보여줄 가장 오래 걸린 import 수")
+    args = parser.parse_args()
+
+    print(f"{'페이지':<8} {'import(ms)':>11} {'첫 실행(ms)':>12} {'RSS(MB)':>8}  불러온 모듈")
+    details = []
+    for page in args.pages:
+        # 멀티페이지 앱은 첫 페이지(4.py)를 연 뒤 나머지 차시 페이지로 차례로 옮겨 갑니다.
+        report = measure(page, LESSON_PAGES[1:] if page == 'app.py' else ())
+        total = sum(ms for _, ms in report['imports'])
+        note = " (예외 발생)" if report['exception'] else ""
+        print(f"{page:<8} {total:>11.0f} {report['first_run']:>12.0f} {report['rss_mb']:>8.0f}  "
+              f"{', '.join(report['loaded'])}{note}")
+        slowest = sorted(report['imports'], key=lambda item: -item[1])[:args.top]
+        details.append((page, slowest))
+
+    print()
+    for page, slowest in details:
+        print(f"{page}: " + ", ".join(f"{module} {ms:.0f}ms" for module, ms in slowest))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,47 @@
+"""계측 비용 벤치마크: helpers.metrics의 timed()가 꺼져 있을 때와 켜져 있을 때 호출 한 번에 더하는 시간을 잽니다.
+
+실행: python -m benchmarks.bench_metrics [--calls 200000]
+
+계측은 서버를 시작할 때(APP_METRICS) 켜고 끄므로, 여기서는 METRICS_ENABLED를 바꿔 가며 함수를 감쌉니다.
+"""
+import argparse
+import time
+
+from helpers import metrics
+
+
+def work():
+    return None
+
+
+def per_call(fn, calls):
+    start = time.perf_counter()
+    for _ in range(calls):
+        fn()
+    return (time.perf_counter() - start) / calls
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--calls', type=int, default=200_000)
+    args = parser.parse_args()
+
+    enabled = metrics.METRICS_ENABLED
+    try:
+        metrics.METRICS_ENABLED = False
+        disabled_fn = metrics.timed('bench')(work)
+        metrics.METRICS_ENABLED = True
+        enabled_fn = metrics.timed('bench', page='bench')(work)
+    finally:
+        metrics.METRICS_ENABLED = enabled
+
+    base = per_call(work, args.calls)
+    print(f"{'':<10} {'호출당(µs)':>12} {'더한 시간(µs)':>14}")
+    for label, fn in (("감싸지 않음", work), ("꺼짐", disabled_fn), ("켜짐", enabled_fn)):
+        cost = per_call(fn, args.calls)
+        print(f"{label:<10} {cost * 1e6:>12.3f} {(cost - base) * 1e6:>14.3f}")
+    metrics.registry.clear()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,88 @@
+"""'항목: 값' 파서 벤치마크: 예전 줄 단위 re.split 파서와 helpers.parsing을 비교합니다.
+
+실행: python -m benchmarks.bench_parse [--lines 1000 10000 100000] [--repeat 3]
+"""
+import argparse
+import random
+import re
+import time
+
+from helpers import parsing
+
+ITEMS = ["사과", "바나나", "딸기", "포도", "오렌지", "김치찌개", "돈까스", "떡볶이", "딸기 우유", "급식 메뉴"]
+SEPARATORS = [": ", ":", " ", ", ", " : "]
+
+
+def legacy_parse_data(raw_data):
+    """6.py에 있던 예전 구현입니다."""
+    parsed_data = []
+    if not raw_data:
+        return parsed_data
+    for line in raw_data.strip().split('\n'):
+        parts = re.split(r'[:\s,]+', line.strip())
+        if len(parts) >= 2:
+            item = parts[0].strip()
+            try:
+                parsed_data.append({'항목': item, '값': float(parts[-1].strip())})
+            except (ValueError, IndexError):
+                pass
+    return parsed_data
+
+
+def make_paste(n_lines, seed=0):
+    """설문 결과를 붙여넣은 것 같은 n_lines줄 텍스트를 만듭니다. 일부 줄은 잘못된 형식입니다."""
+    rng = random.Random(seed)
+    lines = []
+    for _ in range(n_lines):
+        if rng.random() < 0.05:
+            lines.append(rng.choice(["", "ㅋㅋㅋ", "없음"]))
+            continue
+        value = rng.randint(0, 5000)
+        value = f"{value:,}" if rng.random() < 0.2 else str(value)
+        lines.append(f"{rng.choice(ITEMS)}{rng.choice(SEPARATORS)}{value}")
+    return '\n'.join(lines)
+
+
+def best_of(fn, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def make_editor(text):
+    """IncrementalParser에 가운데 줄 하나를 고친 텍스트와 원래 텍스트를 번갈아 넣는 함수를 만듭니다."""
+    middle = text.find('\n', len(text) // 2)
+    edited = text[:middle] + '0' + text[middle:]
+    parser = parsing.IncrementalParser()
+    parser.parse(text)
+    texts = [edited, text]
+
+    def edit():
+        parser.parse(texts[0])
+        texts.reverse()
+    return edit
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--lines', type=int, nargs='+', default=[1000, 10000, 100000])
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'줄 수':>8} {'예전(ms)':>10} {'새 파서(ms)':>12} {'캐시 적중(ms)':>13} {'한 글자 수정(ms)':>16} {'줄/초':>12}")
+    for n in args.lines:
+        text = make_paste(n)
+        legacy = best_of(lambda: legacy_parse_data(text), args.repeat)
+        current = best_of(lambda: parsing._parse_text(text), args.repeat)
+        parsing.parse_items(text)
+        cached = best_of(lambda: parsing.parse_items(text), args.repeat)
+        edit = best_of(make_editor(text), args.repeat)
+        print(f"{n:>8} {legacy * 1000:>10.1f} {current * 1000:>12.1f} {cached * 1000:>13.2f} "
+              f"{edit * 1000:>16.2f} {n / current:>12,.0f}")
+
+
+if __name__ == '__main__':
+    main()
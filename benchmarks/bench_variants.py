@@ -0,0 +1,49 @@
+"""비슷한 표기 찾기 벤치마크: helpers.variants.find_variants가 응답 수와 서로 다른 값 수에 따라 얼마나 걸리는지 잽니다.
+
+실행: python -m benchmarks.bench_variants [--responses 100000] [--distinct 1000 3000 6000]
+"""
+import argparse
+import random
+import time
+
+from helpers import variants
+
+
+def make_responses(n_responses, n_distinct, seed=0):
+    """서로 다른 값 약 n_distinct개(그중 1/4은 받침이나 모음 하나가 다른 오타)로 응답을 만듭니다."""
+    rng = random.Random(seed)
+    syllables = [chr(0xAC00 + rng.randrange(11172)) for _ in range(300)]
+    base = set()
+    while len(base) < n_distinct * 3 // 4:
+        base.add(''.join(rng.choice(syllables) for _ in range(rng.randint(2, 5))))
+    base = sorted(base)
+
+    def typo(word):
+        i = rng.randrange(len(word))
+        code = ord(word[i]) - 0xAC00
+        return word[:i] + chr(0xAC00 + code // 28 * 28 + rng.randrange(28)) + word[i + 1:]
+
+    distinct = base + [typo(word) for word in base[:n_distinct // 4]]
+    return [rng.choice(distinct) for _ in range(n_responses)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--responses', type=int, default=100000)
+    parser.add_argument('--distinct', type=int, nargs='+', default=[1000, 3000, 6000])
+    args = parser.parse_args()
+
+    print(f"{'서로 다른 값':>10} {'거리 1(ms)':>11} {'거리 2(ms)':>11} {'묶음 수':>8}")
+    for n in args.distinct:
+        responses = make_responses(args.responses, n)
+        timings = []
+        for distance in (1, 2):
+            variants.decompose.cache_clear()
+            start = time.perf_counter()
+            clusters = variants.find_variants(responses, max_distance=distance)
+            timings.append(time.perf_counter() - start)
+        print(f"{n:>10} {timings[0] * 1000:>11.1f} {timings[1] * 1000:>11.1f} {len(clusters):>8}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+"""줄바꿈 엔진 벤치마크: 예전 wrap_text와 helpers.text_wrap.wrap_text를 비교합니다.
+
+실행: python -m benchmarks.bench_wrap [--kb 2 4 8] [--repeat 5]
+"""
+import argparse
+import random
+import time
+
+from helpers.fonts import get_font
+from helpers import text_wrap
+from helpers.text_wrap import wrap_text
+
+SYLLABLES = "가나다라마바사아자차카타파하김치찌개돈까스떡볶이급식메뉴학생데이터차트"
+
+
+def legacy_wrap_text(text, font, max_width):
+    """5.py/6.py에 있던 예전 구현입니다. 한 줄보다 긴 단어는 무한 루프를 막으려고 통째로 넣습니다."""
+    lines = []
+    if not text:
+        return lines
+    for line in text.split('\n'):
+        words = line.split(' ')
+        while len(words) > 0:
+            current_line = ''
+            while len(words) > 0 and font.getbbox(current_line + words[0])[2] <= max_width:
+                current_line += (words.pop(0) + ' ')
+            if not current_line:
+                current_line = words.pop(0)
+            lines.append(current_line.strip())
+    return lines
+
+
+def make_answer(kb, seed=0):
+    """띄어쓰기와 긴 구절이 섞인 kb 킬로바이트 분량의 한글 답안을 만듭니다."""
+    rng = random.Random(seed)
+    words = []
+    size = 0
+    while size < kb * 1024:
+        length = rng.choice([1, 2, 2, 3, 3, 4, 6]) if rng.random() > 0.02 else 80
+        word = ''.join(rng.choice(SYLLABLES) for _ in range(length))
+        words.append(word)
+        size += len(word.encode('utf-8')) + 1
+        if rng.random() < 0.03:
+            words.append('\n')
+    return ' '.join(words).replace(' \n ', '\n')
+
+
+def bench(fn, text, font, max_width, repeat):
+    """repeat번 실행한 가장 빠른 시간을 초 단위로 돌려줍니다."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(text, font, max_width)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--kb', type=int, nargs='+', default=[1, 2, 4, 8])
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--width', type=int, default=720)
+    args = parser.parse_args()
+
+    font = get_font(20)
+    print(f"{'크기':>6} {'줄 수':>6} {'예전(ms)':>10} {'새 엔진 첫 실행(ms)':>18} {'새 엔진(ms)':>12} {'배속':>6}")
+    for kb in args.kb:
+        text = make_answer(kb)
+        legacy = bench(legacy_wrap_text, text, font, args.width, args.repeat)
+        # 너비 캐시가 빈 상태의 첫 실행과, 캐시가 찬 뒤의 반복 실행을 따로 잽니다.
+        text_wrap._width_caches.pop(font, None)
+        cold = bench(wrap_text, text, font, args.width, 1)
+        current = bench(wrap_text, text, font, args.width, args.repeat)
+        n_lines = len(wrap_text(text, font, args.width))
+        print(f"{kb:>4}KB {n_lines:>6} {legacy * 1000:>10.1f} {cold * 1000:>18.2f} {current * 1000:>12.2f} {legacy / cold:>6.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,93 @@
+"""할당 추적 로그(helpers.alloc_profile)를 릴리스별로 모아 비교합니다.
+
+로그의 기록을 release 값(없으면 파일 이름)별로 묶고, 블록(이름과 라벨, 세션 라벨 제외)마다
+순 할당·최고 할당·세션 상태 크기의 중앙값을 나란히 보여 줍니다. 마지막 열은 첫 묶음 대비 최고 할당 변화입니다.
+재실행 안의 활동 구역 같은 안쪽 블록(children)도 따로 셉니다. --sites를 주면 묶음마다 가장 많이 할당한 코드 줄도 보여 줍니다.
+
+실행 예: python compare_profiles.py 이전/alloc_profile.jsonl* 새/alloc_profile.jsonl* --sites 5
+"""
+import argparse
+import json
+import os
+import statistics
+from collections import defaultdict
+
+IGNORED_LABELS = ('session',)
+
+
+def read_records(paths):
+    """로그 파일들에서 (묶음 이름, 기록) 목록을 읽습니다. 읽을 수 없는 줄은 건너뜁니다."""
+    for path in paths:
+        with open(path, encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                yield record.get('release') or os.path.basename(path), record
+
+
+def block_key(record):
+    labels = ', '.join(f"{k}={v}" for k, v in sorted(record.get('labels', {}).items()) if k not in IGNORED_LABELS)
+    return f"{record['name']}({labels})" if labels else record['name']
+
+
+def walk(record):
+    """기록과 그 안에서 잰 블록(children)을 모두 차례로 돌려줍니다."""
+    yield record
+    for child in record.get('children', []):
+        yield from walk(child)
+
+
+def collect(paths):
+    """묶음별로 {블록: {'net': [...], 'peak': [...], 'session': [...]}}과 할당 위치 합계를 모읍니다."""
+    blocks = defaultdict(lambda: defaultdict(lambda: defaultdict(list)))
+    sites = defaultdict(lambda: defaultdict(int))
+    for group, record in read_records(paths):
+        for item in walk(record):
+            values = blocks[group][block_key(item)]
+            values['net'].append(item['net_bytes'])
+            values['peak'].append(item['peak_bytes'])
+            if 'session_bytes' in item:
+                values['session'].append(item['session_bytes'])
+            for site in item.get('top_sites', []):
+                sites[group][site['site']] += site['size_diff']
+    return blocks, sites
+
+
+def _kb(values):
+    return f"{statistics.median(values) / 1024:,.0f}" if values else "-"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('logs', nargs='+', help="alloc_profile.jsonl 파일(돌려 가며 보관한 .1, .2 … 포함)")
+    parser.add_argument('--sites', type=int, default=0, help="묶음마다 보여줄 할당 위치 수")
+    args = parser.parse_args()
+
+    blocks, sites = collect(args.logs)
+    groups = list(blocks)
+    if not groups:
+        print("기록이 없습니다.")
+        return
+    print(f"{'블록':<48} {'묶음':<16} {'횟수':>6} {'순(KB)':>10} {'최고(KB)':>10} {'세션(KB)':>10} {'최고 변화':>10}")
+    for key in sorted({key for group in groups for key in blocks[group]}):
+        base = blocks[groups[0]].get(key)
+        for group in groups:
+            values = blocks[group].get(key)
+            if values is None:
+                continue
+            change = ""
+            if base is not None and group != groups[0] and statistics.median(base['peak']):
+                change = f"{statistics.median(values['peak']) / statistics.median(base['peak']) - 1:+.0%}"
+            print(f"{key:<48} {group:<16} {len(values['peak']):>6} {_kb(values['net']):>10} "
+                  f"{_kb(values['peak']):>10} {_kb(values['session']):>10} {change:>10}")
+
+    for group in groups if args.sites else ():
+        print(f"\n[{group}] 할당이 많은 코드 줄")
+        for site, size in sorted(sites[group].items(), key=lambda item: -item[1])[:args.sites]:
+            print(f"  {size / 1024:>10,.0f} KB  {site}")
+
+
+if __name__ == '__main__':
+    main()
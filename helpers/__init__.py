@@ -0,0 +1 @@
+"""데이터 쿡방 차시 페이지들이 함께 쓰는 헬퍼 모음입니다."""
@@ -0,0 +1,201 @@
+"""재실행, 활동 구역, 내보내기가 메모리를 얼마나 할당하는지 tracemalloc으로 재는 도구입니다.
+
+APP_PROFILE_MEMORY=1로 서버를 시작할 때만 잽니다. 꺼져 있으면 profiled()는 함수를 그대로 돌려주고
+profile()은 아무것도 하지 않는 컨텍스트를 돌려줍니다. 켜면 tracemalloc이 모든 할당을 추적하므로
+서버가 눈에 띄게 느려집니다. 부하 시험이나 릴리스 비교 때만 켭니다.
+
+- 블록마다 순 할당(끝난 뒤 남은 바이트)과 최고 할당(블록 중 가장 많았을 때, 시작 시점 기준)을 잽니다.
+- snapshot=True인 블록(재실행, 내보내기)은 SNAPSHOT_EVERY번에 한 번 앞뒤 스냅숏을 비교해 가장 많이 할당한
+  코드 줄 TOP_SITES개를 적습니다.
+- 블록 안에서 잰 블록(활동 구역 등)은 바깥 블록의 children으로 함께 적고, 바깥 블록이 없는 블록은 따로 한 줄로 적습니다.
+- state(세션 상태)를 주면 블록이 끝난 뒤 세션 상태의 크기와 큰 키를 함께 적습니다.
+
+기록은 JSON 한 줄씩 PROFILE_LOG_PATH에 쓰고, PROFILE_LOG_BYTES를 넘으면 PROFILE_LOG_BACKUPS개까지
+돌려 가며 보관합니다. 릴리스끼리는 python compare_profiles.py 이전.jsonl 새.jsonl로 비교합니다.
+
+tracemalloc의 최고 할당은 프로세스 전체 값이므로, 여러 세션이 동시에 실행되면 서로의 할당이 섞입니다.
+"""
+import datetime
+import functools
+import itertools
+import json
+import logging
+import os
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from contextlib import nullcontext
+from logging.handlers import RotatingFileHandler
+
+PROFILE_ENABLED = os.environ.get("APP_PROFILE_MEMORY", "") not in ("", "0")
+PROFILE_LOG_PATH = os.environ.get("APP_PROFILE_LOG", os.path.join(tempfile.gettempdir(), "alloc_profile.jsonl"))
+PROFILE_LOG_BYTES = int(os.environ.get("APP_PROFILE_LOG_BYTES", str(10 * 1024 * 1024)))
+PROFILE_LOG_BACKUPS = 5
+# 같은 로그에 여러 릴리스를 적을 때 구분하는 이름입니다.
+RELEASE = os.environ.get("APP_RELEASE", "")
+
+# 할당 위치는 코드 줄 하나로만 묶으므로 프레임 하나만 기록합니다. 프레임이 많을수록 추적이 느려집니다.
+TRACE_FRAMES = 1
+# 스냅숏을 뜨고 비교하는 데 힙 크기에 비례한 시간(수 초)이 들므로, snapshot=True 블록도 이 횟수마다 한 번만 뜹니다.
+SNAPSHOT_EVERY = int(os.environ.get("APP_PROFILE_SNAPSHOT_EVERY", "10"))
+TOP_SITES = 10
+TOP_SESSION_KEYS = 10
+
+_NULL_PROFILE = nullcontext()
+# 스냅숏에서 뺄 할당입니다(추적 도구 자신과 모듈 불러오기).
+_IGNORED_FILES = (tracemalloc.__file__, "<frozen importlib._bootstrap>", "<frozen importlib._bootstrap_external>", "<unknown>")
+
+_local = threading.local()
+_snapshot_counter = itertools.count()
+_logger = None
+_logger_lock = threading.Lock()
+
+
+def _get_logger():
+    global _logger
+    if _logger is None:
+        with _logger_lock:
+            if _logger is None:
+                logger = logging.getLogger("alloc_profile")
+                logger.setLevel(logging.INFO)
+                logger.propagate = False
+                handler = RotatingFileHandler(PROFILE_LOG_PATH, maxBytes=PROFILE_LOG_BYTES,
+                                              backupCount=PROFILE_LOG_BACKUPS, encoding="utf-8")
+                handler.setFormatter(logging.Formatter("%(message)s"))
+                logger.addHandler(handler)
+                _logger = logger
+    return _logger
+
+
+def _snapshot():
+    return tracemalloc.take_snapshot().filter_traces(
+        [tracemalloc.Filter(False, filename) for filename in _IGNORED_FILES])
+
+
+def top_sites(before, after, limit=TOP_SITES):
+    """두 스냅숏 사이에 가장 많이 늘어난 할당 위치(파일:줄)를 돌려줍니다."""
+    sites = []
+    for stat in after.compare_to(before, "lineno")[:limit]:
+        frame = stat.traceback[0]
+        sites.append({
+            'site': f"{os.path.relpath(frame.filename)}:{frame.lineno}",
+            'size_diff': stat.size_diff,
+            'count_diff': stat.count_diff,
+        })
+    return sites
+
+
+def deep_size(value, seen=None):
+    """값이 붙잡고 있는 메모리를 대략 잽니다. DataFrame은 pandas가 잰 크기를 씁니다."""
+    if seen is None:
+        seen = set()
+    if id(value) in seen:
+        return 0
+    seen.add(id(value))
+    pandas = sys.modules.get("pandas")
+    if pandas is not None and isinstance(value, (pandas.DataFrame, pandas.Series)):
+        return int(value.memory_usage(deep=True).sum()) if value.ndim == 2 else int(value.memory_usage(deep=True))
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        size += sum(deep_size(k, seen) + deep_size(v, seen) for k, v in value.items())
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        size += sum(deep_size(item, seen) for item in value)
+    elif hasattr(value, "__dict__") and not isinstance(value, type):
+        size += deep_size(vars(value), seen)
+    return size
+
+
+def session_size(state):
+    """세션 상태 전체 크기와 가장 큰 키 TOP_SESSION_KEYS개를 돌려줍니다."""
+    seen = set()
+    sizes = {str(key): deep_size(value, seen) for key, value in state.items()}
+    top = sorted(sizes.items(), key=lambda item: -item[1])[:TOP_SESSION_KEYS]
+    return sum(sizes.values()), [{'key': key, 'bytes': size} for key, size in top]
+
+
+class _Profile:
+    def __init__(self, name, labels, snapshot, state):
+        self.name = name
+        self.labels = labels
+        self.snapshot = snapshot
+        self.state = state
+
+    def __enter__(self):
+        stack = getattr(_local, "stack", None)
+        if stack is None:
+            stack = _local.stack = []
+        current, peak = tracemalloc.get_traced_memory()
+        if stack:
+            # 최고 할당을 다시 재기 전에, 바깥 블록이 지금까지 본 최고값을 넘겨 둡니다.
+            stack[-1].peak_seen = max(stack[-1].peak_seen, peak)
+        self.children = []
+        self.before = _snapshot() if self.snapshot and next(_snapshot_counter) % SNAPSHOT_EVERY == 0 else None
+        tracemalloc.reset_peak()
+        self.start_bytes = tracemalloc.get_traced_memory()[0]
+        self.peak_seen = self.start_bytes
+        self.start = time.perf_counter()
+        stack.append(self)
+        return self
+
+    def __exit__(self, *exc):
+        duration = time.perf_counter() - self.start
+        current, peak = tracemalloc.get_traced_memory()
+        peak = max(peak, self.peak_seen)
+        stack = _local.stack
+        stack.pop()
+        record = {
+            'name': self.name,
+            'labels': self.labels,
+            'duration_ms': round(duration * 1000, 3),
+            'net_bytes': current - self.start_bytes,
+            'peak_bytes': peak - self.start_bytes,
+        }
+        if self.children:
+            record['children'] = self.children
+        if self.before is not None:
+            before, self.before = self.before, None
+            record['top_sites'] = top_sites(before, _snapshot())
+        if self.state is not None:
+            record['session_bytes'], record['session_top'] = session_size(self.state)
+
+        if stack:
+            stack[-1].peak_seen = max(stack[-1].peak_seen, peak)
+            stack[-1].children.append(record)
+        else:
+            record['time'] = datetime.datetime.now().isoformat(timespec='seconds')
+            record['release'] = RELEASE
+            _get_logger().info(json.dumps(record, ensure_ascii=False, default=str))
+        return False
+
+
+def start():
+    """켜져 있으면 할당 추적을 시작합니다. 여러 번 불러도 됩니다."""
+    if PROFILE_ENABLED and not tracemalloc.is_tracing():
+        tracemalloc.start(TRACE_FRAMES)
+
+
+def profile(name, snapshot=False, state=None, **labels):
+    """with 블록의 할당을 name으로 적는 컨텍스트를 돌려줍니다. 꺼져 있으면 아무것도 하지 않습니다.
+
+    snapshot=True이면 할당 위치 TOP_SITES개를, state(세션 상태)를 주면 끝난 뒤 세션 상태 크기를 함께 적습니다.
+    """
+    if not PROFILE_ENABLED:
+        return _NULL_PROFILE
+    start()
+    return _Profile(name, labels, snapshot, state)
+
+
+def profiled(name, snapshot=False, **labels):
+    """함수 한 번 호출의 할당을 name으로 적는 데코레이터입니다. 꺼져 있으면 함수를 그대로 돌려줍니다."""
+    def decorator(fn):
+        if not PROFILE_ENABLED:
+            return fn
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with profile(name, snapshot, **labels):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,202 @@
+"""결과 이미지와 업로드 이미지를 세션 상태 밖에 두는 저장소입니다.
+
+세션 상태에 이미지 바이트를 그대로 두면 탭을 닫을 때까지 메모리에 남아, 학생이 많은 날에는
+서버 메모리가 계속 늘어납니다. 이 저장소는 바이트를 내용의 sha256으로 한 번만 저장하고(같은
+이미지는 세션이 달라도 한 벌), 세션 상태에는 작은 이름표(ArtifactHandle)만 둡니다.
+결과 이미지 캐시(helpers.render_cache)와 이미지 생성 대기열의 작업 결과도 이름표만 두므로,
+이미지 바이트가 메모리에 머무는 곳은 이 저장소 하나입니다.
+
+- 메모리에는 ARTIFACT_MEMORY_BYTES까지만 두고, 넘으면 오래 안 쓴 것부터 임시 폴더로 옮깁니다.
+  SPILL_BYTES보다 큰 항목은 처음부터 디스크에 씁니다.
+- 디스크도 ARTIFACT_DISK_BYTES를 넘으면 오래 안 쓴 것부터 지웁니다.
+- ARTIFACT_TTL초 동안 아무도 쓰지 않은 항목은 지웁니다. 지워진 항목은 get()이 None을 돌려주므로,
+  페이지는 다시 만들거나 다시 올려 달라고 안내합니다.
+"""
+import atexit
+import hashlib
+import os
+import shutil
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+
+ARTIFACT_MEMORY_BYTES = int(os.environ.get("ARTIFACT_MEMORY_BYTES", str(32 * 1024 * 1024)))
+ARTIFACT_DISK_BYTES = int(os.environ.get("ARTIFACT_DISK_BYTES", str(1024 * 1024 * 1024)))
+ARTIFACT_TTL = int(os.environ.get("ARTIFACT_TTL_SECONDS", str(8 * 60 * 60)))
+# 임시 폴더 위치입니다. 정하지 않으면 프로세스마다 새로 만들고 끝날 때 지웁니다.
+ARTIFACT_DIR_ENV_VAR = "ARTIFACT_DIR"
+
+SPILL_BYTES = 1024 * 1024
+# TTL이 지난 항목은 이 간격(초)보다 자주 찾지 않습니다.
+SWEEP_INTERVAL = 60
+
+
+@dataclass(frozen=True)
+class ArtifactHandle:
+    """세션 상태에 두는 저장소 항목의 이름표입니다. 바이트는 저장소에 있습니다."""
+    digest: str
+    size: int
+    mime: str = ''
+    extension: str = ''
+    notice: str = ''
+
+
+class ArtifactStore:
+    """내용 해시로 바이트를 저장하는, 메모리 한도와 디스크 한도와 TTL이 있는 LRU 저장소입니다."""
+
+    def __init__(self, max_memory_bytes=ARTIFACT_MEMORY_BYTES, max_disk_bytes=ARTIFACT_DISK_BYTES,
+                 ttl=ARTIFACT_TTL, directory=None, clock=time.monotonic):
+        self.max_memory_bytes = max_memory_bytes
+        self.max_disk_bytes = max_disk_bytes
+        self.ttl = ttl
+        self._directory = directory
+        self._clock = clock
+        self._memory = OrderedDict()  # 해시 -> 바이트 (오래 안 쓴 것이 앞)
+        self._disk = OrderedDict()  # 해시 -> 바이트 크기
+        self._used = {}  # 해시 -> 마지막으로 쓴 시각
+        self._memory_size = 0
+        self._disk_size = 0
+        self._last_sweep = clock()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.spills = 0
+        self.evictions = 0
+
+    def _dir(self):
+        if self._directory is None:
+            self._directory = tempfile.mkdtemp(prefix="artifacts-")
+            atexit.register(shutil.rmtree, self._directory, True)
+        os.makedirs(self._directory, exist_ok=True)
+        return self._directory
+
+    def _path(self, digest):
+        return os.path.join(self._dir(), digest)
+
+    def _write(self, digest, data):
+        """바이트를 디스크에 씁니다. 읽는 쪽이 반쯤 쓰인 파일을 보지 않도록 임시 파일 이름을 바꿉니다."""
+        fd, tmp_path = tempfile.mkstemp(dir=self._dir(), prefix=".tmp-")
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, self._path(digest))
+        self._disk[digest] = len(data)
+        self._disk_size += len(data)
+
+    def _remove_file(self, digest):
+        self._disk_size -= self._disk.pop(digest)
+        try:
+            os.remove(self._path(digest))
+        except FileNotFoundError:
+            pass
+
+    def _forget(self, digest):
+        """항목을 메모리와 디스크에서 모두 지웁니다. _lock을 잡은 상태에서 부릅니다."""
+        data = self._memory.pop(digest, None)
+        if data is not None:
+            self._memory_size -= len(data)
+        if digest in self._disk:
+            self._remove_file(digest)
+        self._used.pop(digest, None)
+        self.evictions += 1
+
+    def _shrink(self):
+        """한도를 넘으면 메모리에서는 디스크로 옮기고, 디스크에서는 지웁니다. _lock을 잡은 상태에서 부릅니다."""
+        while self._memory_size > self.max_memory_bytes:
+            digest, data = self._memory.popitem(last=False)
+            self._memory_size -= len(data)
+            self._write(digest, data)
+            self.spills += 1
+        while self._disk_size > self.max_disk_bytes:
+            self._forget(next(iter(self._disk)))
+
+    def _sweep(self, now):
+        """TTL 동안 쓰지 않은 항목을 지웁니다. _lock을 잡은 상태에서 부릅니다."""
+        if now - self._last_sweep < SWEEP_INTERVAL:
+            return
+        self._last_sweep = now
+        for digest in [d for d, used in self._used.items() if now - used > self.ttl]:
+            self._forget(digest)
+
+    def put(self, data, mime='', extension='', notice=''):
+        """바이트를 저장하고 이름표를 돌려줍니다. 이미 있는 내용이면 다시 저장하지 않습니다."""
+        data = bytes(data)
+        digest = hashlib.sha256(data).hexdigest()
+        with self._lock:
+            now = self._clock()
+            self._sweep(now)
+            if digest in self._memory:
+                self._memory.move_to_end(digest)
+            elif digest in self._disk:
+                self._disk.move_to_end(digest)
+            elif len(data) > SPILL_BYTES:
+                self._write(digest, data)
+            else:
+                self._memory[digest] = data
+                self._memory_size += len(data)
+            self._used[digest] = now
+            self._shrink()
+        return ArtifactHandle(digest, len(data), mime, extension, notice)
+
+    def get(self, handle):
+        """이름표에 해당하는 바이트를 돌려줍니다. 만료되었거나 한도 때문에 지워졌으면 None입니다."""
+        if handle is None:
+            return None
+        with self._lock:
+            now = self._clock()
+            self._sweep(now)
+            data = self._memory.get(handle.digest)
+            if data is not None:
+                self._memory.move_to_end(handle.digest)
+            elif handle.digest in self._disk:
+                try:
+                    with open(self._path(handle.digest), "rb") as f:
+                        data = f.read()
+                except FileNotFoundError:
+                    self._forget(handle.digest)
+                else:
+                    self._disk.move_to_end(handle.digest)
+            if data is None:
+                self.misses += 1
+                return None
+            self._used[handle.digest] = now
+            self.hits += 1
+            return data
+
+    def __contains__(self, handle):
+        with self._lock:
+            return handle is not None and (handle.digest in self._memory or handle.digest in self._disk)
+
+    def stats(self):
+        """적중/실패 횟수, 메모리·디스크에 있는 항목 수와 바이트 크기, 옮기고 지운 횟수를 돌려줍니다."""
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'memory_entries': len(self._memory),
+                'memory_bytes': self._memory_size,
+                'disk_entries': len(self._disk),
+                'disk_bytes': self._disk_size,
+                'spills': self.spills,
+                'evictions': self.evictions,
+            }
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_artifact_store():
+    """프로세스 전체가 함께 쓰는 저장소를 돌려줍니다."""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = ArtifactStore(directory=os.environ.get(ARTIFACT_DIR_ENV_VAR))
+    return _store
+
+
+def store_image(image):
+    """인코딩한 이미지(EncodedImage)를 저장소에 넣고 세션 상태에 둘 이름표를 돌려줍니다."""
+    return get_artifact_store().put(image.data, image.mime, image.extension, image.notice)
@@ -0,0 +1,52 @@
+"""차트에 넘기기 전에 '항목: 값' 데이터를 줄입니다.
+
+Altair는 넘긴 표의 모든 행을 Vega-Lite 명세에 그대로 넣어 브라우저로 보냅니다. 응답 열처럼
+항목이 수천 개면 명세가 수 MB가 되고 파이 조각도 읽을 수 없으므로, 같은 항목의 값을 먼저
+합친 뒤 값이 큰 항목 몇 개만 남기고 나머지는 '기타' 하나로 묶습니다. 남길 개수는 차트 종류마다
+CHART_TOP_N에 정해 두었고, 어떤 경우에도 MAX_CHART_ROWS행을 넘지 않습니다.
+pandas는 차트를 처음 그릴 때 불러옵니다.
+"""
+OTHER_LABEL = "기타"
+MAX_CHART_ROWS = 200
+
+# 차트 종류별로 남길 항목 수('기타' 포함)입니다. 파이 조각은 몇 개만 넘어도 비교하기 어렵습니다.
+CHART_TOP_N = {
+    'pie': 8,
+    'bar': 20,
+    'line': 50,
+}
+
+
+def prepare_chart_data(df, chart='bar', top_n=None):
+    """'항목', '값' DataFrame을 차트에 넘길 크기로 줄여 (표, '기타'로 묶은 항목 수)를 돌려줍니다.
+
+    같은 항목의 값은 합치고, 항목이 top_n개(기본값은 CHART_TOP_N[chart])를 넘으면 값이 큰
+    top_n - 1개만 처음 나온 순서대로 남긴 뒤 나머지를 합친 '기타'를 마지막에 붙입니다.
+    """
+    import pandas as pd
+
+    if top_n is None:
+        top_n = CHART_TOP_N.get(chart, MAX_CHART_ROWS)
+    top_n = max(2, min(int(top_n), MAX_CHART_ROWS))
+    if df.empty:
+        return df, 0
+
+    totals = df.groupby('항목', sort=False)['값'].sum()
+    if len(totals) <= top_n:
+        return totals.reset_index(), 0
+
+    # 데이터에 원래 '기타' 항목이 있으면 묶는 쪽에 합칩니다.
+    others = totals.drop(OTHER_LABEL, errors='ignore')
+    kept = others.nlargest(top_n - 1, keep='first')
+    kept = others[others.index.isin(kept.index)]
+    folded = totals.drop(kept.index)
+    result = pd.concat([kept, pd.Series([folded.sum()], index=[OTHER_LABEL])])
+    result = result.rename_axis('항목').rename('값').reset_index()
+    return result, len(folded) - (OTHER_LABEL in folded.index)
+
+
+def folded_caption(folded, chart_df):
+    """'기타'로 묶은 항목이 있으면 차트 아래에 보여줄 안내 문구를, 없으면 빈 문자열을 돌려줍니다."""
+    if not folded:
+        return ""
+    return f"항목이 많아 값이 큰 {len(chart_df) - 1}개만 보여주고, 나머지 {folded:,}개는 '{OTHER_LABEL}'로 묶었어요."
@@ -0,0 +1,99 @@
+"""완성된 차트 명세(Vega-Lite dict)를 데이터 해시, 차트 종류, 제목으로 기억해 두는 캐시입니다.
+
+Streamlit은 글자 하나만 바뀌어도 페이지 전체를 다시 실행하므로, 그때마다 데이터를 파싱하고
+Altair 차트를 만들어 명세로 바꾸는 일을 되풀이하게 됩니다. 이 캐시는 입력 텍스트의 해시로
+키를 만들어, 입력이 그대로면 파싱도 Altair도 거치지 않고 저장해 둔 명세를
+st.vega_lite_chart로 바로 그리게 합니다.
+
+명세의 데이터(datasets)는 미리 Arrow IPC 바이트로 바꿔 두므로 Streamlit이 다시 변환하지 않습니다.
+"""
+import copy
+import hashlib
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+
+import pyarrow as pa
+
+from helpers.alloc_profile import profiled
+from helpers.metrics import timed
+
+MAX_CACHED_SPECS = 256
+
+
+@dataclass(frozen=True)
+class CompiledChart:
+    """캐시에 저장하는 차트입니다. 데이터가 비어 그릴 것이 없으면 spec이 None입니다."""
+    spec: dict
+    caption: str = ""
+
+
+def data_digest(text):
+    """입력 텍스트의 sha256 해시(16진수)를 돌려줍니다."""
+    return hashlib.sha256((text or '').encode('utf-8')).hexdigest()
+
+
+def _arrow_bytes(records):
+    table = pa.Table.from_pylist(records)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+@timed('compile_chart')
+@profiled('compile_chart')
+def compile_chart(chart, caption=""):
+    """Altair 차트를 명세 dict로 바꿔 CompiledChart로 돌려줍니다. 데이터는 Arrow 바이트가 됩니다."""
+    spec = chart.to_dict()
+    spec['datasets'] = {name: _arrow_bytes(records) for name, records in spec.get('datasets', {}).items()}
+    return CompiledChart(spec, caption)
+
+
+class ChartSpecCache:
+    """항목 수가 제한된 LRU 캐시입니다. 키는 (종류, 데이터 해시, 제목, ...) 같은 튜플입니다."""
+
+    def __init__(self, max_entries=MAX_CACHED_SPECS):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, build):
+        """키에 해당하는 차트를 돌려줍니다. 없으면 build()로 만들어 저장합니다.
+
+        Streamlit이 그리는 중에 명세를 고칠 수 있으므로 명세는 복사해서 돌려줍니다.
+        """
+        with self._lock:
+            chart = self._entries.get(key)
+            if chart is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+        if chart is None:
+            chart = build()
+            with self._lock:
+                self.misses += 1
+                self._entries[key] = chart
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        return CompiledChart(copy.deepcopy(chart.spec), chart.caption)
+
+    def stats(self):
+        """적중/실패 횟수와 항목 수를 돌려줍니다."""
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'entries': len(self._entries)}
+
+
+_cache = ChartSpecCache()
+
+
+def get_chart_spec(key, build):
+    """프로세스 전체가 함께 쓰는 캐시에서 차트를 찾거나 build()로 만들어 돌려줍니다."""
+    return _cache.get(key, build)
+
+
+def chart_spec_stats():
+    """프로세스 전체가 함께 쓰는 차트 명세 캐시의 통계를 돌려줍니다."""
+    return _cache.stats()
@@ -0,0 +1,128 @@
+"""'자동 세척기'(찾기 및 바꾸기) 규칙을 데이터에 한 번에 적용합니다.
+
+규칙마다 데이터를 다시 훑지 않도록 모든 '찾을 말'을 트라이(trie) 모양의 정규식 하나로 묶어,
+데이터 전체를 한 번만 훑으며 바꿉니다(Aho-Corasick처럼 여러 말을 동시에 찾습니다).
+겹치는 규칙은 시트처럼 왼쪽에서부터, 같은 위치에서는 가장 긴 말이 먼저 적용됩니다.
+컴파일한 규칙은 규칙 목록이 바뀔 때까지 기억해 둡니다.
+"""
+import csv
+import io
+import re
+from collections import Counter
+from functools import lru_cache
+
+import pandas as pd
+
+# CSV 첫 줄이 이 이름들이면 머리글로 보고 건너뜁니다.
+HEADER_NAMES = {'find', '찾기', '찾을 말', '손질할 재료', '원래 값'}
+
+
+def _trie_pattern(words):
+    """여러 낱말을 트라이 모양 정규식으로 만듭니다. 같은 위치에서는 가장 긴 낱말이 맞습니다."""
+    trie = {}
+    for word in words:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[''] = True
+    return _node_pattern(trie)
+
+
+def _node_pattern(node):
+    branches = [re.escape(ch) + _node_pattern(child) for ch, child in sorted(node.items()) if ch]
+    if not branches:
+        return ''
+    body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+    if '' in node:
+        # 여기서 끝나는 낱말이 있으면 뒤는 선택입니다. 탐욕적 ?라서 더 긴 낱말을 먼저 시도합니다.
+        body = '(?:' + body + ')?'
+    return body
+
+
+class Cleaner:
+    """컴파일한 세척 규칙입니다. rules는 (찾을 말, 바꿀 말) 쌍의 목록이며, 같은 찾을 말은 처음 것만 씁니다."""
+
+    def __init__(self, rules):
+        self.rules = {}
+        for find, replace in rules:
+            if find:
+                self.rules.setdefault(find, replace)
+        self.pattern = re.compile(_trie_pattern(self.rules)) if self.rules else None
+
+    def clean(self, values, whole_cell=False):
+        """값 목록에 규칙을 적용해 (바뀐 값 목록, 규칙별 적용 횟수 Counter)를 돌려줍니다.
+
+        whole_cell이면 시트의 '전체 셀 내용 일치'처럼 셀 전체가 찾을 말과 같을 때만 바꿉니다.
+        """
+        values = ['' if v is None else str(v) for v in values]
+        if self.pattern is None:
+            return values, Counter()
+        if whole_cell:
+            counts = Counter(values)
+            hits = Counter({find: counts[find] for find in self.rules if counts[find]})
+            return [self.rules.get(v, v) for v in values], hits
+
+        hits = Counter()
+
+        def replace(match):
+            find = match.group()
+            hits[find] += 1
+            return self.rules[find]
+
+        # 셀마다 같은 컴파일된 정규식을 씁니다. 셀을 이어 붙였다 나누면 셀 안의 구분 문자 때문에
+        # 셀 수가 달라질 수 있습니다.
+        sub = self.pattern.sub
+        return [sub(replace, v) for v in values], hits
+
+    def hit_table(self, hits):
+        """규칙 순서대로 '찾을 말', '바꿀 말', '적용 횟수' DataFrame을 만듭니다."""
+        return pd.DataFrame(
+            [(find, replace, hits.get(find, 0)) for find, replace in self.rules.items()],
+            columns=['찾을 말', '바꿀 말', '적용 횟수'],
+        )
+
+
+@lru_cache(maxsize=8)
+def _compile(rules):
+    return Cleaner(rules)
+
+
+def get_cleaner(rules):
+    """규칙 목록(dict 목록 또는 (찾을 말, 바꿀 말) 쌍)으로 Cleaner를 돌려줍니다. 같은 규칙이면 다시 컴파일하지 않습니다."""
+    pairs = tuple(
+        (str(r['find']).strip(), str(r['replace']).strip()) if isinstance(r, dict) else tuple(r)
+        for r in rules
+    )
+    return _compile(pairs)
+
+
+def valid_rules(rules):
+    """찾을 말과 바꿀 말이 모두 있는 규칙만 돌려줍니다."""
+    valid = []
+    for rule in rules:
+        find, replace = rule.get('find'), rule.get('replace')
+        if isinstance(find, str) and isinstance(replace, str) and find.strip() and replace.strip():
+            valid.append({'find': find.strip(), 'replace': replace.strip()})
+    return valid
+
+
+def read_rules_csv(data):
+    """'찾을 말,바꿀 말' 두 열짜리 CSV(바이트 또는 문자열)에서 규칙 목록을 읽습니다.
+
+    엑셀에서 저장한 CSV(CP949)도 읽으며, 첫 줄이 머리글이면 건너뜁니다.
+    """
+    if isinstance(data, bytes):
+        try:
+            data = data.decode('utf-8-sig')
+        except UnicodeDecodeError:
+            data = data.decode('cp949')
+    rules = []
+    for i, row in enumerate(csv.reader(io.StringIO(data))):
+        if len(row) < 2:
+            continue
+        find, replace = row[0].strip(), row[1].strip()
+        if i == 0 and find.lower() in HEADER_NAMES:
+            continue
+        if find:
+            rules.append({'find': find, 'replace': replace})
+    return rules
@@ -0,0 +1,302 @@
+"""구글 시트의 COUNTIF / COUNTIFS를 흉내 내는 개수 세기 엔진입니다.
+
+데이터 범위는 한 줄에 한 행이고, 시트에서 여러 열을 복사해 붙여넣으면 탭으로 나뉜 열(A, B, C...)이
+됩니다. 같은 데이터 범위에는 빈도 색인(해시 카운터와 정렬된 키)을 한 번만 만들어 두고,
+조건마다 결과를 기억하므로 같은 조건을 다시 물으면 바로 답합니다.
+
+조건은 시트와 같은 규칙을 따릅니다.
+    "돈까스"        같은 값 (대소문자 구분 없음)
+    "돈*", "김치찌?" 와일드카드 (*: 아무 글자 여러 개, ?: 아무 글자 하나, ~*: 글자 * 자체)
+    ">10", "<=3"    숫자 비교 (숫자가 아닌 조건이면 글자 순서로 비교)
+    "<>없음"        같지 않은 값 (시트처럼 범위 안의 빈 칸도 셉니다)
+    "", "="         빈 칸 ("<>"만 쓰면 빈 칸이 아닌 칸)
+빈 칸은 붙여넣은 범위 사이의 빈 줄(앞뒤 빈 줄은 범위가 아닙니다)과 올린 파일의 빈 셀입니다.
+같지 않음 조건과 빈 조건 말고는 빈 칸을 세지 않습니다.
+"""
+import re
+import threading
+from bisect import bisect_left, bisect_right
+from collections import Counter, OrderedDict
+from dataclasses import dataclass
+from functools import lru_cache
+from itertools import accumulate
+
+import pandas as pd
+
+OPERATORS = ('>=', '<=', '<>', '>', '<', '=')
+MAX_COLUMN_INDEXES = 16
+NUMBER_PATTERN = re.compile(r'[-+]?(?:\d+(?:\.\d*)?|\.\d+)(?:[eE][-+]?\d+)?')
+# 사용자가 조건을 따옴표로 감싸 입력해도 처리합니다: "돈까스", '돈까스'
+_QUOTES = re.compile(r'^\s*(["\'])(.*)\1\s*$', re.S)
+
+
+def to_number(text):
+    """숫자로 읽을 수 있는 글자면 float로, 아니면 None을 돌려줍니다."""
+    text = text.strip()
+    return float(text) if NUMBER_PATTERN.fullmatch(text) else None
+
+
+def _wildcard_regex(text):
+    """시트 와일드카드(*, ?, ~ 이스케이프)를 정규식으로 바꿉니다. 와일드카드가 없으면 None입니다."""
+    parts, has_wildcard, i = [], False, 0
+    while i < len(text):
+        ch = text[i]
+        if ch == '~' and i + 1 < len(text) and text[i + 1] in '*?~':
+            parts.append(re.escape(text[i + 1]))
+            i += 2
+            continue
+        if ch in '*?':
+            parts.append('.*' if ch == '*' else '.')
+            has_wildcard = True
+        else:
+            parts.append(re.escape(ch))
+        i += 1
+    return re.compile(''.join(parts), re.S) if has_wildcard else None
+
+
+@dataclass(frozen=True)
+class Criterion:
+    """COUNTIF 조건 하나를 해석한 결과입니다."""
+    raw: str
+    op: str
+    text: str
+    number: float = None
+    pattern: re.Pattern = None
+
+    def matches_key(self, key):
+        """정규화한(casefold) 값 하나가 같음 조건에 맞는지 확인합니다."""
+        if self.pattern is not None:
+            return self.pattern.fullmatch(key) is not None
+        return key == self.text
+
+    @property
+    def is_blank(self):
+        """빈 조건("", "=", "<>")이면 True입니다."""
+        return self.op in ('=', '<>') and not self.text and self.pattern is None
+
+    def mask(self, series):
+        """pandas Series 전체에 조건을 한 번에 적용한 불리언 마스크를 돌려줍니다."""
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            # 범주형 열은 범주(와 빈 칸)에만 조건을 적용한 뒤 코드로 펼칩니다. 코드 -1(빈 칸)은 마지막 원소입니다.
+            categories = pd.Series([*map(_cell_text, series.cat.categories), ''], dtype=object)
+            matched = self.mask(categories).to_numpy()
+            return pd.Series(matched[series.cat.codes.to_numpy()], index=series.index)
+        if pd.api.types.is_numeric_dtype(series):
+            numbers, keys = series.astype(float), series.astype(str).str.casefold()
+            filled = numbers.notna()
+        else:
+            keys = series.fillna('').astype(str).str.strip().str.casefold()
+            numbers = pd.to_numeric(keys.where(keys.str.fullmatch(NUMBER_PATTERN.pattern)), errors='coerce')
+            filled = keys != ''
+        if self.is_blank:
+            return ~filled if self.op == '=' else filled
+        matched = self._match(numbers, keys)
+        # 시트처럼 같지 않음 조건만 빈 칸도 셉니다.
+        return (matched if self.op == '<>' else matched & filled).astype(bool)
+
+    def _match(self, numbers, keys):
+        if self.op in ('=', '<>'):
+            if self.number is not None:
+                equal = numbers == self.number
+            elif self.pattern is not None:
+                equal = keys.str.fullmatch(self.pattern.pattern, flags=re.S)
+            else:
+                equal = keys == self.text
+            equal = equal.fillna(False).astype(bool)
+            return ~equal if self.op == '<>' else equal
+
+        compare = {'>': 'gt', '>=': 'ge', '<': 'lt', '<=': 'le'}[self.op]
+        if self.number is not None:
+            return getattr(numbers, compare)(self.number).fillna(False).astype(bool)
+        return numbers.isna() & getattr(keys, compare)(self.text).fillna(False).astype(bool)
+
+
+@lru_cache(maxsize=256)
+def parse_criterion(criterion):
+    """조건 문자열('돈까스', '">10"', '김*' 등)을 Criterion으로 해석합니다."""
+    raw = criterion
+    quoted = _QUOTES.match(criterion)
+    text = quoted.group(2) if quoted else criterion.strip()
+    op = next((o for o in OPERATORS if text.startswith(o)), None)
+    if op is None:
+        op = '='
+    else:
+        text = text[len(op):]
+    text = text.strip()
+    number = to_number(text)
+    pattern = None
+    if number is None and op in ('=', '<>'):
+        pattern = _wildcard_regex(text.casefold())
+    if pattern is None:
+        text = re.sub(r'~([*?~])', r'\1', text)
+    return Criterion(raw, op, text.casefold(), number, pattern)
+
+
+class FrequencyIndex:
+    """값 목록의 빈도 색인입니다. 같음 조건은 해시 조회로, 비교 조건은 정렬된 키의 이분 탐색으로 셉니다.
+
+    total은 빈 칸이 아닌 값의 수이고, 빈 칸(빈 문자열과 blanks)은 blanks에 따로 셉니다.
+    """
+
+    def __init__(self, values=(), counts=None, blanks=0):
+        self.total = 0
+        self.blanks = blanks
+        self.counts = Counter()
+        self.names = {}
+        # 먼저 원래 값 그대로 센 뒤(C로 구현된 Counter), 서로 다른 값만 정규화해 합칩니다.
+        if counts is None:
+            counts = Counter(map(str.strip, values))
+        for value, count in counts.items():
+            if not value:
+                self.blanks += count
+                continue
+            key = value.casefold()
+            self.counts[key] += count
+            self.names.setdefault(key, value)
+            self.total += count
+
+        numbers, texts = Counter(), {}
+        for key, count in self.counts.items():
+            number = to_number(key)
+            if number is None:
+                texts[key] = count
+            else:
+                numbers[number] += count
+        self.numbers = numbers
+        self._number_keys = sorted(numbers)
+        self._number_cumulative = [0, *accumulate(numbers[k] for k in self._number_keys)]
+        self._text_keys = sorted(texts)
+        self._text_cumulative = [0, *accumulate(texts[k] for k in self._text_keys)]
+        self._memo = {}
+
+    @classmethod
+    def from_series(cls, series):
+        """pandas Series(범주형 열 포함)로 빈도 색인을 만듭니다. 서로 다른 값만 파이썬에서 다룹니다."""
+        counts = Counter()
+        for value, count in series.value_counts(dropna=True).items():
+            if count:
+                counts[_cell_text(value)] += int(count)
+        return cls(counts=counts, blanks=int(series.isna().sum()))
+
+    def count(self, criterion):
+        """조건에 맞는 값의 개수를 돌려줍니다. 같은 조건은 다시 계산하지 않습니다."""
+        if criterion not in self._memo:
+            self._memo[criterion] = self._count(parse_criterion(criterion))
+        return self._memo[criterion]
+
+    def _count(self, c):
+        if c.op in ('=', '<>'):
+            if c.is_blank:
+                equal = self.blanks
+            elif c.number is not None:
+                equal = self.numbers[c.number]
+            elif c.pattern is not None:
+                equal = sum(count for key, count in self.counts.items() if c.matches_key(key))
+            else:
+                equal = self.counts[c.text]
+            return self.total + self.blanks - equal if c.op == '<>' else equal
+
+        if c.number is not None:
+            keys, cumulative, target = self._number_keys, self._number_cumulative, c.number
+        else:
+            keys, cumulative, target = self._text_keys, self._text_cumulative, c.text
+        if c.op == '>':
+            return cumulative[-1] - cumulative[bisect_right(keys, target)]
+        if c.op == '>=':
+            return cumulative[-1] - cumulative[bisect_left(keys, target)]
+        if c.op == '<':
+            return cumulative[bisect_left(keys, target)]
+        return cumulative[bisect_right(keys, target)]
+
+    def frequency_table(self):
+        """값별 개수를 많은 순서로 정렬한 DataFrame('항목', '개수')을 돌려줍니다."""
+        table = pd.DataFrame(
+            [(self.names[key], count) for key, count in self.counts.most_common()],
+            columns=['항목', '개수'],
+        )
+        return table.astype({'개수': 'int64'})
+
+
+def _cell_text(value):
+    """표의 값 하나를 시트 셀에 보이는 글자로 바꿉니다. 10.0은 '10'이 됩니다."""
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value).strip()
+
+
+def column_names(count):
+    """시트처럼 열 이름 A, B, C ... 를 만듭니다."""
+    names = []
+    for i in range(count):
+        name = ''
+        i += 1
+        while i:
+            i, rest = divmod(i - 1, 26)
+            name = chr(ord('A') + rest) + name
+        names.append(name)
+    return names
+
+
+def _range_lines(data_source):
+    """붙여넣은 데이터 범위의 줄 목록입니다. 앞뒤 빈 줄은 빼고, 사이의 빈 줄은 빈 칸으로 둡니다."""
+    lines = data_source.splitlines()
+    start = next((i for i, line in enumerate(lines) if line.strip()), len(lines))
+    end = next((i for i in range(len(lines), start, -1) if lines[i - 1].strip()), start)
+    return lines[start:end]
+
+
+@lru_cache(maxsize=16)
+def load_range(data_source):
+    """붙여넣은 데이터 범위를 열 A, B, C...의 DataFrame으로 만듭니다. 사이의 빈 줄은 빈 칸 행입니다."""
+    rows = [line.split('\t') for line in _range_lines(data_source)]
+    width = max((len(row) for row in rows), default=1)
+    rows = [[cell.strip() for cell in row] + [''] * (width - len(row)) for row in rows]
+    return pd.DataFrame(rows, columns=column_names(width), dtype=object)
+
+
+def get_index(data_source, column='A'):
+    """데이터 범위의 한 열에 대한 빈도 색인을 돌려줍니다. 같은 데이터 범위에는 한 번만 만듭니다."""
+    return _build_index(data_source, column)
+
+
+@lru_cache(maxsize=16)
+def _build_index(data_source, column):
+    if '\t' not in data_source:
+        return FrequencyIndex(_range_lines(data_source) if column == 'A' else [])
+    table = load_range(data_source)
+    return FrequencyIndex(table[column].tolist() if column in table else [])
+
+
+_column_indexes = OrderedDict()
+_column_lock = threading.Lock()
+
+
+def get_column_index(key, series):
+    """업로드한 표의 한 열에 대한 빈도 색인을 돌려줍니다. key(파일 해시, 열 이름 등)가 같으면 다시 만들지 않습니다."""
+    with _column_lock:
+        index = _column_indexes.get(key)
+        if index is not None:
+            _column_indexes.move_to_end(key)
+            return index
+    index = FrequencyIndex.from_series(series)
+    with _column_lock:
+        _column_indexes[key] = index
+        while len(_column_indexes) > MAX_COLUMN_INDEXES:
+            _column_indexes.popitem(last=False)
+    return index
+
+
+def countif(data_source, criterion, column='A'):
+    """=COUNTIF(범위, 조건)과 같습니다."""
+    return get_index(data_source, column).count(criterion)
+
+
+def countifs(table, conditions):
+    """=COUNTIFS(범위1, 조건1, 범위2, 조건2, ...)와 같습니다.
+
+    conditions는 (열 이름, 조건) 쌍의 목록이며, 열마다 조건 마스크를 만든 뒤 모두 AND 합니다.
+    """
+    mask = pd.Series(True, index=table.index)
+    for column, criterion in conditions:
+        mask &= parse_criterion(criterion).mask(table[column])
+    return int(mask.sum())
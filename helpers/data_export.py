@@ -0,0 +1,103 @@
+"""손질한 데이터를 CSV/XLSX 파일로 내보냅니다.
+
+표 전체를 한 문자열로 만들지 않고 CHUNK_ROWS행씩 써 내려가며, 파일은 SPOOL_BYTES까지는
+메모리에, 그보다 커지면 임시 파일(디스크)에 씁니다. XLSX는 openpyxl의 write_only 모드로 쓰고,
+값별 개수를 담은 '요약' 시트를 함께 넣습니다. 다 쓴 파일은 바이트로 돌려줍니다. st.download_button은
+파일 객체 가운데 BytesIO 같은 몇 가지만 받고(SpooledTemporaryFile은 받지 않음), 받더라도 어차피 바이트로 읽습니다.
+
+Streamlit 내려받기 버튼에는 deferred_export가 만든 함수를 넘깁니다. 그러면 버튼을 누를 때
+비로소 파일을 만들므로, 화면이 다시 실행될 때마다 파일을 만들어 두지 않습니다.
+"""
+import codecs
+from functools import partial
+from tempfile import SpooledTemporaryFile
+
+import pandas as pd
+
+from helpers.alloc_profile import profiled
+from helpers.metrics import timed
+
+CHUNK_ROWS = 10_000
+SPOOL_BYTES = 8 * 1024 * 1024
+DATA_SHEET = "데이터"
+SUMMARY_SHEET = "요약"
+
+EXPORT_TYPES = {
+    'csv': ("CSV", 'text/csv'),
+    'xlsx': ("엑셀(XLSX)", 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'),
+}
+
+
+def value_counts_table(df, column):
+    """한 열의 값별 개수와 비율 표('값', '개수', '비율(%)')를 많은 순서로 만듭니다."""
+    counts = df[column].value_counts(dropna=True)
+    counts = counts[counts > 0]
+    total = int(counts.sum())
+    return pd.DataFrame({
+        '값': counts.index.astype(str),
+        '개수': counts.to_numpy(dtype='int64'),
+        '비율(%)': (counts.to_numpy() / total * 100).round(1) if total else counts.to_numpy(dtype=float),
+    })
+
+
+def _chunks(df, chunk_rows):
+    for start in range(0, len(df), chunk_rows):
+        yield df.iloc[start:start + chunk_rows]
+
+
+def write_csv(df, fileobj, chunk_rows=CHUNK_ROWS):
+    """df를 CSV(엑셀에서 한글이 깨지지 않도록 UTF-8 BOM)로 fileobj에 조금씩 씁니다."""
+    fileobj.write(codecs.BOM_UTF8)
+    fileobj.write(df.head(0).to_csv(index=False).encode('utf-8'))
+    for chunk in _chunks(df, chunk_rows):
+        fileobj.write(chunk.to_csv(index=False, header=False).encode('utf-8'))
+
+
+def _cell(value):
+    """엑셀 셀에 쓸 값으로 바꿉니다. 결측값은 빈 칸, 정수인 실수는 정수입니다."""
+    if value is None or (not isinstance(value, str) and pd.isna(value)):
+        return None
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value if isinstance(value, (int, float, str)) else str(value)
+
+
+def write_xlsx(df, fileobj, summary_columns=(), chunk_rows=CHUNK_ROWS):
+    """df를 '데이터' 시트에, summary_columns의 값별 개수를 '요약' 시트에 담은 XLSX로 씁니다."""
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet(DATA_SHEET)
+    sheet.append([str(c) for c in df.columns])
+    for chunk in _chunks(df, chunk_rows):
+        for row in chunk.itertuples(index=False, name=None):
+            sheet.append([_cell(v) for v in row])
+
+    summary = workbook.create_sheet(SUMMARY_SHEET)
+    summary.append(["전체 행 수", len(df)])
+    for column in summary_columns:
+        summary.append([])
+        summary.append([f"[{column}] 값", "개수", "비율(%)"])
+        for row in value_counts_table(df, column).itertuples(index=False, name=None):
+            summary.append([_cell(v) for v in row])
+    workbook.save(fileobj)
+
+
+@timed('export_file')
+@profiled('export_file', snapshot=True)
+def export_file(df, file_type, summary_columns=()):
+    """df를 file_type('csv' 또는 'xlsx') 파일로 써서 그 바이트를 돌려줍니다."""
+    if file_type not in EXPORT_TYPES:
+        raise ValueError(f"지원하지 않는 파일 형식입니다: {file_type}")
+    with SpooledTemporaryFile(max_size=SPOOL_BYTES) as fileobj:
+        if file_type == 'csv':
+            write_csv(df, fileobj)
+        else:
+            write_xlsx(df, fileobj, summary_columns)
+        fileobj.seek(0)
+        return fileobj.read()
+
+
+def deferred_export(df, file_type, summary_columns=()):
+    """내려받기 버튼을 누를 때 파일을 만드는 함수를 돌려줍니다(st.download_button의 data로 넘깁니다)."""
+    return partial(export_file, df, file_type, tuple(summary_columns))
@@ -0,0 +1,123 @@
+"""결과 이미지를 내려받을 파일 형식으로 인코딩합니다.
+
+글자만 있는 결과 이미지는 색이 적어 팔레트 PNG가 가장 작고, 사진이 대부분인 이미지는
+WebP나 JPEG가 훨씬 작습니다. 'auto'는 사진이 있으면 WebP/JPEG를, 없으면 팔레트 PNG/PNG를 씁니다.
+byte_budget을 주면 그 형식들을 화질 순서로 인코딩해 보고 예산 안에 들어오는 것 중 화질이 가장 좋은 것을 고릅니다.
+"""
+from dataclasses import dataclass
+from functools import partial
+from io import BytesIO
+
+from helpers.metrics import timed
+
+EXPORT_FORMATS = {
+    'png': "PNG",
+    'auto': "자동 (사진이 있으면 WebP/JPEG, 없으면 팔레트 PNG)",
+    'png-palette': "PNG (팔레트, 글자만 있을 때 추천)",
+    'webp': "WebP",
+    'jpeg': "JPEG",
+    'pdf': "PDF (여러 페이지, 긴 글에 추천)",
+    'zip': "PNG 페이지 묶음 (ZIP)",
+}
+
+# 한 장 이미지가 아니라 페이지로 나눠 그리는 형식입니다(helpers.summary_render.render_pages).
+PAGED_FORMATS = ('pdf', 'zip')
+
+_MIME = {'PNG': 'image/png', 'WEBP': 'image/webp', 'JPEG': 'image/jpeg'}
+_EXTENSION = {'PNG': 'png', 'WEBP': 'webp', 'JPEG': 'jpg'}
+
+
+@dataclass
+class EncodedImage:
+    """인코딩한 이미지 바이트와 내려받기에 필요한 정보입니다. notice는 고른 형식과 다르게 만든 까닭입니다."""
+    data: bytes
+    mime: str
+    extension: str
+    notice: str = ''
+
+    def __len__(self):
+        return len(self.data)
+
+
+def _webp_supported():
+    from PIL import features
+    return features.check('webp')
+
+
+def _encode(img, fmt, **options):
+    """이미지를 한 형식으로 인코딩합니다. fmt는 Pillow 형식 이름('PNG', 'WEBP', 'JPEG')입니다."""
+    buf = BytesIO()
+    img.save(buf, format=fmt, **options)
+    return EncodedImage(buf.getvalue(), _MIME[fmt], _EXTENSION[fmt])
+
+
+def _encode_palette(img):
+    """256색 팔레트 PNG로 인코딩합니다. 글자 가장자리가 지저분해지지 않도록 디더링하지 않습니다."""
+    from PIL import Image
+
+    quantized = img.quantize(colors=256, method=Image.Quantize.MEDIANCUT, dither=Image.Dither.NONE)
+    return _encode(quantized, 'PNG', optimize=True)
+
+
+def _encoders(img):
+    """형식별 인코딩 함수를 돌려줍니다. 손실 압축은 화질이 좋은 순서의 목록입니다."""
+    webp_supported = _webp_supported()
+    # 글자가 번지지 않도록 색 샘플링을 줄이지 않습니다(subsampling=0).
+    jpeg = [partial(_encode, img, 'JPEG', quality=q, optimize=True, subsampling=0) for q in (90, 75, 60)]
+    webp = [partial(_encode, img, 'WEBP', quality=q, method=4) for q in (90, 75, 60)] if webp_supported else None
+    return {
+        'png': partial(_encode, img, 'PNG', optimize=True),
+        'palette': partial(_encode_palette, img),
+        'webp_lossless': partial(_encode, img, 'WEBP', lossless=True, method=4) if webp_supported else None,
+        'webp': webp,
+        'jpeg': jpeg,
+        # 화질 순서로 WebP와 JPEG를 번갈아 둡니다. WebP가 없으면 JPEG만 씁니다.
+        'lossy': [c for pair in zip(webp, jpeg) for c in pair] if webp else jpeg,
+    }
+
+
+def _candidates(img, export_format, has_photo):
+    """인코딩 함수 목록을 화질이 좋은 순서로 돌려줍니다.
+
+    'auto'는 사진이 있으면 손실 압축(WebP, JPEG)만 씁니다. 팔레트로 줄이면 사진 색이 뭉개지고,
+    무손실 압축은 사진 때문에 훨씬 커지기 때문입니다. 사진이 없으면 색이 적어 팔레트 PNG로 줄여도
+    눈에 보이는 차이가 없으므로 팔레트 PNG를 먼저 쓰고, 예산을 넘으면 PNG와 견줘 작은 쪽을 씁니다.
+    """
+    enc = _encoders(img)
+
+    if export_format == 'png':
+        return [enc['png']]
+    if export_format == 'png-palette':
+        return [enc['palette'], enc['png']]
+    if export_format == 'webp':
+        if enc['webp'] is None:
+            return enc['jpeg']
+        return enc['webp'] if has_photo else [enc['webp_lossless'], *enc['webp']]
+    if export_format == 'jpeg':
+        return enc['jpeg']
+    if has_photo:
+        return enc['lossy']
+    return [enc['palette'], enc['png']]
+
+
+@timed('encode_image')
+def encode_image(img, export_format='png', has_photo=False, byte_budget=None):
+    """PIL 이미지를 export_format으로 인코딩해 EncodedImage로 돌려줍니다.
+
+    byte_budget(바이트)이 있으면 후보 형식을 화질 순서로 시도해 처음으로 예산 안에 드는 것을,
+    모두 넘으면 가장 작은 것을 돌려줍니다. 없으면 첫 번째 후보만 인코딩합니다.
+    """
+    if export_format not in EXPORT_FORMATS or export_format in PAGED_FORMATS:
+        raise ValueError(f"지원하지 않는 이미지 형식입니다: {export_format}")
+    candidates = _candidates(img, export_format, has_photo)
+    if not byte_budget:
+        return candidates[0]()
+
+    smallest = None
+    for encode in candidates:
+        encoded = encode()
+        if len(encoded) <= byte_budget:
+            return encoded
+        if smallest is None or len(encoded) < len(smallest):
+            smallest = encoded
+    return smallest
@@ -0,0 +1,163 @@
+"""결과 이미지에 쓰는 한글 폰트 파일을 준비합니다.
+
+번들(assets/fonts) 또는 미리 준비된 폰트를 우선 사용하고, 없을 때만
+프로세스당 한 번 임시 폴더로 내려받습니다. 내려받은 파일은 임시 파일에 쓴 뒤
+원자적으로 이름을 바꾸므로, 동시에 읽는 세션이 반쯤 쓰인 파일을 보지 않습니다.
+폰트 파일은 프로세스당 한 번만 읽고, 크기별 FreeTypeFont 객체를 모든 세션이 함께 씁니다.
+"""
+import os
+import tempfile
+import threading
+import time
+
+from helpers.metrics import timed, timer
+
+FONT_FILENAME = "GowunDodum-Regular.ttf"
+FONT_URL = "https://github.com/google/fonts/raw/main/ofl/gowundodum/GowunDodum-Regular.ttf"
+FONT_ENV_VAR = "SUMMARY_FONT_PATH"
+
+BUNDLED_FONT_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "assets", "fonts")
+
+DOWNLOAD_TIMEOUT = (5, 30)  # (연결, 읽기) 초
+DOWNLOAD_RETRIES = 3
+MIN_FONT_BYTES = 10 * 1024
+_FONT_MAGIC = (b"\x00\x01\x00\x00", b"OTTO", b"true", b"ttcf")
+
+_lock = threading.Lock()
+_resolved_path = None
+
+_font_cache_lock = threading.Lock()
+_font_bytes = {}
+_font_cache = {}
+_font_cache_stats = {"hits": 0, "misses": 0}
+
+
+class FontUnavailableError(RuntimeError):
+    """폰트를 찾거나 내려받을 수 없을 때 발생합니다."""
+
+
+def _candidate_paths():
+    """폰트를 찾아볼 경로를 우선순위대로 돌려줍니다."""
+    env_path = os.environ.get(FONT_ENV_VAR)
+    if env_path:
+        yield env_path
+    yield os.path.join(BUNDLED_FONT_DIR, FONT_FILENAME)
+    # 예전 버전은 작업 폴더에 폰트를 저장했습니다.
+    yield os.path.abspath(FONT_FILENAME)
+    yield os.path.join(tempfile.gettempdir(), FONT_FILENAME)
+
+
+def is_valid_font(path):
+    """파일이 완전한 TrueType/OpenType 폰트인지 확인합니다."""
+    try:
+        if os.path.getsize(path) < MIN_FONT_BYTES:
+            return False
+        with open(path, "rb") as f:
+            if f.read(4) not in _FONT_MAGIC:
+                return False
+        from PIL import ImageFont
+        ImageFont.truetype(path, 12)
+    except (OSError, ValueError):
+        return False
+    return True
+
+
+def _download_dir():
+    """내려받은 폰트를 저장할 폴더입니다.
+
+    소스 폴더(assets/fonts)에 쓰면 몇 MB짜리 파일이 작업 트리에 남아 실수로 커밋되기 쉬우므로,
+    _candidate_paths()가 마지막에 찾아보는 임시 폴더에 씁니다.
+    """
+    return tempfile.gettempdir()
+
+
+@timed('font_download')
+def download_font(dest_dir):
+    """폰트를 내려받아 검증한 뒤 원자적으로 제자리에 옮깁니다."""
+    import requests
+
+    dest = os.path.join(dest_dir, FONT_FILENAME)
+    last_error = None
+    for attempt in range(DOWNLOAD_RETRIES):
+        fd, tmp_path = tempfile.mkstemp(prefix=".font-", suffix=".ttf", dir=dest_dir)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                with requests.get(FONT_URL, timeout=DOWNLOAD_TIMEOUT, stream=True) as r:
+                    r.raise_for_status()
+                    for chunk in r.iter_content(chunk_size=64 * 1024):
+                        f.write(chunk)
+            if not is_valid_font(tmp_path):
+                raise FontUnavailableError("내려받은 폰트 파일이 올바르지 않습니다.")
+            os.replace(tmp_path, dest)
+            return dest
+        except (requests.RequestException, OSError, FontUnavailableError) as e:
+            last_error = e
+            if attempt + 1 < DOWNLOAD_RETRIES:
+                time.sleep(0.5 * 2 ** attempt)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+    raise FontUnavailableError(f"폰트를 다운로드하는 데 실패했습니다: {last_error}")
+
+
+def get_font_path():
+    """사용할 폰트 파일 경로를 돌려줍니다. 필요하면 한 번만 내려받습니다."""
+    global _resolved_path
+    path = _resolved_path
+    if path is not None and os.path.exists(path):
+        return path
+
+    with _lock:
+        if _resolved_path is not None and os.path.exists(_resolved_path):
+            return _resolved_path
+        for candidate in _candidate_paths():
+            if is_valid_font(candidate):
+                _resolved_path = candidate
+                return candidate
+        _resolved_path = download_font(_download_dir())
+        return _resolved_path
+
+
+def get_font(size, path=None):
+    """(폰트, 크기)별로 캐시된 FreeTypeFont 객체를 돌려줍니다."""
+    if path is None:
+        path = get_font_path()
+    key = (path, size)
+    font = _font_cache.get(key)
+    if font is not None:
+        with _font_cache_lock:
+            _font_cache_stats["hits"] += 1
+        return font
+
+    from io import BytesIO
+    from PIL import ImageFont
+
+    with _font_cache_lock:
+        font = _font_cache.get(key)
+        if font is not None:
+            _font_cache_stats["hits"] += 1
+            return font
+        _font_cache_stats["misses"] += 1
+        with timer('font_load'):
+            data = _font_bytes.get(path)
+            if data is None:
+                with open(path, "rb") as f:
+                    data = f.read()
+                _font_bytes[path] = data
+            font = ImageFont.truetype(BytesIO(data), size)
+        _font_cache[key] = font
+        return font
+
+
+def font_cache_stats():
+    """폰트 캐시의 적중/실패 횟수와 캐시된 객체 수를 돌려줍니다."""
+    with _font_cache_lock:
+        return dict(_font_cache_stats, size=len(_font_cache))
+
+
+def clear_font_cache():
+    """캐시된 폰트 객체와 폰트 파일 내용을 비웁니다."""
+    with _font_cache_lock:
+        _font_cache.clear()
+        _font_bytes.clear()
+        _font_cache_stats.update(hits=0, misses=0)
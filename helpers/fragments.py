@@ -0,0 +1,17 @@
+"""페이지를 조각(st.fragment)으로 나눠 실행할 때 쓰는 도우미입니다.
+
+활동마다 조각으로 나누면 위젯을 바꿨을 때 그 활동만 다시 실행됩니다. 다른 활동이 쓰는 값을 바꾸는
+위젯은 콜백에서 st.rerun([조각 키, ...])로 그 값을 쓰는 조각도 함께 다시 실행합니다.
+"""
+from helpers.alloc_profile import profiled
+from helpers.metrics import timed
+
+
+def section(page, name):
+    """활동 구역(조각) 함수에 걸린 시간과 할당한 메모리를 page, section 라벨로 재는 데코레이터입니다.
+
+    @st.fragment 바로 아래에 붙입니다. 계측과 할당 추적이 모두 꺼져 있으면 함수를 그대로 돌려줍니다.
+    """
+    def decorator(fn):
+        return timed('section', page=page, section=name)(profiled('section', page=page, section=name)(fn))
+    return decorator
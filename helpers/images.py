@@ -0,0 +1,69 @@
+"""학생이 올린 이미지를 결과 이미지에 쓸 크기로 한 번만 준비합니다.
+
+휴대폰 사진(12MP JPEG 등)을 원본 해상도로 풀지 않도록 JPEG draft 모드로 필요한 만큼만
+디코딩하고, EXIF 회전 정보를 적용한 뒤 본문 너비에 맞춘 썸네일을 만듭니다.
+지나치게 큰 이미지(압축 폭탄)는 디코딩 전에 거절합니다.
+"""
+from io import BytesIO
+
+from helpers.alloc_profile import profiled
+
+# 5차시 결과 이미지의 본문 너비(800 - 2 * 40)입니다.
+PREPARED_WIDTH = 720
+MAX_UPLOAD_PIXELS = 50_000_000
+
+_EXIF_ORIENTATION = 0x0112
+
+
+class ImageRejectedError(ValueError):
+    """이미지를 읽을 수 없거나 너무 커서 받을 수 없을 때 발생합니다."""
+
+
+def load_for_width(data, max_width, max_pixels=MAX_UPLOAD_PIXELS):
+    """이미지 바이트를 max_width 이하 너비의 RGB PIL 이미지로 한 번에 디코딩합니다."""
+    return _load(data, max_width, max_pixels)[0]
+
+
+def _load(data, max_width, max_pixels):
+    """load_for_width와 같지만 원본 형식('JPEG', 'PNG' 등)도 함께 돌려줍니다."""
+    from PIL import Image, ImageOps
+
+    try:
+        img = Image.open(BytesIO(data))
+    except (Image.DecompressionBombError, OSError) as e:
+        raise ImageRejectedError(f"이미지를 읽을 수 없습니다: {e}") from e
+
+    with img:
+        source_format = img.format
+        width, height = img.size
+        if width * height > max_pixels:
+            raise ImageRejectedError(
+                f"이미지가 너무 큽니다 ({width}x{height}). {max_pixels // 1_000_000}MP 이하의 이미지를 올려주세요."
+            )
+        # 90도 회전된 사진은 보이는 너비가 원본 높이입니다.
+        rotated = img.getexif().get(_EXIF_ORIENTATION, 1) in (5, 6, 7, 8)
+        shown_width = height if rotated else width
+        scale = min(1.0, max_width / shown_width)
+        try:
+            # JPEG는 1/2, 1/4, 1/8 크기로 바로 디코딩합니다. 다른 형식에서는 아무 일도 하지 않습니다.
+            img.draft('RGB', (max(1, int(width * scale)), max(1, int(height * scale))))
+            img = ImageOps.exif_transpose(img)
+            img.thumbnail((max_width, max_pixels))
+            return img.convert('RGB'), source_format
+        except (OSError, ValueError) as e:
+            raise ImageRejectedError(f"이미지를 읽을 수 없습니다: {e}") from e
+
+
+@profiled('prepare_upload')
+def prepare_upload(data, max_width=PREPARED_WIDTH, max_pixels=MAX_UPLOAD_PIXELS):
+    """업로드 이미지를 미리보기와 결과 이미지에 함께 쓸 썸네일 바이트로 만듭니다.
+
+    사진(JPEG)은 JPEG로, 차트 캡처 같은 그 밖의 이미지는 글자가 뭉개지지 않도록 PNG로 저장합니다.
+    """
+    img, source_format = _load(data, max_width, max_pixels)
+    buf = BytesIO()
+    if source_format == 'JPEG':
+        img.save(buf, format='JPEG', quality=90)
+    else:
+        img.save(buf, format='PNG', optimize=True)
+    return buf.getvalue()
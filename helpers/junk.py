@@ -0,0 +1,91 @@
+"""분석에 쓸 수 없는 '돌멩이' 응답(ㅋㅋㅋ, 없음, ??? 등)을 한 열 전체에서 한 번에 찾습니다.
+
+검사는 모두 pandas 문자열 연산으로 열 전체에 한꺼번에 적용하며, 결과는 돌멩이 여부 마스크와
+이유 코드입니다. 이유가 여러 개면 REASONS에 적힌 순서로 앞의 것 하나만 남깁니다.
+"""
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+REASONS = {
+    'empty': "빈 응답",
+    'stop_word': "무의미 응답 목록에 있음",
+    'symbols_only': "기호·이모지만 있음",
+    'jamo_only': "자음·모음만 있음",
+    'repeated': "같은 글자 반복",
+    'too_short': "너무 짧음",
+}
+
+STOP_WORDS = ('없음', '없어요', '없다', '모름', '몰라', '몰라요', '모르겠음', '모르겠어요', '글쎄', '글쎄요',
+              '그냥', '아무거나', '무응답', '해당없음', 'x', 'n/a', 'na', 'none', '-')
+
+# 한글 음절과 숫자는 한 글자만으로도 뜻이 있는 경우가 많아(배, 밥, 3) 길이를 셀 때 2글자로 칩니다.
+MIN_LENGTH = 2
+
+_JAMO = r'[ㄱ-ㆎᄀ-ᇿ]+'
+_REPEATED = r'(.{1,2}?)\1{2,}'
+_WORD_CHARACTER = r'[^\W_]'
+_MEANINGFUL = r'[가-힣0-9]'
+
+
+def normalize_stop_words(stop_words):
+    """비교할 수 있도록 무의미 응답 목록의 공백을 없애고 소문자로 바꿉니다."""
+    return {''.join(word.split()).casefold() for word in stop_words if word and word.strip()}
+
+
+def detect_junk(values, stop_words=STOP_WORDS, min_length=MIN_LENGTH):
+    """값 목록(또는 Series)에서 돌멩이 응답을 찾아 (마스크, 이유 코드) Series 두 개를 돌려줍니다.
+
+    마스크는 돌멩이면 True, 이유 코드는 REASONS의 키(돌멩이가 아니면 빈 문자열)입니다.
+    values가 Series면 같은 인덱스를 씁니다.
+    """
+    index = values.index if isinstance(values, pd.Series) else None
+    if index is not None and isinstance(values.dtype, pd.CategoricalDtype):
+        # 범주형 열은 범주(와 빈 칸)만 검사하고 코드로 펼칩니다. 코드 -1(빈 칸)은 마지막 원소입니다.
+        _, category_reasons = detect_junk(list(values.cat.categories) + [''], stop_words, min_length)
+        reasons = pd.Series(category_reasons.to_numpy()[values.cat.codes.to_numpy()], index=index, dtype=object)
+        return reasons != '', reasons
+    text = ['' if pd.isna(v) else str(v) for v in values]
+    # 설문 응답은 같은 값이 많으므로 서로 다른 값에만 검사하고 결과를 펼칩니다.
+    # 파이썬 정규식 규칙(\W가 한글을 글자로 보는 등)을 쓰도록 object 형식으로 다룹니다.
+    codes, uniques = pd.factorize(pd.Series(text, dtype=object))
+    compact = pd.Series(uniques, dtype=object).str.replace(r'\s+', '', regex=True)
+    length = compact.str.len() + compact.str.count(_MEANINGFUL)
+
+    checks = [
+        ('empty', compact == ''),
+        ('stop_word', compact.str.casefold().isin(normalize_stop_words(stop_words))),
+        ('symbols_only', ~compact.str.contains(_WORD_CHARACTER)),
+        ('jamo_only', compact.str.fullmatch(_JAMO)),
+        ('repeated', compact.str.fullmatch(_REPEATED)),
+        ('too_short', length < min_length),
+    ]
+    conditions = [mask.fillna(False).astype(bool).to_numpy() for _, mask in checks]
+    unique_reasons = np.select(conditions, [code for code, _ in checks], default='').astype(object)
+    reasons = pd.Series(unique_reasons[codes] if len(codes) else [], index=index, dtype=object)
+    return reasons != '', reasons
+
+
+def junk_summary(reasons):
+    """이유 코드 Series로 이유별 개수 표('이유', '개수')를 만듭니다."""
+    counts = reasons[reasons != ''].value_counts()
+    return pd.DataFrame(
+        [(REASONS[code], int(counts[code])) for code in REASONS if code in counts],
+        columns=['이유', '개수'],
+    )
+
+
+@lru_cache(maxsize=16)
+def drop_junk_lines(text, stop_words=STOP_WORDS, min_length=MIN_LENGTH):
+    """여러 줄 텍스트에서 첫 칸(탭 앞)이 돌멩이인 줄과 빈 줄을 빼고, (남은 텍스트, 뺀 줄 수)를 돌려줍니다."""
+    lines = [line for line in text.splitlines() if line.strip()]
+    mask, _ = detect_junk([line.split('\t', 1)[0] for line in lines], stop_words, min_length)
+    kept = [line for line, junk in zip(lines, mask) if not junk]
+    return '\n'.join(kept), len(lines) - len(kept)
+
+
+def drop_junk(values, stop_words=STOP_WORDS, min_length=MIN_LENGTH):
+    """돌멩이 응답을 뺀 값 목록을 돌려줍니다."""
+    mask, _ = detect_junk(values, stop_words, min_length)
+    return [value for value, junk in zip(values, mask) if not junk]
@@ -0,0 +1,186 @@
+"""재실행, 활동 구역, 이미지 생성과 내보내기에 걸린 시간을 재는 계측 도구입니다.
+
+APP_METRICS=1로 서버를 시작할 때만 잽니다. 꺼져 있으면 timed()는 함수를 그대로 돌려주고
+timer()는 아무것도 하지 않는 컨텍스트를 돌려주므로, 계측 코드가 있어도 비용이 거의 없습니다.
+
+지표마다(이름과 라벨 조합) 호출 횟수, 전체 시간, Prometheus 형식의 누적 버킷, 최근 RECENT_SAMPLES개의
+측정값을 둡니다. 최근 측정값으로 관리자 화면에서 p50/p95를 보여 주고, 버킷은 prometheus_text()로
+내보냅니다. APP_METRICS_PORT를 정하면 start_metrics_server()가 127.0.0.1의 그 포트에서
+/metrics로 같은 내용을 돌려줍니다.
+"""
+import functools
+import os
+import threading
+import time
+from collections import deque
+from contextlib import nullcontext
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+METRICS_ENABLED = os.environ.get("APP_METRICS", "") not in ("", "0")
+METRICS_PORT = int(os.environ.get("APP_METRICS_PORT", "0"))
+METRIC_PREFIX = "app_"
+
+# 히스토그램 버킷의 위쪽 경계(초)입니다. 마지막 +Inf 버킷은 prometheus_text()가 붙입니다.
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+RECENT_SAMPLES = 1024
+
+_NULL_TIMER = nullcontext()
+
+
+class Histogram:
+    """한 지표(이름과 라벨 조합)의 측정값을 모읍니다."""
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.buckets = [0] * len(BUCKETS)
+        self.recent = deque(maxlen=RECENT_SAMPLES)
+
+    def observe(self, seconds):
+        self.count += 1
+        self.total += seconds
+        for i, bound in enumerate(BUCKETS):
+            if seconds <= bound:
+                self.buckets[i] += 1
+                break
+        self.recent.append(seconds)
+
+    def quantile(self, q):
+        """최근 측정값의 q 분위수(초)입니다. 측정값이 없으면 None입니다."""
+        if not self.recent:
+            return None
+        samples = sorted(self.recent)
+        return samples[min(len(samples) - 1, int(q * len(samples)))]
+
+
+class MetricsRegistry:
+    """프로세스 전체의 측정값을 (이름, 라벨)별 Histogram으로 모아 둡니다."""
+
+    def __init__(self):
+        self._histograms = {}
+        self._lock = threading.Lock()
+
+    def observe(self, name, seconds, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram()
+            histogram.observe(seconds)
+
+    def summary(self):
+        """지표마다 이름, 라벨, 횟수, 평균·p50·p95·최대(밀리초)를 담은 dict 목록을 돌려줍니다."""
+        with self._lock:
+            rows = []
+            for (name, labels), h in sorted(self._histograms.items()):
+                rows.append({
+                    'name': name,
+                    'labels': ', '.join(f"{k}={v}" for k, v in labels),
+                    'count': h.count,
+                    'mean_ms': h.total / h.count * 1000,
+                    'p50_ms': h.quantile(0.5) * 1000,
+                    'p95_ms': h.quantile(0.95) * 1000,
+                    'max_ms': max(h.recent) * 1000,
+                })
+            return rows
+
+    def prometheus_text(self):
+        """모든 지표를 Prometheus 텍스트 형식(히스토그램)으로 돌려줍니다."""
+        with self._lock:
+            by_name = {}
+            for (name, labels), h in sorted(self._histograms.items()):
+                by_name.setdefault(name, []).append((labels, h.count, h.total, list(h.buckets)))
+        lines = []
+        for name, series in by_name.items():
+            metric = f"{METRIC_PREFIX}{name}_seconds"
+            lines.append(f"# TYPE {metric} histogram")
+            for labels, count, total, buckets in series:
+                cumulative = 0
+                for bound, n in zip((*BUCKETS, "+Inf"), (*buckets, count - sum(buckets))):
+                    cumulative += n
+                    lines.append(f"{metric}_bucket{_labels(labels, le=bound)} {cumulative}")
+                lines.append(f"{metric}_sum{_labels(labels)} {total:.6f}")
+                lines.append(f"{metric}_count{_labels(labels)} {count}")
+        return "\n".join(lines) + "\n"
+
+    def clear(self):
+        with self._lock:
+            self._histograms.clear()
+
+
+def _labels(labels, **extra):
+    pairs = [*labels, *extra.items()]
+    if not pairs:
+        return ""
+    escaped = (str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, v in pairs)
+    return "{" + ",".join(f'{k}="{v}"' for (k, _), v in zip(pairs, escaped)) + "}"
+
+
+registry = MetricsRegistry()
+
+
+class _Timer:
+    def __init__(self, name, labels):
+        self.name = name
+        self.labels = labels
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        # st.rerun()과 st.stop()도 예외로 빠져나오므로, 예외가 나도 걸린 시간을 적습니다.
+        registry.observe(self.name, time.perf_counter() - self.start, **self.labels)
+        return False
+
+
+def timer(name, **labels):
+    """with 블록에 걸린 시간을 name 지표에 적는 컨텍스트를 돌려줍니다. 꺼져 있으면 아무것도 하지 않습니다."""
+    if not METRICS_ENABLED:
+        return _NULL_TIMER
+    return _Timer(name, labels)
+
+
+def timed(name, **labels):
+    """함수 한 번 호출에 걸린 시간을 name 지표에 적는 데코레이터입니다. 꺼져 있으면 함수를 그대로 돌려줍니다."""
+    def decorator(fn):
+        if not METRICS_ENABLED:
+            return fn
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with _Timer(name, labels):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = registry.prometheus_text().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+_server = None
+_server_lock = threading.Lock()
+
+
+def start_metrics_server(port=METRICS_PORT):
+    """계측이 켜져 있고 포트가 정해져 있으면 /metrics를 돌려주는 서버를 한 번만 띄웁니다."""
+    global _server
+    if not METRICS_ENABLED or not port or _server is not None:
+        return
+    with _server_lock:
+        if _server is None:
+            _server = ThreadingHTTPServer(("127.0.0.1", port), _MetricsHandler)
+            threading.Thread(target=_server.serve_forever, name="metrics-server", daemon=True).start()
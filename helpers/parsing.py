@@ -0,0 +1,148 @@
+"""'항목: 값' 형식으로 입력한 데이터를 파싱합니다.
+
+한 줄은 '항목', 구분자(콜론, 공백, 쉼표), '값' 순서입니다. 값은 float()가 읽는 숫자 모양(+5, 1e3, 1E-2, 5.)을
+모두 받고, 천 단위 쉼표(1,000)는 구분자로 보지 않습니다. 줄마다 파이썬으로 돌지 않고 미리 컴파일한 정규식으로 전체 텍스트를
+한 번에 훑은 뒤 숫자 변환은 pandas로 한꺼번에 하며, 같은 텍스트는 다시 파싱하지 않도록
+결과를 기억해 둡니다.
+"""
+import re
+from functools import lru_cache
+
+import pandas as pd
+
+from helpers.countif import NUMBER_PATTERN
+from helpers.metrics import timed
+
+COLUMNS = ['항목', '값']
+
+# 여러 줄 모드(re.M)로 전체 텍스트에 한 번에 적용합니다. 한 줄 전체가 맞아야 합니다.
+# 값은 천 단위 쉼표가 있는 숫자이거나, COUNTIF 조건과 같은 숫자 모양(helpers.countif.NUMBER_PATTERN)입니다.
+LINE_PATTERN = re.compile(
+    r'^[ \t]*(?P<item>[^\n]+?)[ \t:：,]+'
+    r'(?P<value>[-+]?\d{1,3}(?:,\d{3})+(?:\.\d*)?(?:[eE][-+]?\d+)?|' + NUMBER_PATTERN.pattern + r')[ \t\r]*$',
+    re.M,
+)
+
+
+@timed('parse')
+def _parse_text(raw_data):
+    """텍스트 전체에서 '항목: 값' 줄을 찾아 DataFrame으로 만듭니다."""
+    df = pd.DataFrame(LINE_PATTERN.findall(raw_data), columns=COLUMNS)
+    df['값'] = df['값'].str.replace(',', '', regex=False).astype(float)
+    return df
+
+
+@lru_cache(maxsize=64)
+def _parse_cached(raw_data):
+    return _parse_text(raw_data)
+
+
+def parse_items(raw_data):
+    """텍스트 데이터를 파싱하여 '항목', '값' 열의 DataFrame으로 반환합니다."""
+    if not raw_data:
+        return _parse_text('')
+    return _parse_cached(raw_data).copy()
+
+
+def parse_records(raw_data):
+    """텍스트 데이터를 파싱하여 {'항목': ..., '값': ...} 목록으로 반환합니다."""
+    return parse_items(raw_data).to_dict('records')
+
+
+# --- 편집할 때마다 바뀐 줄만 다시 파싱하기 ---
+
+# 상태를 세션에 저장할 때 쓰는 키 접두사입니다(위젯 키 앞에 붙입니다).
+STATE_PREFIX = '_parsed_'
+
+
+def _match_lines(lines, start):
+    """lines를 한 줄씩 파싱해 (항목, 값 문자열, 줄 번호) 목록을 돌려줍니다. 줄 번호는 start부터 셉니다."""
+    return [(m['item'], m['value'], start + i) for i, m in enumerate(map(LINE_PATTERN.match, lines)) if m]
+
+
+def _rows_frame(rows):
+    """_match_lines 결과를 줄 번호를 인덱스로 하는 DataFrame으로 만듭니다."""
+    df = pd.DataFrame(rows, columns=COLUMNS + ['줄']).set_index('줄')
+    df['값'] = df['값'].str.replace(',', '', regex=False).astype(float)
+    return df
+
+
+def _common_prefix(a, b, limit):
+    """두 문자열의 앞에서부터 같은 글자 수(limit 이하)를 돌려줍니다. 구간을 절반씩 비교합니다."""
+    lo, hi = 0, limit
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if a[lo:mid] == b[lo:mid]:
+            lo = mid
+        else:
+            hi = mid - 1
+    return lo
+
+
+def _common_suffix(a, b, limit):
+    """두 문자열의 뒤에서부터 같은 글자 수(limit 이하)를 돌려줍니다."""
+    lo, hi = 0, limit
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if a[len(a) - mid:len(a) - lo] == b[len(b) - mid:len(b) - lo]:
+            lo = mid
+        else:
+            hi = mid - 1
+    return lo
+
+
+class IncrementalParser:
+    """한 입력란의 이전 텍스트와 파싱 결과를 기억해 바뀐 줄만 다시 파싱합니다.
+
+    이전 텍스트와 새 텍스트의 같은 앞부분과 뒷부분을 글자 단위로 찾아, 그 사이에 걸친 줄만
+    나눠 파싱합니다. 결과 DataFrame의 인덱스는 줄 번호이므로 바뀐 구간 앞쪽은 그대로 두고,
+    뒤쪽은 줄 수 차이만큼 인덱스를 옮긴 뒤 새로 파싱한 줄을 끼워 넣습니다.
+    """
+
+    def __init__(self):
+        self.text = ''
+        self.frame = _rows_frame([])
+        self.reparsed_lines = 0
+
+    def parse(self, text):
+        """text를 파싱한 DataFrame('항목', '값')을 돌려줍니다. 돌려준 DataFrame은 고쳐도 됩니다."""
+        text = text or ''
+        if text != self.text:
+            self._update(text)
+        return self.frame.reset_index(drop=True)
+
+    def _update(self, text):
+        old = self.text
+        limit = min(len(old), len(text))
+        prefix = _common_prefix(old, text, limit)
+        suffix = _common_suffix(old, text, limit - prefix)
+        # 바뀐 글자가 걸친 줄 전체로 넓힙니다: 앞은 줄의 시작, 뒤는 줄의 끝까지.
+        begin = old.rfind('\n', 0, prefix) + 1
+        old_end = old.find('\n', len(old) - suffix)
+        old_end = len(old) if old_end < 0 else old_end
+        new_end = old_end - len(old) + len(text)
+
+        first = old.count('\n', 0, begin)
+        old_count = old.count('\n', begin, old_end) + 1
+        lines = text[begin:new_end].split('\n')
+
+        index = self.frame.index
+        head = self.frame.iloc[:index.searchsorted(first)]
+        tail = self.frame.iloc[index.searchsorted(first + old_count):]
+        if len(lines) != old_count:
+            tail = tail.set_axis(tail.index + (len(lines) - old_count))
+        middle = _rows_frame(_match_lines(lines, first))
+        parts = [part for part in (head, middle, tail) if not part.empty]
+        self.frame = pd.concat(parts) if parts else middle
+
+        self.text = text
+        self.reparsed_lines = len(lines)
+
+
+@timed('parse_widget')
+def parse_widget(state, key):
+    """위젯 key의 텍스트를 파싱합니다. 파서 상태는 state(st.session_state)에 위젯별로 둡니다."""
+    parser = state.get(STATE_PREFIX + key)
+    if parser is None:
+        parser = state[STATE_PREFIX + key] = IncrementalParser()
+    return parser.parse(state.get(key, ''))
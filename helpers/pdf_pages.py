@@ -0,0 +1,115 @@
+"""페이지 이미지를 한 장씩 받아 여러 페이지 PDF로 씁니다.
+
+Pillow의 PDF 저장은 RGB 페이지를 JPEG로 넣어 글자 가장자리가 번지고, 팔레트 이미지는 압축하지 않은
+16진수로 넣으며, 이어 붙일 때(append=True)마다 지금까지 쓴 파일 전체를 다시 읽습니다. 여기서는 페이지를
+PNG로 인코딩한 뒤 그 압축 데이터(IDAT)를 그대로 FlateDecode 이미지로 넣습니다. 글자가 번지지 않고 크기는
+PNG와 비슷하며, 페이지를 받는 대로 바로 써서 메모리에는 페이지 한 장만 둡니다.
+"""
+import struct
+from io import BytesIO
+
+# 화면 해상도로 그린 이미지이므로 96dpi로 놓습니다(너비 800픽셀 → 600pt).
+RESOLUTION = 96
+
+_PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+_PALETTE, _RGB, _GRAY = 3, 2, 0
+
+
+def _png_parts(img, palette):
+    """이미지를 PNG로 인코딩해 (IHDR 값, 팔레트 바이트, IDAT 데이터)를 돌려줍니다.
+
+    palette=True이면 256색 팔레트로 줄여 인코딩합니다. 글자 페이지는 원래 색이 256가지 안팎이라 빠른 옥트리
+    양자화로도 거의 그대로이고, 디더링하지 않아 글자 가장자리가 지저분해지지 않습니다. 페이지마다 쓰므로
+    optimize 없이 기본 압축으로 인코딩합니다(optimize는 몇 % 줄이려고 몇 배 느립니다).
+    """
+    from PIL import Image
+
+    if palette:
+        img = img.quantize(colors=256, method=Image.Quantize.FASTOCTREE, dither=Image.Dither.NONE)
+    elif img.mode != 'RGB':
+        img = img.convert('RGB')
+    buf = BytesIO()
+    img.save(buf, format='PNG')
+    data = buf.getvalue()
+
+    header, plte, idat = None, b'', []
+    pos = len(_PNG_SIGNATURE)
+    while pos < len(data):
+        length, kind = struct.unpack('>I4s', data[pos:pos + 8])
+        chunk = data[pos + 8:pos + 8 + length]
+        if kind == b'IHDR':
+            header = struct.unpack('>IIBBBBB', chunk)
+        elif kind == b'PLTE':
+            plte = chunk
+        elif kind == b'IDAT':
+            idat.append(chunk)
+        pos += 12 + length
+    return header, plte, b''.join(idat)
+
+
+class PdfPageWriter:
+    """add_page()로 받은 이미지를 한 페이지씩 fileobj에 쓰고, close()에서 페이지 목록과 상호 참조표를 씁니다."""
+
+    _CATALOG, _PAGES = 1, 2
+
+    def __init__(self, fileobj, resolution=RESOLUTION):
+        self.fileobj = fileobj
+        self.scale = 72 / resolution
+        self._offsets = {}
+        self._page_ids = []
+        self._next_id = self._PAGES + 1
+        fileobj.write(b'%PDF-1.4\n%\xe2\xe3\xcf\xd3\n')
+
+    def _reserve(self):
+        obj_id = self._next_id
+        self._next_id += 1
+        return obj_id
+
+    def _write(self, obj_id, body, stream=None):
+        self._offsets[obj_id] = self.fileobj.tell()
+        self.fileobj.write(b'%d 0 obj\n' % obj_id)
+        if stream is None:
+            self.fileobj.write(body + b'\nendobj\n')
+        else:
+            self.fileobj.write(body[:-2] + b' /Length %d >>\nstream\n' % len(stream))
+            self.fileobj.write(stream + b'\nendstream\nendobj\n')
+
+    def add_page(self, img, palette=True):
+        """이미지 한 장을 페이지로 씁니다. 사진이 있는 페이지는 palette=False로 색을 줄이지 않습니다."""
+        (width, height, bits, color_type, _, _, interlace), plte, idat = _png_parts(img, palette)
+        if interlace:
+            raise ValueError("인터레이스 PNG는 PDF 이미지로 넣을 수 없습니다.")
+        if color_type == _PALETTE:
+            colors = 1
+            color_space = b'[/Indexed /DeviceRGB %d <%s>]' % (len(plte) // 3 - 1, plte.hex().encode())
+        elif color_type == _RGB:
+            colors, color_space = 3, b'/DeviceRGB'
+        elif color_type == _GRAY:
+            colors, color_space = 1, b'/DeviceGray'
+        else:
+            raise ValueError(f"PDF 이미지로 넣을 수 없는 PNG 색 형식입니다: {color_type}")
+
+        image_id, contents_id, page_id = self._reserve(), self._reserve(), self._reserve()
+        self._write(image_id, b'<< /Type /XObject /Subtype /Image /Width %d /Height %d /ColorSpace %s '
+                              b'/BitsPerComponent %d /Filter /FlateDecode '
+                              b'/DecodeParms << /Predictor 15 /Colors %d /BitsPerComponent %d /Columns %d >> >>'
+                    % (width, height, color_space, bits, colors, bits, width), idat)
+        page_width, page_height = width * self.scale, height * self.scale
+        self._write(contents_id, b'<< >>', b'q %.2f 0 0 %.2f 0 0 cm /Im0 Do Q' % (page_width, page_height))
+        self._write(page_id, b'<< /Type /Page /Parent %d 0 R /MediaBox [0 0 %.2f %.2f] '
+                             b'/Resources << /XObject << /Im0 %d 0 R >> >> /Contents %d 0 R >>'
+                    % (self._PAGES, page_width, page_height, image_id, contents_id))
+        self._page_ids.append(page_id)
+
+    def close(self):
+        """페이지 목록, 카탈로그, 상호 참조표를 써서 PDF를 마칩니다."""
+        kids = b' '.join(b'%d 0 R' % page_id for page_id in self._page_ids)
+        self._write(self._PAGES, b'<< /Type /Pages /Kids [%s] /Count %d >>' % (kids, len(self._page_ids)))
+        self._write(self._CATALOG, b'<< /Type /Catalog /Pages %d 0 R >>' % self._PAGES)
+        xref = self.fileobj.tell()
+        size = self._next_id
+        self.fileobj.write(b'xref\n0 %d\n0000000000 65535 f \n' % size)
+        for obj_id in range(1, size):
+            self.fileobj.write(b'%010d 00000 n \n' % self._offsets[obj_id])
+        self.fileobj.write(b'trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n'
+                           % (size, self._CATALOG, xref))
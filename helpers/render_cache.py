@@ -0,0 +1,126 @@
+"""렌더링한 결과 이미지를 제출 내용의 해시로 저장해 두는 캐시입니다.
+
+학생이 내용을 바꾸지 않고 생성 버튼을 여러 번 눌러도 다시 그리지 않도록,
+이미지가 의존하는 입력(글, 체크 상태, 코스 데이터와 차트 종류, 업로드 이미지)을
+정규화해 해시한 값을 키로 씁니다. 제출 시각은 키에서 빼므로, 같은 내용이면
+처음 만든 이미지(처음 제출 시각이 적힌)를 그대로 돌려줍니다.
+
+캐시에는 이름표(ArtifactHandle)만 두고, 이미지 바이트는 helpers.artifacts 저장소에만 둡니다.
+그래서 이미지 바이트의 메모리 한도는 저장소의 ARTIFACT_MEMORY_BYTES 하나뿐입니다.
+저장소에서 지워진 이미지는 캐시에서도 없는 것으로 봅니다.
+"""
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+
+from helpers.artifacts import get_artifact_store, store_image
+from helpers.summary_templates import render_submission
+
+MAX_CACHE_ENTRIES = 256
+
+# 이미지 내용에 영향을 주지 않는 키입니다.
+_IGNORED_KEYS = ('submitted_at',)
+
+
+def _normalize(key, value):
+    """해시에 넣을 수 있도록 값을 정규화합니다."""
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return {'sha256': hashlib.sha256(value).hexdigest()}
+    if isinstance(value, str):
+        if key.endswith('_data'):
+            # 데이터 입력은 줄 앞뒤 공백과 빈 줄이 결과에 영향을 주지 않습니다.
+            return '\n'.join(line.strip() for line in value.splitlines() if line.strip())
+        return value.strip()
+    return value
+
+
+def submission_key(lesson, submission, export_format='png', byte_budget=None):
+    """차시, 제출 내용, 내보내기 설정으로 캐시 키(16진수 해시)를 만듭니다."""
+    normalized = {k: _normalize(k, v) for k, v in submission.items() if k not in _IGNORED_KEYS and v is not None}
+    payload = json.dumps([lesson, normalized, export_format, byte_budget], sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class RenderCache:
+    """항목 수가 제한된 LRU 캐시입니다. 값은 저장소 이름표(ArtifactHandle)입니다."""
+
+    def __init__(self, max_entries=MAX_CACHE_ENTRIES, store=None):
+        self.max_entries = max_entries
+        self._store = store
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _artifacts(self):
+        return self._store if self._store is not None else get_artifact_store()
+
+    def get(self, key):
+        """키에 해당하는 이미지의 이름표를 돌려줍니다. 없거나 저장소에서 지워졌으면 None입니다."""
+        with self._lock:
+            handle = self._entries.get(key)
+            if handle is not None and handle not in self._artifacts():
+                del self._entries[key]
+                handle = None
+            if handle is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return handle
+
+    def put(self, key, handle):
+        """이름표를 저장하고, 한도를 넘으면 오래 안 쓴 것부터 버립니다."""
+        with self._lock:
+            self._entries[key] = handle
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def stats(self):
+        """적중/실패 횟수, 적중률, 항목 수를 돌려줍니다. 이미지 바이트는 저장소 통계에 있습니다."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'entries': len(self._entries),
+            }
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_render_cache():
+    """프로세스 전체가 함께 쓰는 결과 이미지 캐시를 돌려줍니다."""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = RenderCache()
+    return _cache
+
+
+def render_submission_cached(lesson, submission, export_format='png', byte_budget=None):
+    """캐시를 거쳐 결과 이미지를 만들고 저장소 이름표를 돌려줍니다. 새로 그린 이미지는 캐시에 넣습니다."""
+    cache = get_render_cache()
+    key = submission_key(lesson, submission, export_format, byte_budget)
+    handle = cache.get(key)
+    if handle is None:
+        handle = store_image(render_submission(lesson, submission, export_format, byte_budget))
+        cache.put(key, handle)
+    return handle
+
+
+def render_and_cache(key, lesson, submission, export_format='png', byte_budget=None):
+    """캐시를 확인하지 않고 결과 이미지를 그려 저장소에 넣고, 이름표를 key로 캐시에 넣어 돌려줍니다.
+
+    호출 쪽이 이미 캐시를 확인한 경우에 씁니다. 대기열 작업 결과도 이 이름표이므로
+    찾아가지 않은 결과가 이미지 바이트를 따로 붙잡고 있지 않습니다.
+    """
+    handle = store_image(render_submission(lesson, submission, export_format, byte_budget))
+    get_render_cache().put(key, handle)
+    return handle
@@ -0,0 +1,116 @@
+"""결과 이미지 생성을 백그라운드 작업자에게 맡기는 대기열입니다.
+
+이미지 생성은 글자 래스터화와 PNG 인코딩으로 CPU를 오래 쓰므로, Streamlit 스크립트
+실행 중에 바로 하지 않고 동시 실행 수가 제한된 작업자 풀에 넣습니다. 대기열이 가득 차면
+QueueFullError로 거절해(backpressure) 한 반 전체가 동시에 눌러도 다른 화면 갱신이 멈추지 않습니다.
+페이지는 작업 번호만 세션 상태에 두고, POLL_INTERVAL마다 status()로 결과를 확인합니다.
+결과 이미지 작업(helpers.render_cache.render_and_cache)의 결과는 저장소 이름표이므로, 찾아가지 않은
+결과가 RESULT_TTL 동안 남아 있어도 이미지 바이트를 따로 붙잡지 않습니다.
+"""
+import itertools
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+MAX_WORKERS = int(os.environ.get("SUMMARY_RENDER_WORKERS", "2"))
+MAX_PENDING = int(os.environ.get("SUMMARY_RENDER_QUEUE", "32"))
+# 찾아가지 않은 결과(탭을 닫은 경우 등)는 이 시간이 지나면 버립니다.
+RESULT_TTL = 10 * 60
+# 페이지가 작업이 끝났는지 확인하는 간격(초)입니다. 작업이 진행 중일 때만 확인 조각(st.fragment)이 이 간격으로 다시 실행됩니다.
+POLL_INTERVAL = 0.5
+
+QUEUED, RUNNING, DONE, FAILED = 'queued', 'running', 'done', 'failed'
+
+
+class QueueFullError(RuntimeError):
+    """대기열이 가득 차 새 작업을 받을 수 없을 때 발생합니다."""
+
+
+class RenderQueue:
+    """동시 실행 수와 대기 작업 수가 제한된 작업 대기열입니다."""
+
+    def __init__(self, max_workers=MAX_WORKERS, max_pending=MAX_PENDING):
+        self.max_pending = max_pending
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="summary-render")
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._jobs = OrderedDict()  # 작업 번호 -> 상태 dict (제출 순서 유지)
+
+    def _expire(self, now):
+        """오래된 완료 작업을 버립니다. _lock을 잡은 상태에서 부릅니다."""
+        for job_id in [j for j, job in self._jobs.items()
+                       if job['state'] in (DONE, FAILED) and now - job['finished'] > RESULT_TTL]:
+            del self._jobs[job_id]
+
+    def _pending(self):
+        return sum(1 for job in self._jobs.values() if job['state'] in (QUEUED, RUNNING))
+
+    def submit(self, fn, *args, **kwargs):
+        """작업을 대기열에 넣고 작업 번호를 돌려줍니다."""
+        with self._lock:
+            self._expire(time.monotonic())
+            if self._pending() >= self.max_pending:
+                raise QueueFullError("이미지 생성 요청이 너무 많습니다. 잠시 후 다시 시도해주세요.")
+            job_id = next(self._ids)
+            self._jobs[job_id] = {'state': QUEUED, 'result': None, 'error': None, 'finished': None}
+        self._executor.submit(self._run, job_id, fn, args, kwargs)
+        return job_id
+
+    def _run(self, job_id, fn, args, kwargs):
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return  # 시작 전에 취소됨
+            job['state'] = RUNNING
+        try:
+            result, error, state = fn(*args, **kwargs), None, DONE
+        except Exception as e:
+            result, error, state = None, e, FAILED
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is not None:
+                job.update(state=state, result=result, error=error, finished=time.monotonic())
+
+    def status(self, job_id):
+        """작업 상태를 돌려줍니다. 대기 중이면 앞에 남은 작업 수(position)도 담습니다.
+
+        모르는 작업 번호면 None을 돌려줍니다.
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+            status = dict(job)
+            if job['state'] == QUEUED:
+                status['position'] = sum(1 for j, other in self._jobs.items()
+                                         if j < job_id and other['state'] == QUEUED)
+            return status
+
+    def discard(self, job_id):
+        """작업을 잊습니다. 아직 시작하지 않았다면 실행하지 않습니다."""
+        with self._lock:
+            self._jobs.pop(job_id, None)
+
+    def stats(self):
+        """상태별 작업 수를 돌려줍니다."""
+        with self._lock:
+            counts = {QUEUED: 0, RUNNING: 0, DONE: 0, FAILED: 0}
+            for job in self._jobs.values():
+                counts[job['state']] += 1
+            return counts
+
+
+_queue = None
+_queue_lock = threading.Lock()
+
+
+def get_render_queue():
+    """프로세스 전체가 함께 쓰는 이미지 생성 대기열을 돌려줍니다."""
+    global _queue
+    if _queue is None:
+        with _queue_lock:
+            if _queue is None:
+                _queue = RenderQueue()
+    return _queue
@@ -0,0 +1,298 @@
+"""제출 내용을 요약 이미지로 배치(layout)하고 그립니다.
+
+차시별 템플릿(helpers.summary_templates)이 만든 블록 목록을 받아, 모든 줄과 요소의
+위치를 한 번만 재서 배치 계획(LayoutPlan)을 만들고, 그리기는 그 계획만 따라갑니다.
+Streamlit에 의존하지 않으므로 일괄 처리나 벤치마크에서도 그대로 쓸 수 있습니다.
+"""
+from dataclasses import dataclass, field
+from io import BytesIO
+
+from helpers.alloc_profile import profiled
+from helpers.export_formats import PAGED_FORMATS, EncodedImage, encode_image
+from helpers.fonts import get_font
+from helpers.images import ImageRejectedError, load_for_width
+from helpers.metrics import timed
+from helpers.pdf_pages import PdfPageWriter
+from helpers.text_wrap import wrap_text
+
+PIE_COLORS = ["#4e79a7", "#f28e2b", "#e15759", "#76b7b2", "#59a14f", "#edc948", "#bab0ac", "#d37295"]
+
+# 줄 높이를 잴 때 쓰는 기준 글자입니다. 한글과 영문 위아래 획을 모두 포함합니다.
+_LINE_HEIGHT_SAMPLE = "가나다Agjy"
+
+
+# --- 블록 ---
+
+@dataclass
+class TextBlock:
+    """주어진 글자 크기로 줄바꿈해 그리는 문단입니다."""
+    text: str
+    size: int = 20
+
+
+@dataclass
+class ImageBlock:
+    """본문 너비에 맞춰 그리는 업로드 이미지입니다. data는 이미지 파일 바이트입니다."""
+    data: bytes
+
+
+@dataclass
+class ChartRowBlock:
+    """한 줄에 나란히 그리는 간단한 차트들입니다. charts는 (데이터, 차트 종류, 제목) 목록입니다."""
+    charts: list
+    height: int = 250
+    gap: int = 15
+
+
+@dataclass
+class SummaryStyle:
+    """요약 이미지의 크기와 색상입니다."""
+    width: int = 800
+    padding: int = 40
+    line_spacing: int = 15
+    background: str = '#FFF8F0'
+    text_color: str = '#333333'
+
+
+# --- 배치 계획 ---
+
+@dataclass
+class LayoutPlan:
+    """그릴 요소와 위치를 모두 담은 배치 계획입니다."""
+    width: int
+    height: int
+    style: SummaryStyle
+    items: list = field(default_factory=list)
+
+
+_line_heights = {}
+
+# 나눠 그릴 때의 페이지 높이(너비 800 기준 A4 비율)와, 한 장으로 그릴 수 있는 최대 높이입니다.
+PAGE_HEIGHT = 1131
+MAX_CANVAS_HEIGHT = 16000
+LONG_CONTENT_NOTICE = "내용이 길어 한 장 이미지로 만들 수 없어서, 고른 형식 대신 여러 페이지 PDF로 만들었습니다."
+
+
+def line_height(font):
+    """폰트의 한 줄 높이를 돌려줍니다. 폰트마다 한 번만 잽니다."""
+    height = _line_heights.get(font)
+    if height is None:
+        bbox = font.getbbox(_LINE_HEIGHT_SAMPLE)
+        height = bbox[3] - bbox[1]
+        _line_heights[font] = height
+    return height
+
+
+def _load_image(data, width):
+    """업로드 이미지를 width 너비로 한 번만 디코딩합니다. 읽을 수 없으면 None입니다."""
+    try:
+        img = load_for_width(data, width)
+    except ImageRejectedError:
+        return None # 손상된 이미지 파일은 건너뜀
+    if img.width != width:
+        img = img.resize((width, int(width * img.height / img.width)))
+    return img
+
+
+def layout_summary(blocks, style=None):
+    """블록 목록을 배치 계획으로 바꿉니다. 각 줄과 요소는 여기서 한 번만 잽니다."""
+    style = style or SummaryStyle()
+    padding = style.padding
+    content_width = style.width - 2 * padding
+    items = []
+
+    y = padding
+    for block in blocks:
+        if isinstance(block, TextBlock):
+            font = get_font(block.size)
+            step = line_height(font) + style.line_spacing
+            for line in wrap_text(block.text, font, content_width):
+                items.append(('text', (padding, y), line, font))
+                y += step
+        elif isinstance(block, ImageBlock):
+            user_img = _load_image(block.data, content_width) if block.data else None
+            if user_img is not None:
+                y += padding
+                items.append(('image', (padding, y), user_img))
+                y += user_img.height + padding
+        elif isinstance(block, ChartRowBlock):
+            y += padding
+            n = max(len(block.charts), 1)
+            chart_width = (content_width - block.gap * (n - 1)) // n
+            for i, (data, chart_type, title) in enumerate(block.charts):
+                box = (padding + i * (chart_width + block.gap), y, chart_width, block.height)
+                items.append(('chart', box, data, chart_type, title))
+            y += block.height + padding
+        else:
+            raise TypeError(f"알 수 없는 블록입니다: {block!r}")
+
+    return LayoutPlan(width=style.width, height=y + padding, style=style, items=items)
+
+
+def _item_box(item):
+    """배치 요소의 (위쪽 y, 높이)를 돌려줍니다."""
+    kind = item[0]
+    if kind == 'text':
+        return item[1][1], line_height(item[3])
+    if kind == 'image':
+        return item[1][1], item[2].height
+    return item[1][1], item[1][3]
+
+
+def _moved(item, dy, image=None):
+    """배치 요소를 위로 dy만큼 옮긴 사본을 돌려줍니다."""
+    kind = item[0]
+    if kind == 'chart':
+        x, y, w, h = item[1]
+        return (kind, (x, y - dy, w, h), *item[2:])
+    x, y = item[1]
+    if kind == 'image' and image is not None:
+        return (kind, (x, y - dy), image)
+    return (kind, (x, y - dy), *item[2:])
+
+
+def paginate(plan, page_height=None):
+    """배치 계획을 같은 높이의 페이지 배치 계획들로 나눠 하나씩 내놓습니다.
+
+    요소는 페이지 경계에서 잘리지 않고 다음 페이지로 넘어갑니다. 한 페이지보다 긴 업로드
+    이미지는 페이지에 맞게 줄입니다.
+    """
+    style = plan.style
+    page_height = page_height or PAGE_HEIGHT
+    usable = page_height - 2 * style.padding
+    offset = 0
+    page_items = []
+    for item in plan.items:
+        top, height = _item_box(item)
+        image = None
+        if item[0] == 'image' and height > usable:
+            image = item[2].resize((max(1, item[2].width * usable // height), usable))
+            height = usable
+        if page_items and top + height - offset > page_height - style.padding:
+            yield LayoutPlan(width=plan.width, height=page_height, style=style, items=page_items)
+            offset, page_items = top - style.padding, []
+        page_items.append(_moved(item, offset, image))
+    yield LayoutPlan(width=plan.width, height=page_height, style=style, items=page_items)
+
+
+# --- 그리기 ---
+
+@timed('draw_chart')
+def draw_chart_on_image(draw, data, chart_type, title, x_pos, y_pos, width, height, font_m, font_s):
+    """Pillow을 사용하여 이미지 위에 간단한 차트를 그립니다."""
+    draw.rectangle([x_pos, y_pos, x_pos + width, y_pos + height], fill="#FFFFFF", outline="#DDDDDD", width=1)
+
+    # 차트 제목
+    title_bbox = font_m.getbbox(title)
+    draw.text((x_pos + (width - title_bbox[2]) / 2, y_pos + 15), title, font=font_m, fill="#333333")
+
+    chart_area_y = y_pos + 50
+    chart_area_height = height - 60
+
+    if not data:
+        draw.text((x_pos + 20, chart_area_y + 20), "데이터 없음", font=font_s, fill="#AAAAAA")
+        return
+
+    total_value = sum(item['값'] for item in data)
+
+    if chart_type == "원 차트 (비율)":
+        if total_value == 0: return
+        center_x, center_y = x_pos + width / 2, chart_area_y + chart_area_height / 2
+        radius = min(width, chart_area_height) * 0.35
+        bbox = [center_x - radius, center_y - radius, center_x + radius, center_y + radius]
+
+        start_angle = -90
+        for i, item in enumerate(data):
+            angle = (item['값'] / total_value) * 360
+            draw.pieslice(bbox, start=start_angle, end=start_angle + angle, fill=PIE_COLORS[i % len(PIE_COLORS)])
+            start_angle += angle
+
+    elif chart_type == "막대 차트 (비교)":
+        num_bars = len(data)
+        if num_bars == 0: return
+        bar_width = (width - 40) / (num_bars * 1.5)
+        max_val = max(item['값'] for item in data)
+        if max_val == 0: return
+
+        for i, item in enumerate(data):
+            bar_height = (item['값'] / max_val) * (chart_area_height - 20)
+            bar_x = x_pos + 30 + i * (bar_width * 1.5)
+            bar_y = chart_area_y + chart_area_height - bar_height
+            draw.rectangle([bar_x, bar_y, bar_x + bar_width, chart_area_y + chart_area_height], fill="#4e79a7")
+            label = item['항목']
+            label_bbox = font_s.getbbox(label)
+            draw.text((bar_x + bar_width/2 - label_bbox[2]/2, chart_area_y + chart_area_height + 5), label, font=font_s, fill="#333")
+
+
+def has_photo(plan):
+    """배치 계획에 업로드 이미지(사진)가 있으면 True입니다."""
+    return any(item[0] == 'image' for item in plan.items)
+
+
+def draw_layout(plan):
+    """배치 계획대로 이미지를 그려 PIL 이미지로 돌려줍니다."""
+    from PIL import Image, ImageDraw
+
+    style = plan.style
+    img = Image.new('RGB', (plan.width, plan.height), style.background)
+    draw = ImageDraw.Draw(img)
+    chart_fonts = None
+
+    for kind, *args in plan.items:
+        if kind == 'text':
+            pos, text, font = args
+            draw.text(pos, text, font=font, fill=style.text_color)
+        elif kind == 'image':
+            pos, user_img = args
+            img.paste(user_img, pos)
+        elif kind == 'chart':
+            (x, y, w, h), data, chart_type, title = args
+            if chart_fonts is None:
+                chart_fonts = (get_font(20), get_font(16))
+            draw_chart_on_image(draw, data, chart_type, title, x, y, w, h, *chart_fonts)
+    return img
+
+
+def render_pages(plan, output='pdf', page_height=None):
+    """배치 계획을 페이지별로 하나씩 그려 여러 페이지 PDF나 PNG 페이지 ZIP으로 돌려줍니다.
+
+    한 번에 한 페이지만 그리고 바로 인코딩하므로, 내용이 아무리 길어도 메모리에는
+    페이지 한 장 크기의 캔버스만 올라갑니다. PDF 페이지는 JPEG가 아니라 PNG와 같은 무손실 압축으로 넣고,
+    사진이 없는 페이지는 팔레트로 줄입니다(helpers.pdf_pages).
+    """
+    import zipfile
+
+    buf = BytesIO()
+    if output == 'pdf':
+        writer = PdfPageWriter(buf)
+        for page in paginate(plan, page_height):
+            writer.add_page(draw_layout(page), palette=not has_photo(page))
+        writer.close()
+        return EncodedImage(buf.getvalue(), 'application/pdf', 'pdf')
+    if output == 'zip':
+        with zipfile.ZipFile(buf, 'w', compression=zipfile.ZIP_STORED) as zf:
+            for i, page in enumerate(paginate(plan, page_height), start=1):
+                encoded = encode_image(draw_layout(page), 'png-palette')
+                zf.writestr(f"page_{i:03d}.png", encoded.data)
+        return EncodedImage(buf.getvalue(), 'application/zip', 'zip')
+    raise ValueError(f"지원하지 않는 페이지 출력 형식입니다: {output}")
+
+
+@timed('render_summary')
+@profiled('render_summary', snapshot=True)
+def render_summary(blocks, style=None, export_format='png', byte_budget=None):
+    """블록 목록을 배치하고 그려서 EncodedImage(바이트와 MIME 형식)로 돌려줍니다.
+
+    export_format이 'pdf'나 'zip'이면 페이지로 나눠 그립니다. 한 장 이미지 형식이라도
+    내용이 MAX_CANVAS_HEIGHT보다 길면 거대한 캔버스를 만들지 않도록 PDF로 나눠 그리고,
+    페이지가 그 사실을 알릴 수 있도록 notice에 LONG_CONTENT_NOTICE를 넣습니다.
+    """
+    plan = layout_summary(blocks, style)
+    if export_format in PAGED_FORMATS:
+        return render_pages(plan, export_format)
+    if plan.height > MAX_CANVAS_HEIGHT:
+        encoded = render_pages(plan, 'pdf')
+        encoded.notice = LONG_CONTENT_NOTICE
+        return encoded
+    img = draw_layout(plan)
+    return encode_image(img, export_format, has_photo=has_photo(plan), byte_budget=byte_budget)
@@ -0,0 +1,120 @@
+"""차시별 결과 이미지 템플릿입니다.
+
+각 템플릿은 제출 내용(세션 상태 키를 그대로 쓴 일반 dict)을 받아
+helpers.summary_render가 그릴 블록 목록을 만듭니다.
+앱 첫 화면(app.py)도 필드 목록 때문에 이 모듈을 불러오므로, pandas를 쓰는 파서는 템플릿을 그릴 때 불러옵니다.
+"""
+import datetime
+
+from helpers.summary_render import ChartRowBlock, ImageBlock, SummaryStyle, TextBlock, render_summary
+
+TITLE_SIZE, HEADER_SIZE, BODY_SIZE = 40, 28, 20
+
+COURSES = ['appetizer', 'main_dish', 'dessert']
+
+LESSON5_FIELDS = [
+    'activity1_title', 'activity1_reason',
+    'mission_a_chart', 'mission_a_reason', 'mission_b_chart', 'mission_b_reason',
+    'challenge_title', 'challenge_comment',
+]
+
+LESSON6_FIELDS = [
+    'critique_1', 'critique_2', 'critique_3',
+    'check_title', 'check_axis', 'check_color', 'check_datalabel',
+    *[f'{course}_{suffix}' for course in COURSES for suffix in ('title', 'data', 'type')],
+    'course_note',
+]
+
+LESSON5_STYLE = SummaryStyle(width=800, background='#FFF8F0', text_color='#333333')
+LESSON6_STYLE = SummaryStyle(width=900, background='#F0F2F6', text_color='#1E3A8A')
+
+
+def submitted_at(submission):
+    """제출 시각 문자열을 돌려줍니다. 없으면 현재 시각을 씁니다."""
+    return submission.get('submitted_at') or datetime.datetime.now().strftime('%Y-%m-%d %H:%M')
+
+
+def lesson5_blocks(submission):
+    """5차시 제출 내용을 요약 이미지 블록 목록으로 만듭니다."""
+    get = submission.get
+    return [
+        TextBlock("데이터 쿡방 5차시 제출 결과", TITLE_SIZE),
+        TextBlock(f"제출 시각: {submitted_at(submission)}"),
+        TextBlock(""), # Spacer
+        TextBlock("🧐 활동 1: '맛있는 쿡방' 분석", HEADER_SIZE),
+        TextBlock(f"데이터 제목: {get('activity1_title', 'N/A')}"),
+        TextBlock(f"B장면이 더 좋은 이유: {get('activity1_reason', 'N/A')}"),
+        TextBlock(""),
+        TextBlock("🛠️ 활동 2: 최고의 레시피 선택", HEADER_SIZE),
+        TextBlock(f"미션 A (메뉴 순위): {get('mission_a_chart', 'N/A')}"),
+        TextBlock(f"이유: {get('mission_a_reason', 'N/A')}"),
+        TextBlock(f"미션 B (성비): {get('mission_b_chart', 'N/A')}"),
+        TextBlock(f"이유: {get('mission_b_reason', 'N/A')}"),
+        TextBlock(""),
+        TextBlock("🎯 챌린지: 나의 시그니처 디쉬", HEADER_SIZE),
+        TextBlock(f"요리 이름: {get('challenge_title', 'N/A')}"),
+        TextBlock(f"셰프의 한 마디: {get('challenge_comment', 'N/A')}"),
+        ImageBlock(get('challenge_image')),
+    ]
+
+
+def _done(submission, key):
+    return '완료' if submission.get(key, False) else '미완료'
+
+
+def lesson6_blocks(submission):
+    """6차시 제출 내용을 요약 이미지 블록 목록으로 만듭니다."""
+    from helpers.parsing import parse_records
+
+    get = submission.get
+    charts = [
+        (parse_records(get(f'{course}_data', '')),
+         get(f'{course}_type', '막대 차트 (비교)'),
+         get(f'{course}_title', course.capitalize()))
+        for course in COURSES
+    ]
+    return [
+        TextBlock("데이터 쿡방 6차시 제출 결과", TITLE_SIZE),
+        TextBlock(f"제출 시각: {submitted_at(submission)}"), TextBlock(""),
+        TextBlock("🧐 활동 1: '최악의 레스토랑' 비평 노트", HEADER_SIZE),
+        TextBlock(f"정체불명 스테이크: {get('critique_1', 'N/A')}"),
+        TextBlock(f"고무줄 자: {get('critique_2', 'N/A')}"),
+        TextBlock(f"무지개 폭탄: {get('critique_3', 'N/A')}"), TextBlock(""),
+        TextBlock("🛠️ 활동 2: 업그레이드 체크리스트", HEADER_SIZE),
+        TextBlock(f"[제목]: {_done(submission, 'check_title')}"),
+        TextBlock(f"[축 레이블]: {_done(submission, 'check_axis')}"),
+        TextBlock(f"[색상 강조]: {_done(submission, 'check_color')}"),
+        TextBlock(f"[데이터 레이블]: {_done(submission, 'check_datalabel')}"), TextBlock(""),
+        TextBlock("🎯 챌린지: 미슐랭 3스타 코스 요리", HEADER_SIZE),
+        ChartRowBlock(charts),
+        TextBlock(f"셰프의 노트: {get('course_note', 'N/A')}"),
+    ]
+
+
+def submission_from_state(state, fields):
+    """세션 상태에서 템플릿이 읽는 값만 골라 일반 dict로 만듭니다.
+
+    업로드 파일은 바이트로 바꿔 담으므로, 결과는 Streamlit 없이도 쓸 수 있습니다.
+    5차시 업로드 이미지('challenge_image')는 페이지가 미리 줄여 둔 바이트를 따로 넣습니다.
+    """
+    submission = {}
+    for key in fields:
+        if key not in state:
+            continue
+        value = state[key]
+        if hasattr(value, 'getvalue'):
+            value = value.getvalue()
+        submission[key] = value
+    return submission
+
+
+TEMPLATES = {
+    'lesson5': (lesson5_blocks, LESSON5_STYLE),
+    'lesson6': (lesson6_blocks, LESSON6_STYLE),
+}
+
+
+def render_submission(lesson, submission, export_format='png', byte_budget=None):
+    """차시 이름('lesson5', 'lesson6')과 제출 내용으로 결과 이미지(EncodedImage)를 만듭니다."""
+    blocks_for, style = TEMPLATES[lesson]
+    return render_summary(blocks_for(submission), style, export_format, byte_budget)
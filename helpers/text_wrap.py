@@ -0,0 +1,87 @@
+"""결과 이미지의 긴 문장을 주어진 너비에 맞게 줄바꿈합니다.
+
+단어(공백으로 나눈 토큰)마다 너비를 한 번만 재고, 폰트별 너비 캐시에 보관합니다.
+한 단어가 한 줄보다 넓으면(띄어쓰기 없는 긴 한글 문장, URL 등) 글자 단위로 끊으므로
+항상 앞으로 나아가며, 문단 길이에 비례하는 시간 안에 끝납니다.
+"""
+import threading
+import weakref
+
+from helpers.metrics import timed
+
+# 폰트마다 {토큰: 너비} 캐시를 둡니다. 학생 답안이 계속 새 단어를 만들므로 크기를 제한합니다.
+MAX_CACHED_WIDTHS = 20000
+
+_width_caches = weakref.WeakKeyDictionary()
+_width_caches_lock = threading.Lock()
+
+
+def _width_cache(font):
+    """폰트 객체에 딸린 너비 캐시를 돌려줍니다."""
+    cache = _width_caches.get(font)
+    if cache is None:
+        with _width_caches_lock:
+            cache = _width_caches.setdefault(font, {})
+    return cache
+
+
+def text_width(font, text, cache=None):
+    """문자열의 가로 진행 폭(advance width)을 캐시를 거쳐 돌려줍니다."""
+    if cache is None:
+        cache = _width_cache(font)
+    width = cache.get(text)
+    if width is None:
+        if len(cache) >= MAX_CACHED_WIDTHS:
+            cache.clear()
+        width = font.getlength(text)
+        cache[text] = width
+    return width
+
+
+def _split_long_word(word, font, max_width, cache):
+    """한 줄보다 넓은 단어를 글자 단위로 끊어 조각 목록과 마지막 조각의 너비를 돌려줍니다."""
+    pieces = []
+    piece = []
+    piece_width = 0
+    for ch in word:
+        w = text_width(font, ch, cache)
+        if piece and piece_width + w > max_width:
+            pieces.append(''.join(piece))
+            piece, piece_width = [], 0
+        piece.append(ch)
+        piece_width += w
+    pieces.append(''.join(piece))
+    return pieces, piece_width
+
+
+@timed('wrap_text')
+def wrap_text(text, font, max_width):
+    """주어진 너비에 맞게 텍스트를 여러 줄로 나눕니다."""
+    lines = []
+    if not text:
+        return lines
+    cache = _width_cache(font)
+    space_width = text_width(font, ' ', cache)
+
+    for paragraph in text.split('\n'):
+        current = []
+        current_width = 0
+        for word in paragraph.split(' '):
+            w = text_width(font, word, cache)
+            if current and current_width + space_width + w <= max_width:
+                current.append(word)
+                current_width += space_width + w
+                continue
+            if current:
+                lines.append(' '.join(current).strip())
+                current, current_width = [], 0
+            if w <= max_width:
+                current = [word]
+                current_width = w
+            else:
+                pieces, last_width = _split_long_word(word, font, max_width, cache)
+                lines.extend(pieces[:-1])
+                current = [pieces[-1]]
+                current_width = last_width
+        lines.append(' '.join(current).strip())
+    return lines
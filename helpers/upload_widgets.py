@@ -0,0 +1,65 @@
+"""차트 활동의 데이터 입력란 옆에 붙이는 파일 올리기 위젯입니다.
+
+올린 파일에서 고른 '항목' 열과 '값' 열을 항목별로 모아 '항목: 값' 텍스트로 입력란에 넣습니다.
+수천 행짜리 파일도 입력란에는 항목 수만큼의 짧은 텍스트만 들어가므로, 화면이 다시 실행될 때
+큰 텍스트를 주고받지 않고 기존의 파싱과 결과 이미지 만들기도 그대로 씁니다.
+"""
+import streamlit as st
+from pandas.api.types import is_numeric_dtype
+
+from helpers.uploads import COUNT_ROWS, UPLOAD_TYPES, UploadError, item_value_frame, load_uploaded_table, to_item_text
+
+# 입력란에 넣을 최대 항목 수입니다. 넘으면 값이 큰 순서로 자릅니다.
+MAX_TEXT_ITEMS = 100
+
+
+def _keys(data_key):
+    return f"{data_key}_file", f"{data_key}_item_column", f"{data_key}_value_column"
+
+
+def _fill_data_area(data_key):
+    """올린 파일과 고른 열로 data_key 입력란의 텍스트를 채웁니다. 위젯 콜백에서 부릅니다."""
+    file_key, item_key, value_key = _keys(data_key)
+    uploaded = st.session_state.get(file_key)
+    if uploaded is None:
+        return
+    try:
+        _, table = load_uploaded_table(uploaded)
+    except UploadError:
+        return
+    if table.empty:
+        return
+    columns = list(table.columns)
+    item_column = st.session_state.get(item_key)
+    if item_column not in columns:
+        item_column = columns[0]
+    value_column = st.session_state.get(value_key, COUNT_ROWS)
+    df = item_value_frame(table, item_column, value_column)
+    if len(df) > MAX_TEXT_ITEMS:
+        df = df.nlargest(MAX_TEXT_ITEMS, '값')
+    st.session_state[data_key] = to_item_text(df)
+
+
+def data_upload(data_key, label="또는 데이터 파일 올리기 (CSV/XLSX)"):
+    """data_key 입력란을 채우는 파일 올리기 위젯을 그리고, 읽은 표를 돌려줍니다.
+
+    입력란은 위젯 콜백에서 채우므로 입력란(text_area)보다 뒤에 그려도 됩니다.
+    """
+    file_key, item_key, value_key = _keys(data_key)
+    uploaded = st.file_uploader(label, type=UPLOAD_TYPES, key=file_key, on_change=_fill_data_area, args=(data_key,))
+    if uploaded is None:
+        return None
+    try:
+        _, table = load_uploaded_table(uploaded)
+    except UploadError as e:
+        st.error(str(e))
+        return None
+
+    columns = list(table.columns)
+    numeric = [c for c in columns if is_numeric_dtype(table[c])]
+    col_item, col_value = st.columns(2)
+    col_item.selectbox("항목 열", columns, key=item_key, on_change=_fill_data_area, args=(data_key,))
+    col_value.selectbox("값 열", [COUNT_ROWS, *numeric], key=value_key, on_change=_fill_data_area, args=(data_key,))
+    st.caption(f"{len(table):,}행 × {len(columns)}열을 읽었어요. 항목별로 모아 위 입력란에 넣었습니다"
+               f" (최대 {MAX_TEXT_ITEMS}개).")
+    return table
@@ -0,0 +1,216 @@
+"""시트에서 내려받은 CSV/XLSX 파일을 표(DataFrame)로 읽습니다.
+
+큰 파일도 한 번에 메모리에 펼치지 않도록 CHUNK_ROWS행씩 모든 열을 글자로 읽어 곧바로
+범주형(Categorical)으로 바꾸고, 다 읽은 뒤 범주를 합칩니다. 설문 응답처럼 같은 값이 많은
+열은 이렇게 하면 메모리가 크게 줄어듭니다. 학번처럼 값이 거의 다 다른 열은 범주형이 오히려
+커서 글자 열로 두고, 값이 모두 숫자인 열은 숫자(float) 열로 바꿉니다.
+
+읽은 표는 파일 내용의 해시로 기억해 두므로, 화면이 다시 실행되어도 파일을 다시 읽지 않습니다.
+"""
+import hashlib
+import threading
+from collections import OrderedDict
+from io import BytesIO
+from itertools import islice
+
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+CHUNK_ROWS = 50_000
+MAX_CACHED_TABLES = 8
+MAX_CATEGORY_RATIO = 0.5
+UPLOAD_TYPES = ['csv', 'xlsx']
+
+# '값' 열 대신 고를 수 있는 선택지입니다. 항목 열의 값마다 몇 번 나왔는지 셉니다.
+COUNT_ROWS = "(응답 개수 세기)"
+
+
+class UploadError(ValueError):
+    """올린 파일을 표로 읽을 수 없을 때 발생합니다."""
+
+
+def file_digest(data):
+    """파일 내용의 sha256 해시(16진수)를 돌려줍니다."""
+    return hashlib.sha256(data).hexdigest()
+
+
+def _column_labels(header):
+    """머리글 행으로 열 이름을 만듭니다. 비었거나 겹치는 이름은 '열3', '이름_2'처럼 바꿉니다."""
+    labels, seen = [], {}
+    for i, name in enumerate(header):
+        name = str(name).strip() if name is not None and str(name).strip() else f"열{i + 1}"
+        seen[name] = seen.get(name, 0) + 1
+        labels.append(name if seen[name] == 1 else f"{name}_{seen[name]}")
+    return labels
+
+
+def _compact_column(series):
+    """글자 열 하나를 범주형으로 바꿉니다. 서로 다른 값이 절반을 넘으면 글자 열 그대로 둡니다."""
+    series = series.str.strip()
+    categorical = pd.Categorical(series)
+    return series if len(categorical.categories) > len(series) * MAX_CATEGORY_RATIO else categorical
+
+
+def _categorical_chunk(chunk):
+    """글자로 읽은 한 덩어리의 모든 열을 가능하면 범주형으로 바꿉니다."""
+    return {column: _compact_column(chunk[column]) for column in chunk.columns}
+
+
+def _read_csv(data):
+    for encoding in ('utf-8-sig', 'cp949'):
+        try:
+            reader = pd.read_csv(BytesIO(data), dtype=str, keep_default_na=False, encoding=encoding,
+                                 chunksize=CHUNK_ROWS)
+            columns, chunks = None, []
+            for chunk in reader:
+                if columns is None:
+                    columns = _column_labels(chunk.columns)
+                chunk.columns = columns
+                chunks.append(_categorical_chunk(chunk))
+            return columns or [], chunks
+        except UnicodeDecodeError:
+            continue
+        except (pd.errors.ParserError, pd.errors.EmptyDataError) as e:
+            raise UploadError(f"CSV 파일을 읽을 수 없습니다: {e}") from e
+    raise UploadError("CSV 파일의 글자 인코딩을 알 수 없습니다. UTF-8로 저장해 올려주세요.")
+
+
+def _read_xlsx(data):
+    from openpyxl import load_workbook
+
+    try:
+        workbook = load_workbook(BytesIO(data), read_only=True, data_only=True)
+    except Exception as e:
+        raise UploadError(f"엑셀 파일을 읽을 수 없습니다: {e}") from e
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return [], []
+        columns = _column_labels(header)
+        width = len(columns)
+        chunks = []
+        while True:
+            batch = list(islice(rows, CHUNK_ROWS))
+            if not batch:
+                break
+            cells = [['' if v is None else str(v) for v in row[:width]] + [''] * (width - len(row)) for row in batch]
+            chunks.append(_categorical_chunk(pd.DataFrame(cells, columns=columns, dtype=str)))
+        return columns, chunks
+    finally:
+        workbook.close()
+
+
+def _to_numbers(values):
+    """값이 모두 숫자면(천 단위 쉼표 허용) float 배열을, 아니면 None을 돌려줍니다. 앞부분만 먼저 확인합니다."""
+    values = pd.Series(values, dtype=str).str.replace(',', '', regex=False)
+    if not len(values) or pd.to_numeric(values.head(100), errors='coerce').isna().any():
+        return None
+    numbers = pd.to_numeric(values, errors='coerce')
+    return None if numbers.isna().any() else numbers.to_numpy(dtype=float)
+
+
+def _combine_column(parts):
+    """덩어리별로 읽은 한 열을 합칩니다. 빈 칸은 결측값이 되고, 값이 모두 숫자면 숫자 열이 됩니다."""
+    if all(isinstance(part, pd.Categorical) for part in parts):
+        categorical = union_categoricals(parts)
+        if '' in categorical.categories:
+            categorical = categorical.remove_categories([''])
+        numbers = _to_numbers(categorical.categories)
+        if numbers is None:
+            return pd.Series(categorical)
+        codes = categorical.codes
+        values = numbers[codes]
+        values[codes < 0] = float('nan')
+        return pd.Series(values)
+
+    text = pd.concat([pd.Series(part, dtype=str) for part in parts], ignore_index=True)
+    filled = text[text != '']
+    numbers = _to_numbers(filled)
+    if numbers is None:
+        return text.where(text != '')
+    values = pd.Series(float('nan'), index=text.index)
+    values[filled.index] = numbers
+    return values
+
+
+def read_table(data, filename):
+    """CSV 또는 XLSX 파일 바이트를 표로 읽습니다. 글자 열은 범주형, 숫자 열은 float입니다."""
+    if filename.lower().endswith('.xlsx'):
+        columns, chunks = _read_xlsx(data)
+    else:
+        columns, chunks = _read_csv(data)
+    if not chunks:
+        return pd.DataFrame(columns=columns)
+    return pd.DataFrame({
+        column: _combine_column([chunk[column] for chunk in chunks])
+        for column in columns
+    })
+
+
+class TableCache:
+    """파일 해시로 읽은 표를 기억하는 작은 LRU 캐시입니다."""
+
+    def __init__(self, max_entries=MAX_CACHED_TABLES):
+        self.max_entries = max_entries
+        self._tables = OrderedDict()
+        # Streamlit UploadedFile.file_id → 파일 해시. 다시 실행될 때 해시도 다시 계산하지 않습니다.
+        self._digests = {}
+        self._lock = threading.Lock()
+
+    def load(self, uploaded_file):
+        """업로드 파일(UploadedFile 또는 name, getvalue()가 있는 객체)을 읽어 (해시, 표)를 돌려줍니다."""
+        file_id = getattr(uploaded_file, 'file_id', None)
+        with self._lock:
+            digest = self._digests.get(file_id) if file_id else None
+            if digest is not None and digest in self._tables:
+                self._tables.move_to_end(digest)
+                return digest, self._tables[digest]
+
+        data = uploaded_file.getvalue()
+        digest = file_digest(data)
+        with self._lock:
+            table = self._tables.get(digest)
+        if table is None:
+            table = read_table(data, uploaded_file.name)
+        with self._lock:
+            if file_id:
+                self._digests[file_id] = digest
+            self._tables[digest] = table
+            self._tables.move_to_end(digest)
+            while len(self._tables) > self.max_entries:
+                self._tables.popitem(last=False)
+        return digest, table
+
+
+_cache = TableCache()
+
+
+def load_uploaded_table(uploaded_file):
+    """업로드 파일을 표로 읽어 (해시, 표)를 돌려줍니다. 같은 파일은 다시 읽지 않습니다."""
+    return _cache.load(uploaded_file)
+
+
+def item_value_frame(table, item_column, value_column=COUNT_ROWS):
+    """표의 두 열로 '항목', '값' DataFrame을 만듭니다.
+
+    value_column이 COUNT_ROWS면 항목별 응답 수를 많은 순서로, 아니면 항목별 값의 합을
+    처음 나온 순서로 돌려줍니다.
+    """
+    items = table[item_column]
+    if value_column == COUNT_ROWS or value_column not in table:
+        counts = items.value_counts(sort=True, dropna=True)
+        counts = counts[counts > 0]
+        return pd.DataFrame({'항목': counts.index.astype(str), '값': counts.to_numpy(dtype=float)})
+    values = pd.to_numeric(table[value_column], errors='coerce')
+    sums = values.groupby(items, observed=True, sort=False, dropna=True).sum()
+    return pd.DataFrame({'항목': sums.index.astype(str), '값': sums.to_numpy(dtype=float)})
+
+
+def to_item_text(df):
+    """'항목', '값' DataFrame을 데이터 입력란에 넣을 '항목: 값' 여러 줄 텍스트로 만듭니다."""
+    lines = []
+    for item, value in zip(df['항목'], df['값']):
+        item = ' '.join(str(item).split())
+        lines.append(f"{item}: {int(value) if float(value).is_integer() else value}")
+    return '\n'.join(lines)
@@ -0,0 +1,130 @@
+"""응답 속 오타와 다른 표현(김치찌게/김치찌개, 돈까스/돈까쓰)을 찾아 묶습니다.
+
+한글은 음절 하나가 자모 2~3개로 이루어져 있어서, 음절 단위로 비교하면 '게'와 '개'가 완전히 다른
+글자가 됩니다. 그래서 값을 자모로 풀어(ㄱㅣㅁㅊㅣㅉㅣㄱㅔ) 자모 편집 거리로 비교합니다.
+
+서로 다른 값이 수천 개여도 모든 쌍을 비교하지 않도록, 자모 문자열에서 글자를 최대
+max_distance개 지운 모양들로 색인을 만들고(SymSpell 방식) 같은 모양을 공유하는 값끼리만
+편집 거리를 확인합니다. 편집 거리가 max_distance 이하인 쌍은 이 색인에서 반드시 만납니다.
+"""
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+from functools import lru_cache
+from itertools import combinations
+
+_HANGUL_BASE = 0xAC00
+_HANGUL_LAST = 0xD7A3
+_CHOSEONG = [chr(0x1100 + i) for i in range(19)]
+_JUNGSEONG = [chr(0x1161 + i) for i in range(21)]
+_JONGSEONG = [''] + [chr(0x11A8 + i) for i in range(27)]
+
+
+@lru_cache(maxsize=65536)
+def decompose(text):
+    """한글 음절을 자모로 풉니다. 비교할 때 방해되는 공백은 빼고 영문은 소문자로 바꿉니다."""
+    jamo = []
+    for ch in text.casefold():
+        code = ord(ch)
+        if _HANGUL_BASE <= code <= _HANGUL_LAST:
+            index = code - _HANGUL_BASE
+            jamo.append(_CHOSEONG[index // 588])
+            jamo.append(_JUNGSEONG[index % 588 // 28])
+            jamo.append(_JONGSEONG[index % 28])
+        elif not ch.isspace():
+            jamo.append(ch)
+    return ''.join(jamo)
+
+
+def edit_distance(a, b, limit):
+    """a와 b의 편집 거리를 돌려줍니다. limit을 넘으면 계산을 멈추고 limit + 1을 돌려줍니다."""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb)))
+        if min(current) > limit:
+            return limit + 1
+        previous = current
+    return previous[-1]
+
+
+def _deletions(word, depth):
+    """word에서 글자를 0~depth개 지운 모든 모양입니다."""
+    shapes = {word}
+    frontier = {word}
+    for _ in range(depth):
+        frontier = {w[:i] + w[i + 1:] for w in frontier for i in range(len(w))}
+        shapes |= frontier
+    return shapes
+
+
+@dataclass
+class VariantCluster:
+    """비슷한 표기 묶음입니다. variants는 (표기, 개수) 목록이며 canonical(대표 표기)이 맨 앞입니다."""
+    canonical: str
+    variants: list = field(default_factory=list)
+
+    @property
+    def total(self):
+        return sum(count for _, count in self.variants)
+
+    @property
+    def variant_total(self):
+        """대표 표기가 아닌 표기들의 개수 합, 즉 고치면 바뀌는 응답 수입니다."""
+        return self.total - self.variants[0][1]
+
+
+def find_variants(values, max_distance=1, min_length=4):
+    """응답 목록에서 비슷한 표기 묶음을 찾아, 고칠 응답이 많은 순서로 돌려줍니다.
+
+    자모 편집 거리가 max_distance 이하면 같은 묶음입니다. 자모가 min_length개보다 짧은 값
+    (배/베처럼 한 글자 응답)은 우연히 비슷한 경우가 많아 묶지 않습니다. 대표 표기는 가장 많이
+    쓰인 표기입니다.
+    """
+    counts = Counter(v.strip() for v in values if isinstance(v, str) and v.strip())
+    words = [w for w in counts if len(decompose(w)) >= min_length]
+
+    index = defaultdict(list)
+    for i, word in enumerate(words):
+        for shape in _deletions(decompose(word), max_distance):
+            index[shape].append(i)
+
+    parent = list(range(len(words)))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    checked = set()
+    for members in index.values():
+        for i, j in combinations(members, 2):
+            if (i, j) in checked or find(i) == find(j):
+                continue
+            checked.add((i, j))
+            if edit_distance(decompose(words[i]), decompose(words[j]), max_distance) <= max_distance:
+                parent[find(i)] = find(j)
+
+    groups = defaultdict(list)
+    for i, word in enumerate(words):
+        groups[find(i)].append((word, counts[word]))
+    clusters = []
+    for members in groups.values():
+        if len(members) < 2:
+            continue
+        members.sort(key=lambda item: (-item[1], len(item[0]), item[0]))
+        clusters.append(VariantCluster(members[0][0], members))
+    clusters.sort(key=lambda c: (-c.variant_total, -c.total, c.canonical))
+    return clusters
+
+
+def cluster_rules(clusters):
+    """묶음마다 대표가 아닌 표기를 대표 표기로 바꾸는 세척 규칙(cleaning_rules 형식)을 만듭니다."""
+    return [
+        {'find': variant, 'replace': cluster.canonical}
+        for cluster in clusters
+        for variant, _ in cluster.variants[1:]
+    ]
@@ -0,0 +1,36 @@
+"""결과 이미지에 쓰는 한글 폰트를 배포 전에 assets/fonts에 받아 둡니다.
+
+폰트가 assets/fonts(또는 SUMMARY_FONT_PATH)에 있으면 서버가 처음 이미지를 만들 때 네트워크로
+폰트를 받지 않습니다. 배포 이미지를 만드는 단계나, 폰트를 저장소에 함께 올리기 전에 한 번 실행합니다.
+이미 올바른 폰트가 있으면 다시 받지 않습니다.
+
+실행 예: python provision_font.py [--dest assets/fonts]
+"""
+import argparse
+import os
+import sys
+
+from helpers.fonts import BUNDLED_FONT_DIR, FONT_FILENAME, FontUnavailableError, download_font, is_valid_font
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--dest', default=BUNDLED_FONT_DIR, help="폰트를 저장할 폴더 (기본값: assets/fonts)")
+    args = parser.parse_args(argv)
+
+    path = os.path.join(args.dest, FONT_FILENAME)
+    if is_valid_font(path):
+        print(f"이미 폰트가 있습니다: {path}")
+        return 0
+    os.makedirs(args.dest, exist_ok=True)
+    try:
+        path = download_font(args.dest)
+    except FontUnavailableError as e:
+        print(e, file=sys.stderr)
+        return 1
+    print(f"폰트를 받았습니다: {path}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
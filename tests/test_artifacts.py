@@ -0,0 +1,83 @@
+"""helpers.artifacts: 메모리 한도를 넘으면 디스크로 옮기고, 디스크 한도와 TTL을 넘으면 지우는지 확인합니다."""
+import os
+
+from helpers import artifacts
+from helpers.artifacts import ArtifactStore
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_store(tmp_path, **limits):
+    clock = FakeClock()
+    options = dict(max_memory_bytes=100, max_disk_bytes=1000, ttl=600, directory=str(tmp_path))
+    options.update(limits)
+    return ArtifactStore(clock=clock, **options), clock
+
+
+def test_same_content_is_stored_once(tmp_path):
+    store, _ = make_store(tmp_path)
+    first = store.put(b'a' * 10, 'image/png', 'png')
+    second = store.put(b'a' * 10, 'image/png', 'png')
+    assert first == second
+    assert store.stats()['memory_bytes'] == 10
+
+
+def test_least_recently_used_spills_to_disk(tmp_path):
+    store, _ = make_store(tmp_path)
+    old, recent = store.put(b'a' * 60), store.put(b'b' * 30)
+    store.get(old)  # old를 최근에 쓴 것으로 만듭니다.
+    new = store.put(b'c' * 30)
+
+    stats = store.stats()
+    assert (stats['memory_entries'], stats['disk_entries'], stats['spills']) == (2, 1, 1)
+    assert os.listdir(tmp_path) == [recent.digest]
+    assert [store.get(h) for h in (old, recent, new)] == [b'a' * 60, b'b' * 30, b'c' * 30]
+
+
+def test_large_items_go_straight_to_disk(tmp_path, monkeypatch):
+    monkeypatch.setattr(artifacts, 'SPILL_BYTES', 20)
+    store, _ = make_store(tmp_path)
+    handle = store.put(b'x' * 21)
+    assert store.stats()['memory_entries'] == 0
+    assert store.get(handle) == b'x' * 21
+
+
+def test_disk_cap_evicts_least_recently_used(tmp_path):
+    store, _ = make_store(tmp_path, max_memory_bytes=0, max_disk_bytes=100)
+    first, second = store.put(b'1' * 40), store.put(b'2' * 40)
+    store.get(first)
+    third = store.put(b'3' * 40)
+
+    assert second not in store
+    assert store.get(second) is None
+    assert store.get(first) == b'1' * 40 and store.get(third) == b'3' * 40
+    assert store.stats()['disk_bytes'] == 80
+    assert sorted(os.listdir(tmp_path)) == sorted([first.digest, third.digest])
+
+
+def test_ttl_expires_unused_items(tmp_path):
+    store, clock = make_store(tmp_path, max_memory_bytes=50, ttl=600)
+    idle, busy = store.put(b'i' * 40), store.put(b'b' * 40)  # idle은 디스크로 옮겨집니다.
+
+    clock.now = 500
+    assert store.get(busy) == b'b' * 40
+    clock.now = 700  # idle은 700초, busy는 200초 동안 쓰지 않았습니다.
+    assert store.get(idle) is None
+    assert store.get(busy) == b'b' * 40
+    assert os.listdir(tmp_path) == []
+    assert store.stats()['evictions'] == 1
+
+
+def test_sweep_runs_at_most_once_per_interval(tmp_path):
+    store, clock = make_store(tmp_path, ttl=1)
+    handle = store.put(b'a')
+    clock.now = artifacts.SWEEP_INTERVAL - 1
+    assert store.get(handle) == b'a'  # TTL은 지났지만 아직 찾을 때가 아닙니다.
+    clock.now = 2 * artifacts.SWEEP_INTERVAL
+    assert store.get(handle) is None
@@ -0,0 +1,62 @@
+"""batch_render: 한 학생이 실패해도 나머지는 그리는지, 폰트가 없으면 바로 멈추는지, CSV만 \\n을 줄바꿈으로 바꾸는지 확인합니다."""
+import io
+import json
+import zipfile
+
+import pytest
+from PIL import Image
+
+from batch_render import normalize_submission, read_submissions, render_batch
+from helpers import fonts
+from helpers.summary_templates import LESSON6_FIELDS
+
+
+@pytest.fixture
+def require_font():
+    if not any(fonts.is_valid_font(path) for path in fonts._candidate_paths()):
+        pytest.skip("결과 이미지를 그릴 폰트가 없습니다 (SUMMARY_FONT_PATH).")
+
+
+def test_bad_image_path_fails_only_that_student(tmp_path, require_font):
+    buf = io.BytesIO()
+    Image.new('RGB', (60, 40), 'orange').save(buf, format='PNG')
+    (tmp_path / 'ok.png').write_bytes(buf.getvalue())
+    rows = [
+        {'student': 'a', 'challenge_title': '급식 순위', 'challenge_image': 'ok.png'},
+        {'student': 'b', 'challenge_title': '없는 파일', 'challenge_image': 'missing.png'},
+        {'student': 'c', 'challenge_title': '이미지 없음'},
+    ]
+    output = tmp_path / 'out.zip'
+
+    ok, failed, _ = render_batch(rows, '5', output, workers=1, export_format='png', base_dir=str(tmp_path))
+
+    assert (ok, failed) == (2, 1)
+    with zipfile.ZipFile(output) as zf:
+        manifest = json.loads(zf.read('manifest.json'))
+        names = set(zf.namelist())
+    items = {item['id']: item for item in manifest['items']}
+    assert 'FileNotFoundError' in items['b']['error']
+    assert {items['a']['file'], items['c']['file']} <= names
+
+
+def test_missing_font_fails_fast_without_output(tmp_path, monkeypatch):
+    def unavailable():
+        raise fonts.FontUnavailableError("폰트를 다운로드하는 데 실패했습니다")
+    monkeypatch.setattr('batch_render.get_font_path', unavailable)
+    output = tmp_path / 'out.zip'
+
+    with pytest.raises(fonts.FontUnavailableError):
+        render_batch([{'student': 'a'}], '6', output, workers=1)
+
+    assert not output.exists()
+
+
+def test_only_csv_cells_unescape_newlines(tmp_path):
+    (tmp_path / 'rows.csv').write_text('student,course_note\na,첫 줄\\n둘째 줄\n', encoding='utf-8')
+    (tmp_path / 'rows.json').write_text(json.dumps([{'student': 'a', 'course_note': '역슬래시 \\n 그대로'}]), encoding='utf-8')
+
+    csv_row = normalize_submission(read_submissions(str(tmp_path / 'rows.csv'))[0], LESSON6_FIELDS, str(tmp_path))
+    json_row = normalize_submission(read_submissions(str(tmp_path / 'rows.json'))[0], LESSON6_FIELDS, str(tmp_path))
+
+    assert csv_row['course_note'] == '첫 줄\n둘째 줄'
+    assert json_row['course_note'] == '역슬래시 \\n 그대로'
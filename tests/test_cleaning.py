@@ -0,0 +1,34 @@
+"""helpers.cleaning: 겹치는 규칙은 같은 위치에서 가장 긴 말이 먼저 적용되는지, 규칙별 적용 횟수가 맞는지 확인합니다."""
+from helpers.cleaning import Cleaner, get_cleaner, read_rules_csv
+
+
+def test_longest_match_wins_at_the_same_position():
+    cleaner = Cleaner([('돈', '豚'), ('돈까스', '돈가스'), ('돈까', 'X')])
+    values, hits = cleaner.clean(['돈까스 정식', '돈까 ', '돈', None])
+    assert values == ['돈가스 정식', 'X ', '豚', '']
+    assert hits == {'돈까스': 1, '돈까': 1, '돈': 1}
+
+
+def test_hits_count_every_replacement_and_first_rule_wins():
+    cleaner = Cleaner([('찌게', '찌개'), ('찌게', '무시'), ('', '빈 말')])
+    values, hits = cleaner.clean(['김치찌게, 된장찌게', '찌개', '부대찌게'])
+    assert values == ['김치찌개, 된장찌개', '찌개', '부대찌개']
+    assert hits == {'찌게': 3}
+    assert cleaner.hit_table(hits).values.tolist() == [['찌게', '찌개', 3]]
+
+
+def test_cells_with_separators_keep_their_count():
+    values, _ = Cleaner([('a', 'b')]).clean(['a\nb', 'a\x00a', ''])
+    assert values == ['b\nb', 'b\x00b', '']
+
+
+def test_whole_cell_replaces_only_exact_cells():
+    values, hits = Cleaner([('배', '배(과일)')]).clean(['배', '배추', '배'], whole_cell=True)
+    assert values == ['배(과일)', '배추', '배(과일)']
+    assert hits == {'배': 2}
+
+
+def test_rules_from_csv_skip_header_and_compile_once():
+    rules = read_rules_csv('찾을 말,바꿀 말\n찌게,찌개\n,빈칸\n'.encode('cp949'))
+    assert rules == [{'find': '찌게', 'replace': '찌개'}]
+    assert get_cleaner(rules) is get_cleaner([('찌게', '찌개')])
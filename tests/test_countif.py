@@ -0,0 +1,50 @@
+"""helpers.countif: 와일드카드·비교·같지 않음 조건이 시트의 COUNTIF와 같게 세는지, 빈도 색인과 COUNTIFS가 같은 값을 내는지 확인합니다."""
+import pandas as pd
+import pytest
+
+from helpers.countif import FrequencyIndex, countif, countifs, get_index, load_range
+
+MENU = "돈가스\n돈까스\n\n김치찌개\n김치찌개\n*특식\n12\n3\n3.0\n\n사과\n"
+CRITERIA = ['김치찌개', '돈*', '김치찌?', '~*특식', '*', '>10', '<=3', '<김', '>=사', '<>김치찌개', '<>3', '<>', '=', '""']
+
+
+@pytest.mark.parametrize('criterion, expected', [
+    ('돈*', 2), ('김치찌?', 2), ('*특식', 1), ('~*특식', 1), ('~*', 0),
+])
+def test_wildcards_and_escape(criterion, expected):
+    assert countif(MENU, criterion) == expected
+
+
+@pytest.mark.parametrize('criterion, expected', [
+    ('>10', 1), ('<=3', 2), ('=3', 2), ('<김', 1), ('>=사', 1),
+])
+def test_numeric_and_text_comparisons(criterion, expected):
+    assert countif(MENU, criterion) == expected
+
+
+@pytest.mark.parametrize('criterion, expected', [
+    ('<>김치찌개', 9),  # 범위 사이의 빈 줄 2개도 셉니다.
+    ('<>3', 9),
+    ('<>', 9),  # 빈 칸이 아닌 칸
+    ('""', 2),  # 빈 칸
+])
+def test_not_equal_counts_blank_cells_like_sheets(criterion, expected):
+    assert countif(MENU, criterion) == expected
+
+
+def test_leading_and_trailing_blank_lines_are_outside_the_range():
+    assert countif("\n\n사과\n\n배\n\n", '<>사과') == 2
+
+
+@pytest.mark.parametrize('criterion', CRITERIA)
+def test_index_matches_countifs_on_one_column(criterion):
+    assert get_index(MENU).count(criterion) == countifs(load_range(MENU), [('A', criterion)])
+
+
+@pytest.mark.parametrize('criterion', CRITERIA)
+def test_series_index_matches_countifs(criterion):
+    series = pd.Series(['돈가스', None, '김치찌개', '*특식', '12', '3', None, '사과'], dtype=object)
+    table = pd.DataFrame({'A': series, 'B': series.astype('category')})
+    expected = countifs(table, [('A', criterion)])
+    assert FrequencyIndex.from_series(series).count(criterion) == expected
+    assert countifs(table, [('B', criterion)]) == expected
@@ -0,0 +1,38 @@
+"""helpers.data_export: 내려받기 버튼에 넘기는 함수의 결과를 Streamlit이 바이트로 바꿀 수 있는지 확인합니다."""
+import codecs
+import io
+
+import pandas as pd
+from openpyxl import load_workbook
+from streamlit.runtime.download_data_util import convert_data_to_bytes_and_infer_mime
+
+from helpers.data_export import DATA_SHEET, SUMMARY_SHEET, deferred_export
+
+
+def convert(data):
+    return convert_data_to_bytes_and_infer_mime(data, RuntimeError("지원하지 않는 형식"))[0]
+
+
+def cleaned_table():
+    return pd.DataFrame({'손질한 재료': ['돈까스', '피자', '돈까스', None], '번호': [1, 2, 3, 4]})
+
+
+def test_csv_download_has_every_row():
+    data = convert(deferred_export(cleaned_table(), 'csv', ['손질한 재료'])())
+
+    assert data.startswith(codecs.BOM_UTF8)
+    assert data[len(codecs.BOM_UTF8):].decode('utf-8').splitlines() == [
+        '손질한 재료,번호', '돈까스,1', '피자,2', '돈까스,3', ',4',
+    ]
+
+
+def test_xlsx_download_has_data_and_summary_sheets():
+    data = convert(deferred_export(cleaned_table(), 'xlsx', ['손질한 재료'])())
+
+    workbook = load_workbook(io.BytesIO(data), read_only=True)
+    rows = [list(row) for row in workbook[DATA_SHEET].iter_rows(values_only=True)]
+    assert rows == [['손질한 재료', '번호'], ['돈까스', 1], ['피자', 2], ['돈까스', 3], [None, 4]]
+    summary = [list(row) for row in workbook[SUMMARY_SHEET].iter_rows(values_only=True)]
+    assert summary[0][:2] == ['전체 행 수', 4]
+    assert ['돈까스', 2, 66.7] in [row[:3] for row in summary]
+    assert ['피자', 1, 33.3] in [row[:3] for row in summary]
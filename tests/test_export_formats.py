@@ -0,0 +1,47 @@
+"""helpers.export_formats: 'auto'가 사진이 있으면 손실 압축을, 없으면 팔레트 PNG를 고르는지 확인합니다."""
+import os
+
+from PIL import Image, ImageDraw
+
+from helpers.export_formats import _encode_palette, _encoders, encode_image
+
+
+def text_only():
+    """글만 있는 결과 이미지와 비슷한 이미지입니다."""
+    img = Image.new('RGB', (800, 1600), 'white')
+    draw = ImageDraw.Draw(img)
+    for y in range(40, 1400, 18):
+        draw.text((40, y), "데이터 쿡방 요약 summary text 0123456789 " * 3, fill=(30, 30, 30))
+    return img
+
+
+def text_with_photo():
+    """글이 대부분이고 사진(잡음) 한 장이 들어간 이미지입니다."""
+    img = text_only()
+    img.paste(Image.frombytes('RGB', (240, 180), os.urandom(240 * 180 * 3)), (40, 1400))
+    return img
+
+
+def test_auto_without_photo_is_palette_png():
+    img = text_only()
+
+    encoded = encode_image(img, 'auto', has_photo=False)
+
+    assert encoded.mime == 'image/png'
+    assert encoded.data == _encode_palette(img).data
+
+
+def test_auto_with_photo_is_lossy():
+    encoded = encode_image(text_with_photo(), 'auto', has_photo=True)
+
+    assert encoded.mime in ('image/webp', 'image/jpeg')
+
+
+def test_photo_fits_small_budget_with_lossy_format():
+    img = text_with_photo()
+    budget = min(len(encode()) for encode in _encoders(img)['lossy']) + 1024
+
+    encoded = encode_image(img, 'auto', has_photo=True, byte_budget=budget)
+
+    assert len(encoded) <= budget
+    assert encoded.mime in ('image/webp', 'image/jpeg')
@@ -0,0 +1,26 @@
+"""helpers.junk: 돌멩이 응답의 이유 코드가 맞는지, 같은 값이 여러 번 나와도 줄마다 같은 결과인지 확인합니다."""
+import pandas as pd
+
+from helpers.junk import detect_junk, drop_junk_lines, junk_summary
+
+
+def test_reasons_for_repeated_blank_and_meaningful_values():
+    values = ['111', '', None, '   ', 'ㅋㅋㅋ', '???', '없음', '김치찌개', '3', '배']
+    mask, reasons = detect_junk(values)
+    assert reasons.tolist() == ['repeated', 'empty', 'empty', 'empty', 'jamo_only', 'symbols_only', 'stop_word', '', '', '']
+    assert mask.tolist() == [reason != '' for reason in reasons]
+
+
+def test_duplicate_values_get_the_same_reason_on_every_line():
+    series = pd.Series(['111', '사과', '111', '사과', '', ''], index=[10, 11, 12, 13, 14, 15])
+    for values in (series, series.astype('category')):
+        mask, reasons = detect_junk(values)
+        assert reasons.index.tolist() == series.index.tolist()
+        assert reasons.tolist() == ['repeated', '', 'repeated', '', 'empty', 'empty']
+    assert junk_summary(reasons).values.tolist() == [['빈 응답', 2], ['같은 글자 반복', 2]]
+
+
+def test_drop_junk_lines_removes_junk_and_blank_lines():
+    text, dropped = drop_junk_lines('사과\t3\n\n111\t1\n사과\t3\nㅋㅋ\n')
+    assert text == '사과\t3\n사과\t3'
+    assert dropped == 2
@@ -0,0 +1,70 @@
+"""helpers.parsing: 예전 float() 파서가 읽던 값을 그대로 읽는지, 바뀐 줄만 다시 파싱해도 전체 파싱과 같은지 확인합니다."""
+import re
+
+import pytest
+
+from helpers.parsing import STATE_PREFIX, IncrementalParser, parse_items, parse_widget
+
+
+def legacy_parse(raw_data):
+    """정규식 파서 이전(5.py의 parse_data)의 파서입니다. 마지막 조각을 float()로 읽습니다."""
+    parsed = []
+    for line in raw_data.strip().split('\n'):
+        parts = re.split(r'[:\s,]+', line.strip())
+        if len(parts) >= 2:
+            try:
+                parsed.append((parts[0].strip(), float(parts[-1].strip())))
+            except ValueError:
+                pass
+    return parsed
+
+
+def rows(df):
+    return list(df.itertuples(index=False, name=None))
+
+
+@pytest.mark.parametrize('line', [
+    "사과: 10", "배 1e3", "감: 1E-2", "귤:  +5", "수박, -2.5", "참외: .5", "딸기: 5.", "포도 +1.5e+2", "자두: 없음",
+])
+def test_values_match_float_parser(line):
+    assert rows(parse_items(line)) == legacy_parse(line)
+
+
+def test_thousands_separator_is_part_of_the_value():
+    assert rows(parse_items("딸기: 1,000\n포도, 1,234.5")) == [('딸기', 1000.0), ('포도', 1234.5)]
+
+
+def test_incremental_edits_match_full_parse():
+    parser = IncrementalParser()
+    edits = [
+        "사과: 10\n배: 20\n감: 30",
+        "사과: 10\n배: 25\n감: 30",  # 가운데 줄 값 고치기
+        "사과: 10\n배: 25\n귤: 5\n감: 30",  # 줄 끼워 넣기
+        "배: 25\n귤: 5\n감: 30",  # 첫 줄 지우기
+        "배: 25\n귤: 5\n감: 30\n\n잘못된 줄\n수박: 1e2",  # 빈 줄과 못 읽는 줄 덧붙이기
+        "배: 25\n감: 30\n수박: 1e2",  # 여러 줄 한꺼번에 지우기
+        "",
+        "참외: 7",
+    ]
+    for text in edits:
+        assert rows(parser.parse(text)) == rows(parse_items(text)), text
+
+
+def test_one_line_edit_reparses_only_that_line():
+    parser = IncrementalParser()
+    text = '\n'.join(f"항목{i}: {i}" for i in range(1000))
+    parser.parse(text)
+    edited = text.replace("항목500: 500", "항목500: 5e2")
+
+    assert rows(parser.parse(edited)) == rows(parse_items(edited))
+    assert parser.reparsed_lines == 1
+
+
+def test_parse_widget_keeps_one_parser_per_widget():
+    state = {'a': "사과: 1", 'b': "배: 2"}
+    assert rows(parse_widget(state, 'a')) == [('사과', 1.0)]
+    assert rows(parse_widget(state, 'b')) == [('배', 2.0)]
+    parser = state[STATE_PREFIX + 'a']
+    state['a'] = "사과: 1\n감: 3"
+    assert rows(parse_widget(state, 'a')) == [('사과', 1.0), ('감', 3.0)]
+    assert state[STATE_PREFIX + 'a'] is parser
@@ -0,0 +1,53 @@
+"""helpers.pdf_pages: 페이지를 무손실 Flate 이미지로 넣은 PDF가 다시 원래 픽셀로 읽히는지 확인합니다."""
+import struct
+import zlib
+from io import BytesIO
+
+from PIL import Image, ImageDraw, PdfParser
+
+from helpers.pdf_pages import PdfPageWriter
+
+
+def page_image(fill):
+    img = Image.new('RGB', (200, 120), '#FFF8F0')
+    ImageDraw.Draw(img).rectangle([20, 20, 180, 100], fill=fill)
+    return img
+
+
+def _chunk(kind, data):
+    return struct.pack('>I', len(data)) + kind + data + struct.pack('>I', zlib.crc32(kind + data))
+
+
+def image_from_stream(stream):
+    """PDF 이미지 객체를 PNG로 다시 싸서 Pillow로 읽습니다. IDAT를 그대로 넣었으므로 PNG로 풀려야 합니다."""
+    d = stream.dictionary
+    color_space = d[b'ColorSpace']
+    if isinstance(color_space, list):
+        color_type, palette = 3, bytes(color_space[3])
+    else:
+        color_type, palette = (2 if color_space == PdfParser.PdfName(b'DeviceRGB') else 0), None
+    header = struct.pack('>IIBBBBB', d[b'Width'], d[b'Height'], d[b'BitsPerComponent'], color_type, 0, 0, 0)
+    png = b'\x89PNG\r\n\x1a\n' + _chunk(b'IHDR', header)
+    if palette:
+        png += _chunk(b'PLTE', palette)
+    png += _chunk(b'IDAT', stream.buf) + _chunk(b'IEND', b'')
+    return Image.open(BytesIO(png)).convert('RGB')
+
+
+def test_pages_round_trip_without_loss():
+    pages = [page_image('#333333'), page_image('#4e79a7'), page_image('#e15759')]
+    buf = BytesIO()
+    writer = PdfPageWriter(buf)
+    writer.add_page(pages[0])
+    writer.add_page(pages[1])
+    writer.add_page(pages[2], palette=False)
+    writer.close()
+
+    pdf = PdfParser.PdfParser(buf=buf.getvalue())
+    assert len(pdf.pages) == 3
+    for ref, expected in zip(pdf.pages, pages):
+        page = pdf.read_indirect(ref)
+        assert page[b'MediaBox'] == [0, 0, 150, 90]
+        stream = pdf.read_indirect(page[b'Resources'][b'XObject'][b'Im0'])
+        assert stream.dictionary[b'Filter'] == PdfParser.PdfName(b'FlateDecode')
+        assert image_from_stream(stream).tobytes() == expected.tobytes()
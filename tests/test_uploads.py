@@ -0,0 +1,73 @@
+"""helpers.uploads: 여러 덩어리로 나눠 읽어도 한 번에 읽은 것과 같은 표가 되는지, TableCache가 같은 파일을 다시 읽지 않는지 확인합니다."""
+import io
+
+import pandas as pd
+import pytest
+from openpyxl import Workbook
+
+from helpers import uploads
+from helpers.uploads import COUNT_ROWS, TableCache, item_value_frame, read_table
+
+ROWS = [('급식', '점수', '학번')] + [
+    (['김치찌개', '돈까스', '', '떡볶이'][i % 4], f"{i % 7:,}" if i % 5 else '', f"S{i:04d}") for i in range(40)
+]
+
+
+class FakeUpload:
+    def __init__(self, data, name, file_id=None):
+        self.data, self.name, self.file_id = data, name, file_id
+        self.reads = 0
+
+    def getvalue(self):
+        self.reads += 1
+        return self.data
+
+
+def csv_bytes(encoding='utf-8-sig'):
+    return '\n'.join(','.join(row) for row in ROWS).encode(encoding)
+
+
+def xlsx_bytes():
+    workbook = Workbook()
+    for row in ROWS:
+        workbook.active.append([cell or None for cell in row])
+    buf = io.BytesIO()
+    workbook.save(buf)
+    return buf.getvalue()
+
+
+@pytest.mark.parametrize('data, filename', [
+    (csv_bytes(), 'a.csv'), (csv_bytes('cp949'), 'a.csv'), (xlsx_bytes(), 'a.xlsx'),
+], ids=['csv', 'csv-cp949', 'xlsx'])
+def test_chunked_read_matches_single_read(monkeypatch, data, filename):
+    whole = read_table(data, filename)
+    monkeypatch.setattr(uploads, 'CHUNK_ROWS', 10)
+    chunked = read_table(data, filename)
+
+    assert list(chunked.columns) == ['급식', '점수', '학번']
+    assert isinstance(chunked['급식'].dtype, pd.CategoricalDtype)
+    assert chunked['점수'].dtype == float
+    assert pd.api.types.is_string_dtype(chunked['학번'])
+    assert chunked['급식'].isna().sum() == 10
+    pd.testing.assert_frame_equal(chunked.astype(object), whole.astype(object))
+
+
+def test_count_rows_ignores_blank_cells():
+    table = read_table(csv_bytes(), 'a.csv')
+    frame = item_value_frame(table, '급식', COUNT_ROWS)
+    assert dict(zip(frame['항목'], frame['값'])) == {'김치찌개': 10, '돈까스': 10, '떡볶이': 10}
+
+
+def test_table_cache_reads_each_file_once_and_evicts_oldest():
+    cache = TableCache(max_entries=2)
+    first = FakeUpload(csv_bytes(), 'a.csv', file_id='f1')
+    digest, table = cache.load(first)
+    assert cache.load(first) == (digest, table)
+    assert first.reads == 1  # file_id가 같으면 해시도 다시 계산하지 않습니다.
+
+    same_content = FakeUpload(csv_bytes(), 'b.csv', file_id='f2')
+    assert cache.load(same_content)[1] is table
+
+    cache.load(FakeUpload(xlsx_bytes(), 'c.xlsx'))
+    cache.load(FakeUpload(b'x\n1\n', 'd.csv'))
+    assert cache.load(FakeUpload(csv_bytes(), 'a.csv'))[1] is not table
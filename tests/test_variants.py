@@ -0,0 +1,35 @@
+"""helpers.variants: 자주 틀리는 표기 쌍이 한 묶음이 되고, 짧거나 다른 값은 묶이지 않는지 확인합니다."""
+import pytest
+
+from helpers.variants import cluster_rules, decompose, edit_distance, find_variants
+
+
+@pytest.mark.parametrize('a, b', [
+    ('김치찌개', '김치찌게'), ('돈까스', '돈가스'), ('돈까스', '돈까쓰'), ('떡볶이', '떡복이'), ('스파게티', '스파게띠 '),
+])
+def test_known_variant_pairs_cluster_together(a, b):
+    clusters = find_variants([a, a, b])
+    assert len(clusters) == 1
+    assert clusters[0].canonical == a.strip()
+    assert {word for word, _ in clusters[0].variants} == {a.strip(), b.strip()}
+
+
+def test_different_or_short_values_stay_apart():
+    assert find_variants(['김치찌개', '된장찌개', '배', '베', '사과', '수박']) == []
+
+
+def test_clusters_sorted_by_responses_to_fix_and_rules_point_to_canonical():
+    values = ['김치찌개'] * 3 + ['김치찌게'] * 2 + ['돈까스'] * 4 + ['돈가스']
+    clusters = find_variants(values)
+    assert [c.canonical for c in clusters] == ['김치찌개', '돈까스']
+    assert [c.variant_total for c in clusters] == [2, 1]
+    assert cluster_rules(clusters) == [
+        {'find': '김치찌게', 'replace': '김치찌개'},
+        {'find': '돈가스', 'replace': '돈까스'},
+    ]
+
+
+def test_jamo_distance_sees_one_vowel_change():
+    assert decompose('게') != decompose('개')
+    assert edit_distance(decompose('김치찌게'), decompose('김치찌개'), 1) == 1
+    assert edit_distance(decompose('김치찌개'), decompose('된장찌개'), 1) == 2